@@ -3,6 +3,12 @@ AI Assistant module for SaarthiAI
 Uses Google Gemini for intelligent tutoring
 """
 
+from .chat_sessions import ChatHistory, ChatSessionManager
 from .gemini_helper import GeminiAssistant
+from .response_cache import ResponseCache, ai_cache_path
+from .single_flight import SingleFlight
 
-__all__ = ['GeminiAssistant']
\ No newline at end of file
+__all__ = [
+    'ChatHistory', 'ChatSessionManager', 'GeminiAssistant', 'ResponseCache',
+    'SingleFlight', 'ai_cache_path',
+]
\ No newline at end of file
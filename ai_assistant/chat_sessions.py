@@ -0,0 +1,200 @@
+"""
+Per-student chat sessions for SaarthiAI
+Each student gets their own conversation history, trimmed to a token
+budget; sessions are kept in an LRU with idle expiry. With a ChatHistory,
+a session is rebuilt from ai_chat_history whenever that holds turns the
+session has not seen: after eviction, or when the student's previous
+message was answered by another worker process
+"""
+
+import collections
+import threading
+import time
+
+# Rough size of a token in characters; close enough for budgeting English text
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text):
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+class ChatHistory:
+    """A student's recent general chat, read from ai_chat_history"""
+
+    def __init__(self, connect, limit=20):
+        """
+        Args:
+            connect: returns a new database connection
+            limit: exchanges read before the token budget is applied
+        """
+        self.connect = connect
+        self.limit = limit
+
+    def newer_ids(self, student_id, after_id, limit):
+        """Ids of up to `limit` of the student's general exchanges after after_id"""
+        conn = self.connect()
+        try:
+            rows = conn.execute('''
+                SELECT id FROM ai_chat_history
+                WHERE student_id = ? AND chat_type = 'general' AND id > ?
+                ORDER BY id
+                LIMIT ?
+            ''', (student_id, after_id or 0, limit)).fetchall()
+        finally:
+            conn.close()
+        return [row[0] for row in rows]
+
+    def load(self, student_id):
+        """
+        Returns:
+            (newest id or None, [(message, response), ...] oldest first)
+        """
+        conn = self.connect()
+        try:
+            rows = conn.execute('''
+                SELECT id, message, response FROM ai_chat_history
+                WHERE student_id = ? AND chat_type = 'general'
+                ORDER BY id DESC
+                LIMIT ?
+            ''', (student_id, self.limit)).fetchall()
+        finally:
+            conn.close()
+        return (rows[0][0] if rows else None), [(row[1], row[2]) for row in reversed(rows)]
+
+
+class ChatSession:
+    """One student's conversation"""
+
+    def __init__(self):
+        self.history = []
+        # Newest ai_chat_history id the history was loaded up to, and the ids
+        # of exchanges this process recorded since (already in the history)
+        self.stored_id = None
+        self.written = set()
+        self.last_used = time.monotonic()
+        # One message at a time per student, so turns stay in order
+        self.lock = threading.Lock()
+
+
+class ChatSessionManager:
+    """Live chat sessions keyed by student, bounded in count, age and size"""
+
+    def __init__(self, model, max_sessions=500, idle_timeout=1800, token_budget=4000, history=None):
+        """
+        Args:
+            model: Gemini GenerativeModel
+            max_sessions: least recently used sessions beyond this are dropped
+            idle_timeout: seconds without a message before a session is dropped
+            token_budget: approximate tokens of history sent with each message;
+                          the oldest exchanges are dropped to stay under it
+            history: optional ChatHistory; before each message the session is
+                     rebuilt from it if it has newer turns than the session
+        """
+        self.model = model
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self.token_budget = token_budget
+        self.history = history
+        self._sessions = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def send(self, student_id, message, prompt=None, record=None):
+        """
+        Send a message in a student's conversation
+
+        Args:
+            student_id: whose conversation
+            message: what the student wrote; this is what the history keeps
+            prompt: text actually sent for this turn (default: message)
+            record: optional function of the reply that stores the exchange in
+                    ai_chat_history and returns a Future of its row id; the
+                    session then knows that row is its own and not a turn
+                    answered elsewhere
+
+        Returns:
+            The model's reply text
+        """
+        session = self._session(student_id)
+        with session.lock:
+            self._refresh(student_id, session)
+            chat = self.model.start_chat(history=session.history)
+            reply = chat.send_message(prompt or message).text
+            session.history = self._trim(session.history + [
+                {'role': 'user', 'parts': [message]},
+                {'role': 'model', 'parts': [reply]},
+            ])
+            session.last_used = time.monotonic()
+            if record is not None:
+                # Resolved on the writer thread, which must not wait on the
+                # session lock; set.add is atomic
+                record(reply).add_done_callback(
+                    lambda future: future.exception() or session.written.add(future.result()))
+        return reply
+
+    def _session(self, student_id):
+        now = time.monotonic()
+        with self._lock:
+            self._expire(now)
+            session = self._sessions.get(student_id)
+            if session is None:
+                session = self._sessions[student_id] = ChatSession()
+                while len(self._sessions) > self.max_sessions:
+                    self._sessions.popitem(last=False)
+            else:
+                self._sessions.move_to_end(student_id)
+                session.last_used = now
+        return session
+
+    def _expire(self, now):
+        while self._sessions:
+            student_id, session = next(iter(self._sessions.items()))
+            if now - session.last_used <= self.idle_timeout:
+                break
+            del self._sessions[student_id]
+
+    def _refresh(self, student_id, session):
+        """Rebuild the session from stored history if that has turns it lacks"""
+        if self.history is None:
+            return
+        try:
+            written = set(session.written)
+            # One id beyond our own writes is enough to tell whether another
+            # worker answered in between
+            newer = self.history.newer_ids(student_id, session.stored_id, len(written) + 1)
+            if written.issuperset(newer):
+                if newer:
+                    session.stored_id = newer[-1]
+                    session.written.difference_update(newer)
+                return
+            stored_id, exchanges = self.history.load(student_id)
+        except Exception as e:
+            print(f"⚠️  Could not load chat history for student {student_id}: {e}")
+            return
+        history = []
+        for message, response in exchanges:
+            history.append({'role': 'user', 'parts': [message]})
+            history.append({'role': 'model', 'parts': [response]})
+        session.history = self._trim(history)
+        session.stored_id = stored_id
+        session.written = {row_id for row_id in session.written if stored_id is None or row_id > stored_id}
+
+    def _trim(self, history):
+        """Drop the oldest exchanges until the history fits the token budget"""
+        total = sum(estimate_tokens(turn['parts'][0]) for turn in history)
+        start = 0
+        while total > self.token_budget and start < len(history):
+            # Whole exchanges, so the history still starts with a user turn
+            for turn in history[start:start + 2]:
+                total -= estimate_tokens(turn['parts'][0])
+            start += 2
+        return history[start:]
+
+    def reset(self, student_id):
+        """Forget a student's live session (the stored history is untouched)"""
+        with self._lock:
+            self._sessions.pop(student_id, None)
+
+    def __len__(self):
+        with self._lock:
+            return len(self._sessions)
@@ -6,6 +6,10 @@ Provides intelligent tutoring, explanations, quizzes, and flashcards
 import os
 from datetime import datetime
 
+from metrics import GEMINI_ERRORS, GEMINI_LATENCY, track
+
+from .chat_sessions import ChatSessionManager
+
 try:
     import google.generativeai as genai
     GEMINI_AVAILABLE = True
@@ -16,11 +20,25 @@ except ImportError:
 class GeminiAssistant:
     """AI Learning Assistant powered by Google Gemini"""
     
-    def __init__(self):
-        """Initialize Gemini AI with API key from environment"""
+    MODEL_NAME = 'gemini-pro'
+    
+    def __init__(self, cache=None, single_flight=None, history=None,
+                 max_sessions=500, idle_timeout=1800, token_budget=4000):
+        """
+        Initialize Gemini AI with API key from environment
+        
+        Args:
+            cache: optional ResponseCache for explain, quiz and flashcard answers
+            single_flight: optional SingleFlight coalescing identical uncached calls
+            history: optional ChatHistory that chat sessions are rebuilt from
+                     when it has turns they have not seen
+            max_sessions, idle_timeout, token_budget: ChatSessionManager limits
+        """
+        self.cache = cache
+        self.single_flight = single_flight
+        self.sessions = None
         if not GEMINI_AVAILABLE:
             self.model = None
-            self.chat_session = None
             return
         
         # Get API key from environment
@@ -30,7 +48,6 @@ class GeminiAssistant:
             print("⚠️  Warning: GEMINI_API_KEY not set in .env file")
             print("   AI features will use demo mode")
             self.model = None
-            self.chat_session = None
             return
         
         try:
@@ -38,28 +55,32 @@ class GeminiAssistant:
             genai.configure(api_key=api_key)
             
             # Initialize model
-            self.model = genai.GenerativeModel('gemini-pro')
+            self.model = genai.GenerativeModel(self.MODEL_NAME)
             
-            # Start chat session
-            self.chat_session = self.model.start_chat(history=[])
+            # One conversation per student, never shared between callers
+            self.sessions = ChatSessionManager(self.model, max_sessions=max_sessions,
+                                               idle_timeout=idle_timeout, token_budget=token_budget,
+                                               history=history)
             
             print("✅ Gemini AI initialized successfully")
             
         except Exception as e:
             print(f"⚠️  Error initializing Gemini AI: {e}")
             self.model = None
-            self.chat_session = None
+            self.sessions = None
     
     def is_available(self):
         """Check if Gemini AI is available"""
-        return self.model is not None and self.chat_session is not None
+        return self.model is not None and self.sessions is not None
     
-    def chat(self, message):
+    def chat(self, message, student_id=None):
         """
         General chat with AI assistant
         
         Args:
             message: User's question or message
+            student_id: continue this student's conversation; without it the
+                        message is answered on its own, with no history
         
         Returns:
             AI response as string
@@ -77,8 +98,10 @@ Student's question: {message}
 
 Please provide a helpful, clear response:"""
             
-            response = self.chat_session.send_message(prompt)
-            return response.text
+            with track(GEMINI_LATENCY, GEMINI_ERRORS, operation='chat'):
+                if student_id is None:
+                    return self.model.generate_content(prompt).text
+                return self.sessions.send(student_id, message, prompt)
             
         except Exception as e:
             print(f"Error in chat: {e}")
@@ -111,8 +134,7 @@ Please provide:
 
 Explanation:"""
             
-            response = self.model.generate_content(prompt)
-            return response.text
+            return self._generate('explain', prompt, topic)
             
         except Exception as e:
             print(f"Error explaining topic: {e}")
@@ -152,8 +174,7 @@ Explanation: [Brief explanation]
 
 Quiz:"""
             
-            response = self.model.generate_content(prompt)
-            return response.text
+            return self._generate('quiz', prompt, topic, num_questions=num_questions)
             
         except Exception as e:
             print(f"Error generating quiz: {e}")
@@ -187,13 +208,24 @@ Back: [Answer/Definition]
 
 Flashcards:"""
             
-            response = self.model.generate_content(prompt)
-            return response.text
+            return self._generate('flashcard', prompt, topic, num_cards=num_cards)
             
         except Exception as e:
             print(f"Error creating flashcards: {e}")
             return "I'm having trouble creating flashcards right now. Please try again later."
     
+    def _generate(self, operation, prompt, topic, **params):
+        """generate_content through the response cache or single-flight, when set"""
+        def call():
+            with track(GEMINI_LATENCY, GEMINI_ERRORS, operation=operation):
+                return self.model.generate_content(prompt).text
+        
+        if self.cache is not None:
+            return self.cache.get_or_compute(operation, topic, call, model=self.MODEL_NAME, **params)
+        if self.single_flight is not None:
+            return self.single_flight.do((operation, prompt), call, operation=operation)
+        return call()
+    
     # Demo responses when API key not configured
     def _demo_response(self, message):
         """Demo response when Gemini not available"""
@@ -0,0 +1,207 @@
+"""
+Persistent AI response cache for SaarthiAI
+Answers to explain / quiz / flashcard prompts are stored in a small SQLite
+file next to the main database, keyed by prompt type, normalized topic and
+parameters, so the same question from a whole section costs one API call
+"""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import time
+
+from metrics import AI_CACHE_REQUESTS
+
+
+def ai_cache_path(database_path):
+    """Default cache file for a database"""
+    return os.path.join(os.path.dirname(database_path) or '.', 'ai_cache.db')
+
+
+def normalize_topic(topic):
+    """Case, surrounding whitespace and punctuation and repeated spaces do not change the answer"""
+    topic = re.sub(r'\s+', ' ', str(topic)).strip().casefold()
+    return topic.strip(' ?!.,;:')
+
+
+def cache_key(kind, topic, params):
+    """Stable key for a prompt type, normalized topic and parameters"""
+    raw = json.dumps([kind, normalize_topic(topic), params], sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+class ResponseCache:
+    """SQLite-backed response cache with a TTL and an LRU size limit"""
+
+    def __init__(self, path, ttl=7 * 24 * 3600, max_entries=5000, single_flight=None):
+        """
+        Args:
+            path: cache database file, created on first use
+            ttl: seconds an answer is served before it is asked for again
+            max_entries: least recently used answers beyond this are deleted
+            single_flight: optional SingleFlight; concurrent misses for the
+                           same key then make one call and one write
+        """
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.single_flight = single_flight
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        conn = self._connect()
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS ai_response_cache (
+                key TEXT PRIMARY KEY,
+                kind TEXT NOT NULL,
+                topic TEXT NOT NULL,
+                params TEXT NOT NULL,
+                response TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_used REAL NOT NULL,
+                hits INTEGER NOT NULL DEFAULT 0
+            )
+        ''')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_ai_cache_last_used ON ai_response_cache(last_used)')
+        conn.commit()
+        conn.close()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=5)
+        # Losing the last few writes on power loss only costs API calls, so
+        # commits skip the fsync
+        conn.execute('PRAGMA synchronous=NORMAL')
+        return conn
+
+    def get(self, kind, topic, **params):
+        """Cached answer, or None if missing or expired"""
+        response = self._lookup(cache_key(kind, topic, params))
+        AI_CACHE_REQUESTS.inc(operation=kind, result='miss' if response is None else 'hit')
+        return response
+
+    def _lookup(self, key):
+        now = time.time()
+        try:
+            conn = self._connect()
+            try:
+                row = conn.execute(
+                    'SELECT response, created_at FROM ai_response_cache WHERE key = ?', (key,)
+                ).fetchone()
+                if row is not None and row[1] + self.ttl > now:
+                    try:
+                        conn.execute(
+                            'UPDATE ai_response_cache SET last_used = ?, hits = hits + 1 WHERE key = ?',
+                            (now, key))
+                        conn.commit()
+                    except sqlite3.OperationalError:
+                        # Busy: the answer is still good, only its LRU position is stale
+                        pass
+                    return row[0]
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            # The cache must never break a chat; fall through to the API
+            print(f"⚠️  AI cache read failed: {e}")
+        return None
+
+    def put(self, kind, topic, response, **params):
+        """Store an answer and evict the least recently used beyond max_entries"""
+        now = time.time()
+        try:
+            conn = self._connect()
+            try:
+                conn.execute('''
+                    INSERT OR REPLACE INTO ai_response_cache
+                        (key, kind, topic, params, response, created_at, last_used, hits)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, 0)
+                ''', (cache_key(kind, topic, params), kind, normalize_topic(topic),
+                      json.dumps(params, sort_keys=True, default=str), response, now, now))
+                conn.execute('''
+                    DELETE FROM ai_response_cache WHERE key IN (
+                        SELECT key FROM ai_response_cache ORDER BY last_used DESC LIMIT -1 OFFSET ?
+                    )
+                ''', (self.max_entries,))
+                conn.commit()
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            print(f"⚠️  AI cache write failed: {e}")
+
+    def get_or_compute(self, kind, topic, compute, **params):
+        """
+        Cached answer, or compute() stored for next time
+
+        Exceptions from compute() propagate and nothing is cached.
+        """
+        response = self.get(kind, topic, **params)
+        if response is not None:
+            return response
+
+        key = cache_key(kind, topic, params)
+
+        def fill():
+            # Another caller may have stored it while this one was waiting
+            response = self._lookup(key)
+            if response is None:
+                response = compute()
+                self.put(kind, topic, response, **params)
+            return response
+
+        if self.single_flight is None:
+            return fill()
+        return self.single_flight.do(key, fill, operation=kind)
+
+    def purge(self, kind=None, topic=None, expired_only=False):
+        """
+        Delete cached answers
+
+        Args:
+            kind: only this prompt type
+            topic: only this topic (normalized the same way as lookups)
+            expired_only: only answers past their TTL
+
+        Returns:
+            Number of answers deleted
+        """
+        conditions = []
+        params = []
+        if kind:
+            conditions.append('kind = ?')
+            params.append(kind)
+        if topic:
+            conditions.append('topic = ?')
+            params.append(normalize_topic(topic))
+        if expired_only:
+            conditions.append('created_at <= ?')
+            params.append(time.time() - self.ttl)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+        conn = self._connect()
+        try:
+            deleted = conn.execute(f'DELETE FROM ai_response_cache {where}', params).rowcount
+            conn.commit()
+        finally:
+            conn.close()
+        return deleted
+
+    def stats(self):
+        """Entry and hit counts per prompt type"""
+        conn = self._connect()
+        try:
+            rows = conn.execute('''
+                SELECT kind, COUNT(*), COALESCE(SUM(hits), 0), SUM(created_at <= ?)
+                FROM ai_response_cache
+                GROUP BY kind
+                ORDER BY kind
+            ''', (time.time() - self.ttl,)).fetchall()
+        finally:
+            conn.close()
+        return {
+            'entries': sum(row[1] for row in rows),
+            'max_entries': self.max_entries,
+            'ttl': self.ttl,
+            'by_type': [
+                {'type': kind, 'entries': entries, 'hits': hits, 'expired': expired}
+                for kind, entries, hits, expired in rows
+            ],
+        }
@@ -0,0 +1,79 @@
+"""
+Single-flight call coalescing for SaarthiAI
+Concurrent identical AI requests in one process share a single model call:
+the first caller runs it and everyone else waits on its future
+"""
+
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+
+from metrics import AI_COALESCED
+
+
+class SingleFlight:
+    """At most one in-flight call per key; later callers wait for its result"""
+
+    def __init__(self, timeout=60.0):
+        """
+        Args:
+            timeout: seconds a waiting caller gives the running call; a call
+                     running longer than this is no longer joined, so one
+                     hung request cannot hold its key forever
+        """
+        self.timeout = timeout
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, fn, operation='general'):
+        """
+        Run fn() once for all concurrent callers with the same key
+
+        Args:
+            key: hashable identity of the request
+            fn: the call to make; its result or exception goes to every waiter
+            operation: metric label
+
+        Returns:
+            fn()'s result
+
+        Raises:
+            Whatever fn() raised, or TimeoutError if a waiter gave up
+        """
+        now = time.monotonic()
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None or now - call[1] > self.timeout
+            if leader:
+                call = self._calls[key] = (Future(), now)
+        future = call[0]
+
+        if leader:
+            try:
+                result = fn()
+            except BaseException as e:
+                future.set_exception(e)
+                raise
+            else:
+                future.set_result(result)
+                return result
+            finally:
+                with self._lock:
+                    if self._calls.get(key) is call:
+                        del self._calls[key]
+
+        try:
+            result = future.result(timeout=max(0.0, self.timeout - (now - call[1])))
+        except FutureTimeout:
+            AI_COALESCED.inc(operation=operation, result='timeout')
+            raise TimeoutError(f'Timed out waiting for an identical {operation} request')
+        except BaseException:
+            AI_COALESCED.inc(operation=operation, result='error')
+            raise
+        AI_COALESCED.inc(operation=operation, result='shared')
+        return result
+
+    def in_flight(self):
+        """Number of calls currently running"""
+        with self._lock:
+            return len(self._calls)
@@ -1,9 +1,10 @@
-from flask import Flask, render_template, request, redirect, url_for, session, flash, jsonify
+from flask import Flask, render_template, request, redirect, url_for, session, flash, jsonify, g, make_response, Response, send_from_directory, abort
 from werkzeug.security import check_password_hash, generate_password_hash
 import sqlite3
 from datetime import datetime, timedelta
 import os
 import google.generativeai as genai
+import mimetypes
 from functools import wraps
 import smtplib
 from email.mime.text import MIMEText
@@ -12,6 +13,42 @@ import threading
 import schedule
 import time
 import json
+import random
+import hashlib
+import hmac
+try:
+    import orjson
+except ImportError:
+    orjson = None
+from ai_assistant.chat_sessions import ChatHistory, ChatSessionManager
+from ai_assistant.response_cache import ResponseCache, ai_cache_path
+from ai_assistant.single_flight import SingleFlight
+from assets import AssetManifest, ResponseCompressor
+from database.aggregate_cache import AggregateCache
+from database.archive import attach_history
+from database.dashboard import (
+    DATED_SECTIONS, SECTIONS as DASHBOARD_SECTIONS, fetch_attendance_page, load_dashboard,
+    parse_fields, parse_sections, section_versions
+)
+from database.pagination import build_page, decode_cursor, page_size
+from database.parent_overview import load_children_overview
+from database.schema import create_tables, create_indexes
+from database.roster_import import import_roster, read_roster
+from database.search import create_search_index, search
+from database.student_context import (ROSTER_SCOPE, StudentContextCache, invalidate_student_contexts,
+                                      load_student_context)
+from database.timeseries import time_series
+from database.versions import GLOBAL_SCOPE, DataVersions, versions_path
+from database.write_queue import WriteQueue
+from metrics import (
+    GEMINI_ERRORS, GEMINI_LATENCY, HTTP_LATENCY, HTTP_REQUESTS, REGISTRY as METRICS,
+    SMTP_ERRORS, SMTP_SEND, track,
+)
+from metrics.profiler import SamplingProfiler
+from realtime import EventBroker
+from reports import gzip_stream, stream_csv, stream_ndjson, stream_xlsx
+from reports.attendance_matrix import build_attendance_matrix, matrix_header, matrix_json, matrix_rows
+from reports.export import EXPORT_COLUMNS, STATUSES, export_attendance
 
 app = Flask(__name__)
 app.secret_key = os.environ.get('FLASK_SECRET_KEY', 'your flask key')
@@ -22,6 +59,34 @@ EMAIL_PORT = int(os.environ.get('EMAIL_PORT', '587'))
 EMAIL_USERNAME = os.environ.get('EMAIL_USERNAME', 'youremail@gmail.com')
 EMAIL_PASSWORD = os.environ.get('EMAIL_PASSWORD', ' your password')
 EMAIL_FROM = os.environ.get('EMAIL_FROM', 'noreply@saarthi.ai')
+WRITE_QUEUE_INTERVAL_MS = float(os.environ.get('WRITE_QUEUE_INTERVAL_MS', '5'))
+DATA_VERSIONS_PATH = os.environ.get('DATA_VERSIONS_PATH', versions_path(DATABASE_PATH))
+ADMIN_CACHE_TTL = int(os.environ.get('ADMIN_CACHE_TTL', '60'))
+ADMIN_CACHE_MAX_STALE = int(os.environ.get('ADMIN_CACHE_MAX_STALE', '600'))
+SSE_HEARTBEAT_SECONDS = int(os.environ.get('SSE_HEARTBEAT_SECONDS', '15'))
+ROSTER_IMPORT_WORKERS = int(os.environ.get('ROSTER_IMPORT_WORKERS', '0')) or None
+METRICS_DIR = os.environ.get('METRICS_DIR')
+EVENT_RELAY_DIR = os.environ.get('EVENT_RELAY_DIR')
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN')
+PROFILE_DIR = os.environ.get('PROFILE_DIR', 'profiles')
+PROFILE_TOKEN = os.environ.get('PROFILE_TOKEN')
+PROFILE_SAMPLE_RATE = float(os.environ.get('PROFILE_SAMPLE_RATE', '0'))
+PROFILE_ROUTES = {route.strip() for route in os.environ.get('PROFILE_ROUTES', '').split(',') if route.strip()}
+PROFILE_INTERVAL_MS = float(os.environ.get('PROFILE_INTERVAL_MS', '5'))
+PROFILE_KEEP = int(os.environ.get('PROFILE_KEEP', '100'))
+ASSET_BUILD = os.environ.get('ASSET_BUILD', 'true').lower() == 'true'
+ASSET_MAX_AGE = int(os.environ.get('ASSET_MAX_AGE', str(365 * 24 * 3600)))
+COMPRESS_MIN_SIZE = int(os.environ.get('COMPRESS_MIN_SIZE', '1024'))
+COMPRESS_LEVEL = int(os.environ.get('COMPRESS_LEVEL', '6'))
+COMPRESS_BROTLI_QUALITY = int(os.environ.get('COMPRESS_BROTLI_QUALITY', '4'))
+COMPRESS_CACHE_ENTRIES = int(os.environ.get('COMPRESS_CACHE_ENTRIES', '256'))
+AI_CACHE_PATH = os.environ.get('AI_CACHE_PATH', ai_cache_path(DATABASE_PATH))
+AI_CACHE_TTL = int(os.environ.get('AI_CACHE_TTL', str(7 * 24 * 3600)))
+AI_CACHE_MAX_ENTRIES = int(os.environ.get('AI_CACHE_MAX_ENTRIES', '5000'))
+AI_FLIGHT_TIMEOUT = float(os.environ.get('AI_FLIGHT_TIMEOUT', '60'))
+CHAT_SESSION_MAX = int(os.environ.get('CHAT_SESSION_MAX', '500'))
+CHAT_SESSION_IDLE_TIMEOUT = int(os.environ.get('CHAT_SESSION_IDLE_TIMEOUT', '1800'))
+CHAT_HISTORY_TOKENS = int(os.environ.get('CHAT_HISTORY_TOKENS', '4000'))
 
 GEMINI_API_KEY = os.environ.get('GEMINI_API_KEY')
 if GEMINI_API_KEY and GEMINI_API_KEY != 'your gemini key':
@@ -42,267 +107,128 @@ def get_db_connection():
     conn.row_factory = sqlite3.Row
     return conn
 
+# All request-path writes go through one writer thread so they share
+# group commits instead of queueing on SQLite's write lock
+write_queue = WriteQueue(DATABASE_PATH, batch_interval=WRITE_QUEUE_INTERVAL_MS / 1000.0)
+
+# Shared change counters; cached per-session state is checked against these
+data_versions = DataVersions(DATA_VERSIONS_PATH)
+
+# Admin dashboard aggregates; bumped by every attendance write
+AGGREGATES_SCOPE = 'aggregates'
+aggregate_cache = AggregateCache(data_versions, ttl=ADMIN_CACHE_TTL, max_stale=ADMIN_CACHE_MAX_STALE)
+
+# Student contexts (courses, teachers, parents) by user id; sessions only reference them
+student_contexts = StudentContextCache()
+
+# Identical AI requests arriving together (a whole class asking for the same
+# quiz) wait on one model call instead of making their own
+ai_flights = SingleFlight(timeout=AI_FLIGHT_TIMEOUT)
+
+# Explain / quiz / flashcard answers, shared by every student asking the same thing
+ai_cache = ResponseCache(AI_CACHE_PATH, ttl=AI_CACHE_TTL, max_entries=AI_CACHE_MAX_ENTRIES,
+                         single_flight=ai_flights)
+
+# General chat keeps a short history per student, rebuilt from
+# ai_chat_history when another worker answered the student's last message
+# or the session was evicted
+chat_sessions = ChatSessionManager(model, max_sessions=CHAT_SESSION_MAX,
+                                   idle_timeout=CHAT_SESSION_IDLE_TIMEOUT,
+                                   token_budget=CHAT_HISTORY_TOKENS,
+                                   history=ChatHistory(get_db_connection)) if model else None
+
+# Pushes notifications and attendance updates to open /api/events streams
+event_broker = EventBroker()
+# With EVENT_RELAY_DIR set, an event published in one worker reaches SSE clients of every worker
+if EVENT_RELAY_DIR:
+    event_broker.enable_relay(EVENT_RELAY_DIR)
+
+# With METRICS_DIR set, every worker process of the server reports through /metrics
+if METRICS_DIR:
+    METRICS.enable_multiprocess(METRICS_DIR)
+
+# Stack sampling for single requests; idle unless a request asks for it
+profiler = SamplingProfiler(PROFILE_DIR, interval=PROFILE_INTERVAL_MS / 1000.0, keep=PROFILE_KEEP)
+
+# Dashboard CSS/JS under content-hashed names; templates link them with asset_url()
+assets = AssetManifest(app.static_folder, os.path.join(app.static_folder, 'dist'))
+if ASSET_BUILD:
+    print(f"📦 Built {assets.build()} static bundles")
+elif not assets.load():
+    print("⚠️  Warning: no static bundle manifest; run python -m assets.bundles")
+app.jinja_env.globals['asset_url'] = assets.url
+
+# gzip/brotli for HTML, JSON and CSV responses; see compress_response()
+compressor = ResponseCompressor(min_size=COMPRESS_MIN_SIZE, level=COMPRESS_LEVEL,
+                                brotli_quality=COMPRESS_BROTLI_QUALITY, cache_entries=COMPRESS_CACHE_ENTRIES)
+
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+    if should_profile():
+        g.profile = profiler.start(f"{request.method} {request.url_rule.rule if request.url_rule else request.path}")
+
+@app.after_request
+def record_request_metrics(response):
+    record_request(response.status_code)
+    profile = g.pop('profile', None)
+    if profile is not None:
+        name = profiler.stop(profile, path=request.full_path, status=response.status_code)
+        if name:
+            response.headers['X-Profile-Id'] = name
+    return response
+
+@app.after_request
+def compress_response(response):
+    # Already-encoded bodies (precompressed bundles, .gz exports), files and
+    # event streams are left alone
+    return compressor(response, request)
+
+@app.teardown_request
+def record_failed_request(exc):
+    if exc is not None:
+        record_request(500)
+    profile = g.pop('profile', None)
+    if profile is not None:
+        profiler.stop(profile, path=request.full_path, status=500)
+
+def should_profile():
+    """
+    Profile this request?
+
+    An X-Profile header matching PROFILE_TOKEN, or X-Profile: 1 from an
+    admin session, profiles one request on demand. PROFILE_SAMPLE_RATE
+    profiles a random fraction of requests to PROFILE_ROUTES (all routes
+    when unset).
+    """
+    header = request.headers.get('X-Profile')
+    if header:
+        if PROFILE_TOKEN and hmac.compare_digest(header, PROFILE_TOKEN):
+            return True
+        if header == '1' and session.get('role') == 'admin':
+            return True
+    if PROFILE_SAMPLE_RATE and request.url_rule is not None:
+        if not PROFILE_ROUTES or request.url_rule.rule in PROFILE_ROUTES:
+            return random.random() < PROFILE_SAMPLE_RATE
+    return False
+
+def record_request(status):
+    """Count and time the current request once, labelled by its route pattern"""
+    started = g.pop('request_started', None)
+    if started is None:
+        return
+    route = request.url_rule.rule if request.url_rule else 'unmatched'
+    HTTP_LATENCY.observe(time.perf_counter() - started, route=route, method=request.method)
+    HTTP_REQUESTS.inc(route=route, method=request.method, status=status)
+
 def init_db():
     """Initialize database with all required tables"""
     conn = get_db_connection()
     cursor = conn.cursor()
     
-    # Users table
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS users (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            username TEXT UNIQUE NOT NULL,
-            password TEXT NOT NULL,
-            full_name TEXT NOT NULL,
-            email TEXT UNIQUE NOT NULL,
-            role TEXT NOT NULL CHECK(role IN ('admin', 'teacher', 'student', 'parent')),
-            created_at DATETIME DEFAULT CURRENT_TIMESTAMP
-        )
-    ''')
-    
-    # Students table
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS students (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            user_id INTEGER,
-            student_id TEXT UNIQUE NOT NULL,
-            first_name TEXT NOT NULL,
-            last_name TEXT NOT NULL,
-            email TEXT UNIQUE NOT NULL,
-            phone TEXT,
-            date_of_birth DATE,
-            address TEXT,
-            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (user_id) REFERENCES users(id)
-        )
-    ''')
-    
-    # Courses table
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS courses (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            course_code TEXT UNIQUE NOT NULL,
-            course_name TEXT NOT NULL,
-            description TEXT,
-            teacher_id INTEGER,
-            semester TEXT,
-            credits INTEGER DEFAULT 4,
-            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (teacher_id) REFERENCES users(id)
-        )
-    ''')
-    
-    # Subjects table
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS subjects (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            subject_code TEXT UNIQUE NOT NULL,
-            subject_name TEXT NOT NULL,
-            credits INTEGER DEFAULT 4,
-            teacher_id INTEGER,
-            course_id INTEGER,
-            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (teacher_id) REFERENCES users(id),
-            FOREIGN KEY (course_id) REFERENCES courses(id)
-        )
-    ''')
-    
-    # Enrollments table
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS enrollments (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            student_id INTEGER NOT NULL,
-            course_id INTEGER NOT NULL,
-            enrollment_date DATETIME DEFAULT CURRENT_TIMESTAMP,
-            status TEXT DEFAULT 'active',
-            FOREIGN KEY (student_id) REFERENCES students(id),
-            FOREIGN KEY (course_id) REFERENCES courses(id),
-            UNIQUE(student_id, course_id)
-        )
-    ''')
-    
-    # Attendance table
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS attendance (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            student_id INTEGER NOT NULL,
-            course_id INTEGER NOT NULL,
-            date DATE NOT NULL,
-            status TEXT NOT NULL CHECK(status IN ('present', 'absent', 'late')),
-            method TEXT DEFAULT 'manual',
-            confidence REAL DEFAULT 0,
-            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (student_id) REFERENCES students(id),
-            FOREIGN KEY (course_id) REFERENCES courses(id)
-        )
-    ''')
-    
-    # Grades table
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS grades (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            student_id INTEGER NOT NULL,
-            course_id INTEGER NOT NULL,
-            grade TEXT,
-            marks REAL,
-            max_marks REAL,
-            exam_type TEXT,
-            exam_date DATE,
-            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (student_id) REFERENCES students(id),
-            FOREIGN KEY (course_id) REFERENCES courses(id)
-        )
-    ''')
-    
-    # Assignments table
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS assignments (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            course_id INTEGER NOT NULL,
-            title TEXT NOT NULL,
-            description TEXT,
-            due_date DATE NOT NULL,
-            max_marks REAL DEFAULT 100,
-            status TEXT DEFAULT 'active',
-            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (course_id) REFERENCES courses(id)
-        )
-    ''')
-    
-    # Assignment submissions table
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS assignment_submissions (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            assignment_id INTEGER NOT NULL,
-            student_id INTEGER NOT NULL,
-            submission_date DATETIME DEFAULT CURRENT_TIMESTAMP,
-            marks REAL,
-            feedback TEXT,
-            status TEXT DEFAULT 'pending',
-            FOREIGN KEY (assignment_id) REFERENCES assignments(id),
-            FOREIGN KEY (student_id) REFERENCES students(id)
-        )
-    ''')
-    
-    # Resources table
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS resources (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            course_id INTEGER NOT NULL,
-            title TEXT NOT NULL,
-            description TEXT,
-            file_type TEXT,
-            file_size TEXT,
-            uploaded_by INTEGER,
-            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (course_id) REFERENCES courses(id),
-            FOREIGN KEY (uploaded_by) REFERENCES users(id)
-        )
-    ''')
-    
-    # Email logs table
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS email_logs (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            recipient_email TEXT NOT NULL,
-            recipient_name TEXT,
-            subject TEXT NOT NULL,
-            message TEXT,
-            status TEXT DEFAULT 'sent',
-            sent_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-            sent_by INTEGER,
-            email_type TEXT,
-            FOREIGN KEY (sent_by) REFERENCES users(id)
-        )
-    ''')
-    
-    # Attendance alerts table
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS attendance_alerts (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            student_id INTEGER NOT NULL,
-            course_id INTEGER NOT NULL,
-            attendance_percentage REAL,
-            alert_sent INTEGER DEFAULT 0,
-            last_alert_date DATE,
-            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (student_id) REFERENCES students(id),
-            FOREIGN KEY (course_id) REFERENCES courses(id)
-        )
-    ''')
-    
-    # Fees table
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS fees (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            student_id INTEGER NOT NULL,
-            total_amount REAL NOT NULL,
-            paid_amount REAL DEFAULT 0,
-            due_amount REAL NOT NULL,
-            due_date DATE NOT NULL,
-            status TEXT DEFAULT 'pending',
-            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (student_id) REFERENCES students(id)
-        )
-    ''')
-    
-    # Parent-Student Link table
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS parent_student_link (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            parent_id INTEGER NOT NULL,
-            student_id INTEGER NOT NULL,
-            relationship TEXT NOT NULL,
-            linked_date DATETIME DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (parent_id) REFERENCES users(id),
-            FOREIGN KEY (student_id) REFERENCES students(id),
-            UNIQUE(parent_id, student_id)
-        )
-    ''')
-    
-    # Events table
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS events (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT NOT NULL,
-            date DATE NOT NULL,
-            time TIME,
-            location TEXT,
-            description TEXT,
-            created_at DATETIME DEFAULT CURRENT_TIMESTAMP
-        )
-    ''')
-    
-    # Timetable table
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS timetable (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            course_id INTEGER NOT NULL,
-            day TEXT NOT NULL,
-            time_slot TEXT NOT NULL,
-            room TEXT,
-            teacher_id INTEGER,
-            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (course_id) REFERENCES courses(id),
-            FOREIGN KEY (teacher_id) REFERENCES users(id)
-        )
-    ''')
-    
-    # Notifications table
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS notifications (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            user_id INTEGER NOT NULL,
-            title TEXT NOT NULL,
-            message TEXT NOT NULL,
-            type TEXT DEFAULT 'info',
-            is_read INTEGER DEFAULT 0,
-            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (user_id) REFERENCES users(id)
-        )
-    ''')
-    
-    conn.commit()
+    create_tables(conn)
+    create_indexes(conn)
+    create_search_index(conn)
     
     # Insert default data
     try:
@@ -505,6 +431,9 @@ def init_db():
                 pass
     
     conn.close()
+    # Enrollments, parent links and sample data may have changed
+    invalidate_student_contexts(data_versions)
+    data_versions.bump(GLOBAL_SCOPE)
     print("✅ Database initialized successfully!")
 
 def login_required(f):
@@ -526,10 +455,154 @@ def role_required(roles):
             if session.get('role') not in roles:
                 flash('You do not have permission to access this page', 'error')
                 return redirect(url_for('index'))
+            if session.get('role') == 'student':
+                g.student = current_student_context()
             return f(*args, **kwargs)
         return decorated_function
     return decorator
 
+def current_student_context():
+    """
+    The logged-in student's cached context, rebuilt when the roster changes
+
+    The context lives in student_contexts; the session cookie only keeps the
+    student id and the stamp, since the cookie is signed but readable.
+
+    Returns:
+        Dict from load_student_context, or None if the user has no student record
+    """
+    # Read the stamp before loading, so a change that lands mid-load
+    # leaves the context stale rather than wrongly current
+    stamp = f'{data_versions.stamp(GLOBAL_SCOPE)}/{data_versions.get(ROSTER_SCOPE)}'
+    user_id = session['user_id']
+    context = student_contexts.get(user_id, stamp)
+    if context is None:
+        conn = get_db_connection()
+        context = load_student_context(conn, user_id)
+        conn.close()
+        if context is None:
+            student_contexts.discard(user_id)
+            session.pop('student_context', None)
+            return None
+        context['version'] = stamp
+        context['user_id'] = user_id
+        student_contexts.put(user_id, context)
+    reference = {'student_id': context['student_id'], 'version': stamp}
+    if session.get('student_context') != reference:
+        session['student_context'] = reference
+    return context
+
+def versioned_etag(*parts):
+    """Strong ETag over data-version counters and the caller's request"""
+    raw = '|'.join(str(part) for part in (
+        data_versions.stamp(GLOBAL_SCOPE), session['user_id'], request.full_path, *parts
+    ))
+    return hashlib.sha1(raw.encode()).hexdigest()
+
+def conditional(etag_for):
+    """
+    Answer If-None-Match from data-version counters before touching the database
+
+    Args:
+        etag_for: called with the view's arguments; returns the current ETag,
+                  or None to skip conditional handling for this request
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            etag = etag_for(**kwargs)
+            if etag is None:
+                return f(*args, **kwargs)
+            if request.if_none_match.contains_weak(etag):
+                response = app.response_class(status=304)
+            else:
+                response = make_response(f(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+            response.set_etag(etag)
+            response.headers['Cache-Control'] = 'private, no-cache'
+            return response
+        return decorated_function
+    return decorator
+
+def student_etag(*sections):
+    """ETag builder for student endpoints; no sections means the sections= parameter"""
+    def etag_for(**kwargs):
+        if not g.get('student'):
+            return None
+        try:
+            names = sections or parse_sections(request.args.get('sections'))
+        except ValueError:
+            return None
+        values = section_versions(data_versions, names, g.student['student_id'],
+                                  session['user_id'], g.student['course_ids'])
+        today = datetime.now().date().isoformat() if DATED_SECTIONS.intersection(names) else ''
+        return versioned_etag(g.student['version'], today, *values)
+    return etag_for
+
+def child_attendance_etag(student_id):
+    """ETag builder for a parent reading a child's attendance"""
+    return versioned_etag(data_versions.stamp(ROSTER_SCOPE), data_versions.get('attendance', student_id))
+
+def attendance_changed(*student_ids):
+    """Bump the versions derived from attendance once a write has committed"""
+    for student_id in student_ids:
+        data_versions.bump('attendance', student_id)
+    data_versions.bump(AGGREGATES_SCOPE)
+
+def json_response(payload, status=200):
+    """
+    JSON response for the hot read endpoints
+
+    Serialized with orjson when it is installed, otherwise with compact
+    stdlib json; either way keys keep their query order instead of being
+    sorted as jsonify() does.
+    """
+    if orjson is not None:
+        body = orjson.dumps(payload, default=str, option=orjson.OPT_NON_STR_KEYS)
+    else:
+        body = json.dumps(payload, separators=(',', ':'), default=str)
+    return app.response_class(body, status=status, mimetype='application/json')
+
+def unread_count(conn, user_id):
+    """Number of unread notifications for a user"""
+    return conn.execute(
+        'SELECT COUNT(*) as count FROM notifications WHERE user_id = ? AND is_read = 0',
+        (user_id,)
+    ).fetchone()['count']
+
+def notify_user(user_id, title, message, notification_type='info'):
+    """
+    Queue a notification (fire-and-forget)
+
+    Once the insert has committed, the user's notification version is bumped
+    and the notification and new unread count are pushed to open event streams.
+
+    Returns:
+        Future resolved with (notification dict, unread count)
+    """
+    def insert(writer):
+        cursor = writer.execute('''
+            INSERT INTO notifications (user_id, title, message, type)
+            VALUES (?, ?, ?, ?)
+        ''', (user_id, title, message, notification_type))
+        notification = writer.execute(
+            'SELECT * FROM notifications WHERE id = ?', (cursor.lastrowid,)
+        ).fetchone()
+        return dict(notification), unread_count(writer, user_id)
+    
+    def published(done):
+        if done.exception() is not None:
+            return
+        notification, count = done.result()
+        data_versions.bump('notifications', user_id)
+        event_broker.publish(f'user:{user_id}', 'notification', notification)
+        event_broker.publish(f'user:{user_id}', 'unread_count', {'unread_count': count})
+    
+    future = write_queue.submit(insert)
+    future.add_done_callback(published)
+    return future
+
 def send_email(to_email, subject, body, email_type='general'):
     """Enhanced email sending with logging"""
     try:
@@ -561,19 +634,16 @@ def send_email(to_email, subject, body, email_type='general'):
         
         msg.attach(MIMEText(html, 'html'))
         
-        with smtplib.SMTP(EMAIL_HOST, EMAIL_PORT) as server:
-            server.starttls()
-            server.login(EMAIL_USERNAME, EMAIL_PASSWORD)
-            server.send_message(msg)
+        with track(SMTP_SEND, SMTP_ERRORS, email_type=email_type):
+            with smtplib.SMTP(EMAIL_HOST, EMAIL_PORT) as server:
+                server.starttls()
+                server.login(EMAIL_USERNAME, EMAIL_PASSWORD)
+                server.send_message(msg)
         
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        cursor.execute('''
+        write_queue.submit('''
             INSERT INTO email_logs (recipient_email, subject, message, status, email_type, sent_by)
             VALUES (?, ?, ?, 'sent', ?, ?)
         ''', (to_email, subject, body, email_type, session.get('user_id')))
-        conn.commit()
-        conn.close()
         
         print(f"✅ Email sent to {to_email}")
         return True
@@ -645,6 +715,9 @@ def login():
             session['role'] = user['role']
             session['email'] = user['email']
             
+            if role == 'student':
+                current_student_context()
+            
             flash(f'Welcome back, {user["full_name"]}!', 'success')
             
             if role == 'admin':
@@ -666,6 +739,152 @@ def logout():
     flash('You have been logged out successfully', 'success')
     return redirect(url_for('index'))
 
+@app.route('/assets/<path:filename>')
+def static_bundle(filename):
+    """Fingerprinted bundle, precompressed if the client accepts it; never changes, so cached for a year"""
+    path, encoding = assets.resolve(filename, request.accept_encodings)
+    if path is None:
+        abort(404)
+    
+    response = send_from_directory(os.path.abspath(assets.output_dir), path,
+                                   mimetype=mimetypes.guess_type(filename)[0], max_age=ASSET_MAX_AGE)
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    response.headers['Vary'] = 'Accept-Encoding'
+    response.headers['Cache-Control'] = f'public, max-age={ASSET_MAX_AGE}, immutable'
+    return response
+
+@app.route('/healthz')
+def healthz():
+    """Liveness: the process is serving requests"""
+    return jsonify({'status': 'ok', 'pid': os.getpid()})
+
+@app.route('/readyz')
+def readyz():
+    """Readiness: the database answers and this worker is not shutting down"""
+    if app.config.get('DRAINING'):
+        return jsonify({'status': 'draining', 'pid': os.getpid()}), 503
+    try:
+        conn = get_db_connection()
+        conn.execute('SELECT 1 FROM users LIMIT 1').fetchone()
+        conn.close()
+    except sqlite3.Error as e:
+        return jsonify({'status': 'unavailable', 'message': str(e), 'pid': os.getpid()}), 503
+    return jsonify({'status': 'ready', 'pid': os.getpid()})
+
+@app.route('/metrics')
+def metrics():
+    """Prometheus scrape endpoint; requires a bearer token when METRICS_TOKEN is set"""
+    if METRICS_TOKEN:
+        supplied = request.headers.get('Authorization', '')
+        if not hmac.compare_digest(supplied, f'Bearer {METRICS_TOKEN}'):
+            return Response('Unauthorized\n', status=401, mimetype='text/plain')
+    return Response(METRICS.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+@app.route('/api/search', methods=['GET'])
+@login_required
+def search_content():
+    """Search announcements, resources, assignments and chat history"""
+    try:
+        query = request.args.get('q', '').strip()
+        sources = [t for t in request.args.get('types', '').split(',') if t] or None
+        limit = page_size(request.args.get('limit', type=int), 20, maximum=50)
+        
+        if not query:
+            return jsonify({'success': False, 'message': 'No search query provided'}), 400
+        
+        scope = None
+        if session.get('role') == 'student':
+            student = current_student_context()
+            scope = (student['course_ids'], student['student_id']) if student else ([], None)
+        
+        conn = get_db_connection()
+        results = search(conn, query, session.get('role'), session['user_id'], sources, limit, scope)
+        conn.close()
+        
+        return jsonify({
+            'success': True,
+            'query': query,
+            'results': results
+        })
+    except Exception as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+
+@app.route('/api/events')
+@role_required(['student', 'parent'])
+def event_stream():
+    """Server-Sent Events: new notifications, unread counts and attendance updates"""
+    channels = [f"user:{session['user_id']}"]
+    if session['role'] == 'student':
+        if g.student:
+            channels.append(f"student:{g.student['student_id']}")
+    else:
+        conn = get_db_connection()
+        children = conn.execute(
+            'SELECT student_id FROM parent_student_link WHERE parent_id = ?',
+            (session['user_id'],)
+        ).fetchall()
+        conn.close()
+        channels += [f"student:{child['student_id']}" for child in children]
+    
+    last_event_id = request.headers.get('Last-Event-ID') or request.args.get('last_event_id')
+    response = Response(event_broker.stream(channels, last_event_id, SSE_HEARTBEAT_SECONDS),
+                        mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    # Stop reverse proxies from buffering the stream
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+@app.route('/api/analytics/timeseries', methods=['GET'])
+@login_required
+def analytics_timeseries():
+    """
+    Grades or attendance bucketed by day, week or month
+
+    Query: metric, interval, start, end, student_id, course_id, by.
+    Students see themselves, parents their linked children, teachers the
+    courses they teach and admins everything.
+    """
+    try:
+        metric = request.args.get('metric', 'grades')
+        interval = request.args.get('interval', 'week')
+        by = request.args.get('by') or None
+        end = request.args.get('end') or datetime.now().date().isoformat()
+        start = request.args.get('start') or (
+            datetime.strptime(end, '%Y-%m-%d').date() - timedelta(weeks=7)
+        ).isoformat()
+        student_ids = request.args.getlist('student_id', type=int) or None
+        course_ids = request.args.getlist('course_id', type=int) or None
+        role = session.get('role')
+        
+        conn = get_db_connection()
+        
+        if role == 'student':
+            student = current_student_context()
+            student_ids = [student['student_id']] if student else []
+        elif role == 'parent':
+            children = [row['student_id'] for row in conn.execute(
+                'SELECT student_id FROM parent_student_link WHERE parent_id = ?',
+                (session['user_id'],)
+            )]
+            student_ids = [s for s in student_ids if s in children] if student_ids else children
+        elif role == 'teacher':
+            taught = [row['id'] for row in conn.execute(
+                'SELECT id FROM courses WHERE teacher_id = ?', (session['user_id'],)
+            )]
+            course_ids = [c for c in course_ids if c in taught] if course_ids else taught
+        elif role != 'admin':
+            conn.close()
+            return jsonify({'success': False, 'message': 'Permission denied'}), 403
+        
+        result = time_series(conn, metric, start, end, interval,
+                             student_ids=student_ids, course_ids=course_ids, by=by)
+        conn.close()
+        
+        return jsonify({'success': True, 'metric': metric, **result})
+    except Exception as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+
 # ============ STUDENT ROUTES ============
 
 @app.route('/student/dashboard')
@@ -700,10 +919,29 @@ def student_chat():
                 else:
                     prompt = f"You are a helpful study assistant. {message}"
                 
-                response = model.generate_content(prompt)
+                operation = chat_type if chat_type in ('explain', 'quiz', 'flashcard') else 'general'
+                
+                def generate():
+                    with track(GEMINI_LATENCY, GEMINI_ERRORS, operation=operation):
+                        return model.generate_content(prompt).text
+                
+                # Topic requests have the same answer for everyone; general chat does not
+                if operation == 'general' and g.student:
+                    student_id = g.student['student_id']
+                    with track(GEMINI_LATENCY, GEMINI_ERRORS, operation=operation):
+                        text = chat_sessions.send(
+                            student_id, message, prompt,
+                            record=lambda reply: record_chat_history(student_id, message, reply, chat_type))
+                else:
+                    if operation == 'general':
+                        text = ai_flights.do(('general', prompt), generate, operation=operation)
+                    else:
+                        text = ai_cache.get_or_compute(f'chat:{operation}', message, generate, model=model.model_name)
+                    if g.student:
+                        record_chat_history(g.student['student_id'], message, text, chat_type)
                 return jsonify({
                     'status': 'success',
-                    'response': response.text
+                    'response': text
                 })
             except Exception as e:
                 print(f"AI Error: {e}")
@@ -721,6 +959,13 @@ def student_chat():
         print(f"Chat error: {e}")
         return jsonify({'status': 'error', 'response': 'Sorry, I encountered an error. Please try again.'}), 500
 
+def record_chat_history(student_id, message, response, chat_type):
+    """Queue a chat exchange for ai_chat_history; returns a Future of the row id"""
+    return write_queue.submit('''
+        INSERT INTO ai_chat_history (student_id, message, response, chat_type)
+        VALUES (?, ?, ?, ?)
+    ''', (student_id, message, response, chat_type))
+
 def get_demo_response(message, chat_type):
     """Generate demo responses when AI is not available"""
     responses = {
@@ -818,221 +1063,165 @@ How can I help you learn better today? 📚✨"""
     
     return responses.get(chat_type, responses['general'])
 
-@app.route('/api/student/courses', methods=['GET'])
+@app.route('/api/student/chat-history', methods=['GET'])
 @role_required(['student'])
-def get_student_courses():
-    """Get all courses for logged-in student"""
+def get_chat_history():
+    """Get AI chat history for logged-in student, newest first"""
     try:
-        conn = get_db_connection()
+        cursor = decode_cursor(request.args.get('cursor'))
+        limit = page_size(request.args.get('limit', type=int), 20)
         
-        student = conn.execute(
-            'SELECT id FROM students WHERE user_id = ?',
-            (session['user_id'],)
-        ).fetchone()
-        
-        if not student:
+        if not g.student:
             return jsonify({'success': False, 'message': 'Student not found'}), 404
         
-        courses = conn.execute('''
-            SELECT c.*, u.full_name as teacher_name,
-                   COUNT(DISTINCT a.id) as total_classes,
-                   SUM(CASE WHEN a.status = 'present' THEN 1 ELSE 0 END) as present_count,
-                   ROUND((SUM(CASE WHEN a.status = 'present' THEN 1 ELSE 0 END) * 100.0 / 
-                          NULLIF(COUNT(DISTINCT a.id), 0)), 2) as attendance_percentage
-            FROM courses c
-            JOIN enrollments e ON c.id = e.course_id
-            JOIN users u ON c.teacher_id = u.id
-            LEFT JOIN attendance a ON c.id = a.course_id AND a.student_id = ?
-            WHERE e.student_id = ?
-            GROUP BY c.id
-        ''', (student['id'], student['id'])).fetchall()
+        conn = get_db_connection()
+        
+        if cursor is None:
+            history = conn.execute('''
+                SELECT * FROM ai_chat_history
+                WHERE student_id = ?
+                ORDER BY created_at DESC, id DESC
+                LIMIT ?
+            ''', (g.student['student_id'], limit + 1)).fetchall()
+        else:
+            history = conn.execute('''
+                SELECT * FROM ai_chat_history
+                WHERE student_id = ? AND (created_at, id) < (?, ?)
+                ORDER BY created_at DESC, id DESC
+                LIMIT ?
+            ''', (g.student['student_id'], *cursor, limit + 1)).fetchall()
         
         conn.close()
         
+        history, next_cursor = build_page(history, limit, lambda h: (h['created_at'], h['id']))
+        
         return jsonify({
             'success': True,
-            'courses': [dict(course) for course in courses]
+            'history': [dict(h) for h in history],
+            'next_cursor': next_cursor
         })
     except Exception as e:
         return jsonify({'success': False, 'message': str(e)}), 400
 
+@app.route('/api/student/dashboard', methods=['GET'])
+@role_required(['student'])
+@conditional(student_etag())
+def get_student_dashboard():
+    """Everything the student dashboard needs, read in one transaction"""
+    try:
+        sections = parse_sections(request.args.get('sections'))
+        fields = parse_fields(request.args.get('fields'))
+        
+        if not g.student:
+            return jsonify({'success': False, 'message': 'Student not found'}), 404
+        
+        conn = get_db_connection()
+        data = load_dashboard(conn, g.student['student_id'], session['user_id'], sections, fields)
+        
+        conn.close()
+        
+        return json_response({'success': True, **data})
+    except Exception as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+
+@app.route('/api/student/courses', methods=['GET'])
+@role_required(['student'])
+@conditional(student_etag('courses'))
+def get_student_courses():
+    """Get all courses for logged-in student"""
+    try:
+        fields = parse_fields(request.args.get('fields'), 'courses').get('courses')
+        
+        if not g.student:
+            return jsonify({'success': False, 'message': 'Student not found'}), 404
+        
+        conn = get_db_connection()
+        data = DASHBOARD_SECTIONS['courses'](conn, g.student['student_id'], session['user_id'], fields=fields)
+        
+        conn.close()
+        
+        return json_response({'success': True, **data})
+    except Exception as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+
 @app.route('/api/student/attendance', methods=['GET'])
 @role_required(['student'])
+@conditional(student_etag('attendance'))
 def get_student_attendance():
     """Get attendance records for logged-in student"""
     try:
-        conn = get_db_connection()
+        cursor = decode_cursor(request.args.get('cursor'))
+        limit = page_size(request.args.get('limit', type=int), 50)
+        fields = parse_fields(request.args.get('fields'), 'attendance').get('attendance')
         
-        student = conn.execute(
-            'SELECT id FROM students WHERE user_id = ?',
-            (session['user_id'],)
-        ).fetchone()
-        
-        if not student:
+        if not g.student:
             return jsonify({'success': False, 'message': 'Student not found'}), 404
         
-        # Overall statistics
-        stats = conn.execute('''
-            SELECT COUNT(*) as total_classes,
-                   SUM(CASE WHEN status = 'present' THEN 1 ELSE 0 END) as present_count,
-                   SUM(CASE WHEN status = 'absent' THEN 1 ELSE 0 END) as absent_count,
-                   ROUND((SUM(CASE WHEN status = 'present' THEN 1 ELSE 0 END) * 100.0 / 
-                          NULLIF(COUNT(*), 0)), 2) as attendance_percentage
-            FROM attendance
-            WHERE student_id = ?
-        ''', (student['id'],)).fetchone()
-        
-        # Recent attendance records
-        records = conn.execute('''
-            SELECT a.*, c.course_name, c.course_code
-            FROM attendance a
-            JOIN courses c ON a.course_id = c.id
-            WHERE a.student_id = ?
-            ORDER BY a.date DESC, a.timestamp DESC
-            LIMIT 50
-        ''', (student['id'],)).fetchall()
+        conn = get_db_connection()
+        data = DASHBOARD_SECTIONS['attendance'](conn, g.student['student_id'], session['user_id'],
+                                                cursor, limit, fields=fields)
         
         conn.close()
         
-        return jsonify({
-            'success': True,
-            'stats': dict(stats),
-            'records': [dict(record) for record in records]
-        })
+        return json_response({'success': True, **data})
     except Exception as e:
         return jsonify({'success': False, 'message': str(e)}), 400
 
 @app.route('/api/student/grades', methods=['GET'])
 @role_required(['student'])
+@conditional(student_etag('grades'))
 def get_student_grades():
     """Get grades for logged-in student"""
     try:
-        conn = get_db_connection()
-        
-        student = conn.execute(
-            'SELECT id FROM students WHERE user_id = ?',
-            (session['user_id'],)
-        ).fetchone()
+        fields = parse_fields(request.args.get('fields'), 'grades').get('grades')
         
-        if not student:
+        if not g.student:
             return jsonify({'success': False, 'message': 'Student not found'}), 404
         
-        grades = conn.execute('''
-            SELECT g.*, c.course_name, c.course_code
-            FROM grades g
-            JOIN courses c ON g.course_id = c.id
-            WHERE g.student_id = ?
-            ORDER BY g.created_at DESC
-        ''', (student['id'],)).fetchall()
-        
-        # Calculate GPA
-        total_marks = 0
-        total_max_marks = 0
-        grade_counts = {'A+': 0, 'A': 0, 'A-': 0, 'B+': 0, 'B': 0, 'B-': 0, 'C+': 0, 'C': 0}
-        
-        for grade in grades:
-            if grade['marks'] and grade['max_marks']:
-                total_marks += grade['marks']
-                total_max_marks += grade['max_marks']
-            if grade['grade'] in grade_counts:
-                grade_counts[grade['grade']] += 1
-        
-        gpa = round((total_marks / total_max_marks) * 4.0, 2) if total_max_marks > 0 else 0
+        conn = get_db_connection()
+        data = DASHBOARD_SECTIONS['grades'](conn, g.student['student_id'], session['user_id'], fields=fields)
         
         conn.close()
         
-        return jsonify({
-            'success': True,
-            'grades': [dict(grade) for grade in grades],
-            'gpa': gpa,
-            'grade_distribution': grade_counts
-        })
+        return json_response({'success': True, **data})
     except Exception as e:
         return jsonify({'success': False, 'message': str(e)}), 400
 
 @app.route('/api/student/assignments', methods=['GET'])
 @role_required(['student'])
+@conditional(student_etag('assignments'))
 def get_student_assignments():
     """Get assignments for logged-in student"""
     try:
-        conn = get_db_connection()
-        
-        student = conn.execute(
-            'SELECT id FROM students WHERE user_id = ?',
-            (session['user_id'],)
-        ).fetchone()
+        fields = parse_fields(request.args.get('fields'), 'assignments').get('assignments')
         
-        if not student:
+        if not g.student:
             return jsonify({'success': False, 'message': 'Student not found'}), 404
         
-        assignments = conn.execute('''
-            SELECT a.*, c.course_name, c.course_code,
-                   s.status as submission_status, s.marks as obtained_marks,
-                   s.feedback, s.submission_date
-            FROM assignments a
-            JOIN courses c ON a.course_id = c.id
-            JOIN enrollments e ON c.id = e.course_id
-            LEFT JOIN assignment_submissions s ON a.id = s.assignment_id AND s.student_id = ?
-            WHERE e.student_id = ? AND a.status = 'active'
-            ORDER BY a.due_date ASC
-        ''', (student['id'], student['id'])).fetchall()
+        conn = get_db_connection()
+        data = DASHBOARD_SECTIONS['assignments'](conn, g.student['student_id'], session['user_id'], fields=fields)
         
         conn.close()
         
-        # Categorize assignments
-        pending = []
-        completed = []
-        overdue = []
-        
-        today = datetime.now().date()
-        
-        for assignment in assignments:
-            assignment_dict = dict(assignment)
-            due_date = datetime.strptime(assignment['due_date'], '%Y-%m-%d').date()
-            
-            if assignment['submission_status'] == 'submitted':
-                completed.append(assignment_dict)
-            elif due_date < today:
-                overdue.append(assignment_dict)
-            else:
-                pending.append(assignment_dict)
-        
-        return jsonify({
-            'success': True,
-            'pending': pending,
-            'completed': completed,
-            'overdue': overdue,
-            'total': len(assignments)
-        })
+        return json_response({'success': True, **data})
     except Exception as e:
         return jsonify({'success': False, 'message': str(e)}), 400
 
 @app.route('/api/student/notifications', methods=['GET'])
 @role_required(['student'])
+@conditional(student_etag('notifications'))
 def get_student_notifications():
     """Get notifications for logged-in student"""
     try:
-        conn = get_db_connection()
-        
-        notifications = conn.execute('''
-            SELECT * FROM notifications
-            WHERE user_id = ?
-            ORDER BY created_at DESC
-            LIMIT 20
-        ''', (session['user_id'],)).fetchall()
-        
-        unread_count = conn.execute('''
-            SELECT COUNT(*) as count FROM notifications
-            WHERE user_id = ? AND is_read = 0
-        ''', (session['user_id'],)).fetchone()['count']
+        cursor = decode_cursor(request.args.get('cursor'))
+        limit = page_size(request.args.get('limit', type=int), 20)
+        fields = parse_fields(request.args.get('fields'), 'notifications').get('notifications')
         
+        conn = get_db_connection()
+        data = DASHBOARD_SECTIONS['notifications'](conn, None, session['user_id'], cursor, limit, fields=fields)
         conn.close()
         
-        return jsonify({
-            'success': True,
-            'notifications': [dict(n) for n in notifications],
-            'unread_count': unread_count
-        })
+        return json_response({'success': True, **data})
     except Exception as e:
         return jsonify({'success': False, 'message': str(e)}), 400
 
@@ -1041,17 +1230,19 @@ def get_student_notifications():
 def mark_notification_read(notification_id):
     """Mark notification as read"""
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
+        user_id = session['user_id']
         
-        cursor.execute('''
-            UPDATE notifications
-            SET is_read = 1
-            WHERE id = ? AND user_id = ?
-        ''', (notification_id, session['user_id']))
+        def mark_read(writer):
+            writer.execute('''
+                UPDATE notifications
+                SET is_read = 1
+                WHERE id = ? AND user_id = ?
+            ''', (notification_id, user_id))
+            return unread_count(writer, user_id)
         
-        conn.commit()
-        conn.close()
+        count = write_queue.execute(mark_read)
+        data_versions.bump('notifications', user_id)
+        event_broker.publish(f'user:{user_id}', 'unread_count', {'unread_count': count})
         
         return jsonify({'success': True, 'message': 'Notification marked as read'})
     except Exception as e:
@@ -1066,53 +1257,51 @@ def mark_face_attendance():
         course_id = data.get('course_id')
         confidence = data.get('confidence', 95.0)
         
-        conn = get_db_connection()
-        
-        student = conn.execute(
-            'SELECT id FROM students WHERE user_id = ?',
-            (session['user_id'],)
-        ).fetchone()
-        
-        if not student:
+        if not g.student:
             return jsonify({'success': False, 'message': 'Student not found'}), 404
         
-        # Check if attendance already marked today for this course
+        student_id = g.student['student_id']
         today = datetime.now().date().strftime('%Y-%m-%d')
-        existing = conn.execute('''
-            SELECT id FROM attendance
-            WHERE student_id = ? AND course_id = ? AND date = ?
-        ''', (student['id'], course_id, today)).fetchone()
-        
-        cursor = conn.cursor()
         
-        if existing:
-            # Update existing attendance
-            cursor.execute('''
-                UPDATE attendance
-                SET status = 'present', method = 'face_recognition', 
-                    confidence = ?, timestamp = CURRENT_TIMESTAMP
-                WHERE id = ?
-            ''', (confidence, existing['id']))
-        else:
-            # Insert new attendance
-            cursor.execute('''
-                INSERT INTO attendance (student_id, course_id, date, status, method, confidence)
-                VALUES (?, ?, ?, 'present', 'face_recognition', ?)
-            ''', (student['id'], course_id, today, confidence))
-        
-        conn.commit()
-        
-        # Create notification
-        cursor.execute('''
-            INSERT INTO notifications (user_id, title, message, type)
-            VALUES (?, ?, ?, ?)
-        ''', (session['user_id'], 
-              'Attendance Marked Successfully',
-              f'Your attendance has been recorded using face recognition (Confidence: {confidence}%)',
-              'success'))
+        def record_attendance(writer):
+            # Check if attendance already marked today for this course
+            existing = writer.execute('''
+                SELECT id FROM attendance
+                WHERE student_id = ? AND course_id = ? AND date = ?
+            ''', (student_id, course_id, today)).fetchone()
+            
+            if existing:
+                # Update existing attendance
+                writer.execute('''
+                    UPDATE attendance
+                    SET status = 'present', method = 'face_recognition', 
+                        confidence = ?, timestamp = CURRENT_TIMESTAMP
+                    WHERE id = ?
+                ''', (confidence, existing['id']))
+            else:
+                # Insert new attendance
+                writer.execute('''
+                    INSERT INTO attendance (student_id, course_id, date, status, method, confidence)
+                    VALUES (?, ?, ?, 'present', 'face_recognition', ?)
+                ''', (student_id, course_id, today, confidence))
+        
+        # Attendance must be durable before we confirm it
+        write_queue.execute(record_attendance)
+        attendance_changed(student_id)
+        
+        event_broker.publish(f'student:{student_id}', 'attendance', {
+            'course_id': course_id,
+            'date': today,
+            'status': 'present',
+            'method': 'face_recognition',
+            'confidence': confidence
+        })
         
-        conn.commit()
-        conn.close()
+        # Create notification (fire-and-forget)
+        notify_user(session['user_id'],
+                    'Attendance Marked Successfully',
+                    f'Your attendance has been recorded using face recognition (Confidence: {confidence}%)',
+                    'success')
         
         return jsonify({
             'success': True,
@@ -1124,54 +1313,26 @@ def mark_face_attendance():
 
 @app.route('/api/student/performance-data', methods=['GET'])
 @role_required(['student'])
+@conditional(student_etag('performance'))
 def get_performance_data():
     """Get performance data for charts"""
     try:
-        conn = get_db_connection()
+        fields = parse_fields(request.args.get('fields'), 'performance').get('performance')
         
-        student = conn.execute(
-            'SELECT id FROM students WHERE user_id = ?',
-            (session['user_id'],)
-        ).fetchone()
-        
-        if not student:
+        if not g.student:
             return jsonify({'success': False, 'message': 'Student not found'}), 404
         
-        # Get weekly performance data (last 8 weeks)
-        performance = []
-        for i in range(7, -1, -1):
-            week_start = datetime.now() - timedelta(weeks=i)
-            week_end = week_start + timedelta(days=7)
-            
-            # Calculate average marks for that week
-            avg_marks = conn.execute('''
-                SELECT AVG(marks * 100.0 / max_marks) as avg
-                FROM grades
-                WHERE student_id = ? 
-                AND exam_date BETWEEN ? AND ?
-            ''', (student['id'], 
-                  week_start.strftime('%Y-%m-%d'),
-                  week_end.strftime('%Y-%m-%d'))).fetchone()
-            
-            performance.append({
-                'week': f'Week {8-i}',
-                'score': round(avg_marks['avg'] if avg_marks['avg'] else 75 + i*2, 1)
-            })
+        conn = get_db_connection()
+        data = DASHBOARD_SECTIONS['performance'](conn, g.student['student_id'], session['user_id'], fields=fields)
         
         conn.close()
         
-        return jsonify({
-            'success': True,
-            'performance': performance
-        })
+        return json_response({'success': True, **data})
     except Exception as e:
         return jsonify({'success': False, 'message': str(e)}), 400
 
-# ============ ADMIN ROUTES ============
-
-@app.route('/admin/dashboard')
-@role_required(['admin'])
-def admin_dashboard():
+def load_admin_overview():
+    """Counts, recent attendance and low-attendance students for the admin dashboard"""
     conn = get_db_connection()
     
     total_students = conn.execute('SELECT COUNT(*) as count FROM students').fetchone()['count']
@@ -1201,12 +1362,190 @@ def admin_dashboard():
     
     conn.close()
     
+    # Plain dicts, so cached rows do not hold on to the closed connection
+    return {
+        'total_students': total_students,
+        'total_teachers': total_teachers,
+        'total_courses': total_courses,
+        'recent_attendance': [dict(row) for row in recent_attendance],
+        'low_attendance_students': [dict(row) for row in low_attendance_students]
+    }
+
+@app.route('/admin/dashboard')
+@role_required(['admin'])
+def admin_dashboard():
+    overview = aggregate_cache.get('admin_overview', load_admin_overview,
+                                   (GLOBAL_SCOPE, ROSTER_SCOPE, AGGREGATES_SCOPE))
+    
     return render_template('admin/admin_dashboard.html',
-                         total_students=total_students,
-                         total_teachers=total_teachers,
-                         total_courses=total_courses,
-                         recent_attendance=recent_attendance,
-                         low_attendance_students=low_attendance_students)
+                         stats_age=int(overview.age),
+                         stats_refreshing=overview.refreshing,
+                         **overview.value)
+
+@app.route('/api/admin/attendance-report', methods=['GET'])
+@role_required(['admin'])
+def attendance_report():
+    """Per-course attendance totals over a date range, including archived terms"""
+    try:
+        start = request.args.get('start')
+        end = request.args.get('end')
+        
+        conn = get_db_connection()
+        terms = attach_history(conn, start, end)
+        
+        query = '''
+            SELECT c.id as course_id, c.course_code, c.course_name,
+                   COUNT(*) as total_records,
+                   SUM(CASE WHEN h.status = 'present' THEN 1 ELSE 0 END) as present_count,
+                   SUM(CASE WHEN h.status = 'absent' THEN 1 ELSE 0 END) as absent_count,
+                   ROUND(SUM(CASE WHEN h.status = 'present' THEN 1 ELSE 0 END) * 100.0 /
+                         NULLIF(COUNT(*), 0), 2) as attendance_percentage
+            FROM attendance_history h
+            JOIN courses c ON h.course_id = c.id
+            WHERE 1 = 1
+        '''
+        params = []
+        if start:
+            query += ' AND h.date >= ?'
+            params.append(start)
+        if end:
+            query += ' AND h.date <= ?'
+            params.append(end)
+        report = conn.execute(query + ' GROUP BY c.id ORDER BY c.course_code', params).fetchall()
+        
+        conn.close()
+        
+        return jsonify({
+            'success': True,
+            'archived_terms': terms,
+            'report': [dict(row) for row in report]
+        })
+    except Exception as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+
+@app.route('/api/admin/attendance-export', methods=['GET'])
+@role_required(['admin'])
+def attendance_export():
+    """
+    Stream every attendance record, including archived terms
+
+    Query: course_id (repeatable), start, end, status (repeatable),
+    format = csv | ndjson, compress = gzip.
+    """
+    try:
+        export = request.args.get('format', 'csv')
+        if export not in ('csv', 'ndjson'):
+            return jsonify({'success': False, 'message': f'Unknown format: {export}'}), 400
+        compress = request.args.get('compress')
+        if compress not in (None, '', 'gzip'):
+            return jsonify({'success': False, 'message': f'Unknown compression: {compress}'}), 400
+        course_ids = request.args.getlist('course_id', type=int) or None
+        statuses = request.args.getlist('status') or None
+        for status in statuses or ():
+            if status not in STATUSES:
+                return jsonify({'success': False, 'message': f'Unknown status: {status}'}), 400
+        start = request.args.get('start') or None
+        end = request.args.get('end') or None
+        for value in (start, end):
+            if value:
+                datetime.strptime(value, '%Y-%m-%d')
+        
+        # Filters are checked before the first byte is sent; once streaming
+        # starts the status code can no longer change
+        def records():
+            conn = get_db_connection()
+            try:
+                yield from export_attendance(conn, course_ids, start, end, statuses)
+            finally:
+                conn.close()
+        
+        if export == 'csv':
+            body = stream_csv(records(), header=EXPORT_COLUMNS)
+            mimetype = 'text/csv'
+        else:
+            body = stream_ndjson(dict(row) for row in records())
+            mimetype = 'application/x-ndjson'
+        filename = f'attendance_export_{datetime.now():%Y%m%d_%H%M%S}.{export}'
+        if compress:
+            body = gzip_stream(body)
+            mimetype = 'application/gzip'
+            filename += '.gz'
+        
+        print(f"📤 Attendance export started ({export}{', gzip' if compress else ''})")
+        return Response(body, mimetype=mimetype, headers={
+            'Content-Disposition': f'attachment; filename="{filename}"'
+        })
+    except Exception as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+
+@app.route('/api/admin/roster-import', methods=['POST'])
+@role_required(['admin'])
+def roster_import():
+    """
+    Bulk-create students, teachers and parents from an uploaded CSV or XLSX
+
+    Form: file, default_password (optional). See database/roster_import.py
+    for the columns. Re-importing a file only adds what is missing.
+    """
+    try:
+        upload = request.files.get('file')
+        if upload is None or not upload.filename:
+            return jsonify({'success': False, 'message': 'No roster file uploaded'}), 400
+        records = read_roster(upload.stream, upload.filename)
+        
+        conn = get_db_connection()
+        try:
+            result = import_roster(
+                conn, records,
+                write=lambda fn: write_queue.execute(fn, timeout=120),
+                default_password=request.form.get('default_password') or None,
+                workers=ROSTER_IMPORT_WORKERS
+            )
+        finally:
+            conn.close()
+        
+        if result['created'] or result['enrollments'] or result['parent_links']:
+            data_versions.bump(GLOBAL_SCOPE)
+        print(f"📥 Roster import: {result['created']} created, {result['existing']} existing, {result['failed']} failed")
+        
+        return jsonify({'success': True, **result})
+    except Exception as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+
+@app.route('/api/admin/ai-cache', methods=['GET'])
+@role_required(['admin'])
+def ai_cache_stats():
+    """Cached AI answers per prompt type"""
+    try:
+        return jsonify({'success': True, **ai_cache.stats()})
+    except Exception as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+
+@app.route('/api/admin/ai-cache', methods=['DELETE'])
+@role_required(['admin'])
+def purge_ai_cache():
+    """Delete cached AI answers; ?type=, ?topic= and ?expired=1 narrow it down"""
+    try:
+        deleted = ai_cache.purge(kind=request.args.get('type'), topic=request.args.get('topic'),
+                                 expired_only=request.args.get('expired') == '1')
+        print(f"🧹 Purged {deleted} cached AI answers")
+        return jsonify({'success': True, 'deleted': deleted})
+    except Exception as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+
+@app.route('/api/admin/profiles', methods=['GET'])
+@role_required(['admin'])
+def list_profiles():
+    """Saved request profiles, newest first"""
+    return jsonify({'success': True, 'profiles': profiler.list_profiles()})
+
+@app.route('/api/admin/profiles/<name>', methods=['GET'])
+@role_required(['admin'])
+def download_profile(name):
+    """One profile as collapsed stacks, for flamegraph.pl or speedscope"""
+    if not name.endswith('.folded'):
+        return jsonify({'success': False, 'message': 'Profile not found'}), 404
+    return send_from_directory(os.path.abspath(profiler.directory), name, mimetype='text/plain', as_attachment=True)
 
 # ============ TEACHER ROUTES ============
 
@@ -1248,32 +1587,37 @@ def mark_attendance():
         date = data['date']
         attendance_list = data['attendance']
         
-        conn = get_db_connection()
-        cursor = conn.cursor()
+        def record_attendance(writer):
+            for record in attendance_list:
+                student_id = record['student_id']
+                status = record['status']
+                
+                existing = writer.execute('''
+                    SELECT id FROM attendance 
+                    WHERE student_id = ? AND course_id = ? AND date = ?
+                ''', (student_id, course_id, date)).fetchone()
+                
+                if existing:
+                    writer.execute('''
+                        UPDATE attendance 
+                        SET status = ?, timestamp = CURRENT_TIMESTAMP
+                        WHERE id = ?
+                    ''', (status, existing['id']))
+                else:
+                    writer.execute('''
+                        INSERT INTO attendance (student_id, course_id, date, status, method)
+                        VALUES (?, ?, ?, ?, 'manual')
+                    ''', (student_id, course_id, date, status))
         
+        write_queue.execute(record_attendance)
+        attendance_changed(*(record['student_id'] for record in attendance_list))
         for record in attendance_list:
-            student_id = record['student_id']
-            status = record['status']
-            
-            existing = conn.execute('''
-                SELECT id FROM attendance 
-                WHERE student_id = ? AND course_id = ? AND date = ?
-            ''', (student_id, course_id, date)).fetchone()
-            
-            if existing:
-                cursor.execute('''
-                    UPDATE attendance 
-                    SET status = ?, timestamp = CURRENT_TIMESTAMP
-                    WHERE id = ?
-                ''', (status, existing['id']))
-            else:
-                cursor.execute('''
-                    INSERT INTO attendance (student_id, course_id, date, status, method)
-                    VALUES (?, ?, ?, ?, 'manual')
-                ''', (student_id, course_id, date, status))
-        
-        conn.commit()
-        conn.close()
+            event_broker.publish(f"student:{record['student_id']}", 'attendance', {
+                'course_id': course_id,
+                'date': date,
+                'status': record['status'],
+                'method': 'manual'
+            })
         
         return jsonify({
             'success': True,
@@ -1282,72 +1626,111 @@ def mark_attendance():
     except Exception as e:
         return jsonify({'success': False, 'message': str(e)}), 400
 
+@app.route('/api/teacher/courses/<int:course_id>/attendance-matrix', methods=['GET'])
+@role_required(['teacher', 'admin'])
+def attendance_matrix(course_id):
+    """
+    Student x date attendance matrix for one course
+
+    Query: start, end (inclusive ISO dates), format = json | csv | xlsx.
+    CSV and XLSX are streamed as they are written.
+    """
+    try:
+        start = request.args.get('start') or None
+        end = request.args.get('end') or None
+        export = request.args.get('format', 'json')
+        if export not in ('json', 'csv', 'xlsx'):
+            return jsonify({'success': False, 'message': f'Unknown format: {export}'}), 400
+        
+        conn = get_db_connection()
+        course = conn.execute('SELECT teacher_id FROM courses WHERE id = ?', (course_id,)).fetchone()
+        if course is None:
+            conn.close()
+            return jsonify({'success': False, 'message': 'Course not found'}), 404
+        # Checked before the matrix is built, so other teachers' courses cost nothing
+        if session['role'] == 'teacher' and course['teacher_id'] != session['user_id']:
+            conn.close()
+            return jsonify({'success': False, 'message': 'Permission denied'}), 403
+        
+        matrix = build_attendance_matrix(conn, course_id, start, end)
+        conn.close()
+        
+        if matrix is None:
+            return jsonify({'success': False, 'message': 'Course not found'}), 404
+        
+        if export == 'json':
+            return jsonify({'success': True, **matrix_json(matrix)})
+        
+        filename = f"attendance_{matrix['course']['course_code']}"
+        if start or end:
+            filename += f"_{start or 'start'}_{end or 'end'}"
+        if export == 'csv':
+            body = stream_csv(matrix_rows(matrix), header=matrix_header(matrix))
+            mimetype = 'text/csv'
+        else:
+            body = stream_xlsx(matrix_rows(matrix), header=matrix_header(matrix),
+                               sheet_name=matrix['course']['course_code'])
+            mimetype = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+        
+        return Response(body, mimetype=mimetype, headers={
+            'Content-Disposition': f'attachment; filename="{filename}.{export}"'
+        })
+    except Exception as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+
 # ============ PARENT ROUTES ============
 
 @app.route('/parent/dashboard')
 @role_required(['parent'])
 def parent_dashboard():
     conn = get_db_connection()
-    
-    children = conn.execute('''
-        SELECT s.*, u.username
-        FROM students s
-        JOIN parent_student_link psl ON s.id = psl.student_id
-        LEFT JOIN users u ON s.user_id = u.id
-        WHERE psl.parent_id = ?
-    ''', (session['user_id'],)).fetchall()
+    children = load_children_overview(conn, session['user_id'])
+    conn.close()
     
     if not children:
-        conn.close()
-        return render_template('parent/parent_dashboard.html', 
-                             children=None, student=None, courses=None,
-                             attendance_percentage=0, recent_attendance=[], fees=None)
+        return render_template('parent/parent_dashboard.html', children=None, student=None)
     
-    student = children[0]
+    # Every child is rendered; the switcher only changes which one is shown
+    selected = request.args.get('child', type=int)
+    student = next((child for child in children if child['id'] == selected), children[0])
     
-    courses = conn.execute('''
-        SELECT c.*, u.full_name as teacher_name
-        FROM courses c
-        JOIN enrollments e ON c.id = e.course_id
-        JOIN users u ON c.teacher_id = u.id
-        WHERE e.student_id = ?
-    ''', (student['id'],)).fetchall()
-    
-    attendance_data = conn.execute('''
-        SELECT COUNT(*) as total_classes,
-               SUM(CASE WHEN status = 'present' THEN 1 ELSE 0 END) as present_count
-        FROM attendance
-        WHERE student_id = ?
-    ''', (student['id'],)).fetchone()
-    
-    total = attendance_data['total_classes'] if attendance_data['total_classes'] else 1
-    attendance_percentage = round((attendance_data['present_count'] / total * 100), 1) if total > 0 else 0
-    
-    recent_attendance = conn.execute('''
-        SELECT a.*, c.course_name, c.course_code
-        FROM attendance a
-        JOIN courses c ON a.course_id = c.id
-        WHERE a.student_id = ?
-        ORDER BY a.date DESC
-        LIMIT 20
-    ''', (student['id'],)).fetchall()
-    
-    fees = conn.execute('''
-        SELECT * FROM fees 
-        WHERE student_id = ? 
-        ORDER BY created_at DESC 
-        LIMIT 1
-    ''', (student['id'],)).fetchone()
-    
-    conn.close()
-    
-    return render_template('parent/parent_dashboard.html',
-                         children=children, student=student, courses=courses,
-                         attendance_percentage=attendance_percentage,
-                         recent_attendance=recent_attendance, fees=fees)
+    return render_template('parent/parent_dashboard.html', children=children, student=student)
 
-if __name__ == '__main__':
-    os.makedirs('database', exist_ok=True)
+@app.route('/api/parent/attendance/<int:student_id>', methods=['GET'])
+@role_required(['parent'])
+@conditional(child_attendance_etag)
+def get_child_attendance(student_id):
+    """Page through a linked child's attendance records"""
+    try:
+        cursor = decode_cursor(request.args.get('cursor'))
+        limit = page_size(request.args.get('limit', type=int), 20)
+        
+        conn = get_db_connection()
+        
+        link = conn.execute('''
+            SELECT 1 FROM parent_student_link
+            WHERE parent_id = ? AND student_id = ?
+        ''', (session['user_id'], student_id)).fetchone()
+        
+        if not link:
+            conn.close()
+            return jsonify({'success': False, 'message': 'Student not found'}), 404
+        
+        records, next_cursor = fetch_attendance_page(conn, student_id, cursor, limit)
+        
+        conn.close()
+        
+        return jsonify({
+            'success': True,
+            'records': [dict(record) for record in records],
+            'next_cursor': next_cursor
+        })
+    except Exception as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+
+def prepare_database():
+    """Create and seed the database on first start, and migrate an existing one"""
+    os.makedirs(os.path.dirname(DATABASE_PATH) or '.', exist_ok=True)
     
     if not os.path.exists(DATABASE_PATH):
         print("🔧 Initializing database...")
@@ -1355,12 +1738,20 @@ if __name__ == '__main__':
         print("✅ Database initialized!")
     else:
         conn = get_db_connection()
+        # Databases created by older versions lack newer tables, the keyset
+        # paging indexes and the search index; all of it is IF NOT EXISTS
+        create_tables(conn)
+        create_indexes(conn)
+        create_search_index(conn)
         student_count = conn.execute('SELECT COUNT(*) as count FROM students').fetchone()['count']
         conn.close()
         
         if student_count == 0:
             print("🔧 Adding sample data...")
             init_db()
+
+if __name__ == '__main__':
+    prepare_database()
     
     print("\n" + "="*70)
     print("🚀 SaarthiAI Ultimate Server Starting...")
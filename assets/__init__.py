@@ -0,0 +1,9 @@
+"""
+Assets module for SaarthiAI
+Fingerprinted static bundles and gzip/brotli response compression
+"""
+
+from .bundles import AssetManifest, build
+from .compression import ResponseCompressor
+
+__all__ = ['AssetManifest', 'ResponseCompressor', 'build']
\ No newline at end of file
@@ -0,0 +1,217 @@
+"""
+Fingerprinted static bundles for SaarthiAI
+Copies the stylesheets and scripts under static/ to content-hashed file
+names with precompressed gzip (and brotli, when installed) variants, so
+they can be served with a year-long immutable Cache-Control
+
+Usage:
+    python -m assets.bundles --source static --output static/dist
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+BUNDLE_DIRS = ('css', 'js')
+MANIFEST = 'manifest.json'
+HASH_LENGTH = 12
+
+# Hashed names of recent builds, newest first. Files of the last
+# KEEP_BUILDS builds stay on disk, so pages rendered by workers that are
+# still draining after a reload, and pages already open in browsers,
+# keep loading their stylesheets and scripts
+HISTORY = 'history.json'
+KEEP_BUILDS = 3
+
+# Variants in order of preference when the client accepts several
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+
+def fingerprinted(name, data):
+    """'css/app.css' -> 'css/app.<content hash>.css'"""
+    stem, extension = os.path.splitext(name)
+    return f'{stem}.{hashlib.sha256(data).hexdigest()[:HASH_LENGTH]}{extension}'
+
+
+def _write(path, data):
+    # Readers (and other workers building at the same time) only ever see a
+    # complete file
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temporary = f'{path}.{os.getpid()}.tmp'
+    with open(temporary, 'wb') as f:
+        f.write(data)
+    os.replace(temporary, path)
+
+
+def _variants(data):
+    # mtime=0 keeps the gzip bytes identical between builds
+    yield '.gz', gzip.compress(data, compresslevel=9, mtime=0)
+    if brotli is not None:
+        yield '.br', brotli.compress(data, quality=11)
+
+
+def read_history(output_dir):
+    """Hashed names of the retained builds, newest first"""
+    try:
+        with open(os.path.join(output_dir, HISTORY)) as f:
+            return [list(names) for names in json.load(f)]
+    except (OSError, ValueError):
+        return []
+
+
+def build(source_dir, output_dir, keep_builds=KEEP_BUILDS):
+    """
+    Fingerprint every bundle and write the manifest
+
+    Unchanged bundles are not rewritten. Files of the previous keep_builds - 1
+    builds are kept; older ones are removed.
+
+    Args:
+        source_dir: the static/ directory
+        output_dir: where hashed files and manifest.json are written
+        keep_builds: builds whose files stay on disk, this one included
+
+    Returns:
+        Dict of source name ('css/app.css') -> hashed name
+    """
+    manifest = {}
+    for directory in BUNDLE_DIRS:
+        root = os.path.join(source_dir, directory)
+        if not os.path.isdir(root):
+            continue
+        for file in sorted(os.listdir(root)):
+            path = os.path.join(root, file)
+            if not os.path.isfile(path):
+                continue
+            with open(path, 'rb') as f:
+                data = f.read()
+            name = f'{directory}/{file}'
+            hashed = manifest[name] = fingerprinted(name, data)
+            target = os.path.join(output_dir, hashed)
+            if not os.path.exists(target):
+                for suffix, variant in _variants(data):
+                    _write(target + suffix, variant)
+                _write(target, data)
+
+    current = sorted(manifest.values())
+    history = [names for names in read_history(output_dir) if names != current]
+    history = [current] + history[:max(keep_builds, 1) - 1]
+    _write(os.path.join(output_dir, HISTORY), json.dumps(history).encode())
+    _write(os.path.join(output_dir, MANIFEST), json.dumps(manifest, indent=2, sort_keys=True).encode())
+    _prune(output_dir, {hashed for names in history for hashed in names})
+    return manifest
+
+
+def _prune(output_dir, retained):
+    keep = set()
+    for hashed in retained:
+        keep.add(hashed)
+        keep.update(hashed + suffix for _, suffix in ENCODINGS)
+    for directory in BUNDLE_DIRS:
+        root = os.path.join(output_dir, directory)
+        if not os.path.isdir(root):
+            continue
+        for file in os.listdir(root):
+            if f'{directory}/{file}' not in keep and not file.endswith('.tmp'):
+                try:
+                    os.remove(os.path.join(root, file))
+                except FileNotFoundError:
+                    pass
+
+
+class AssetManifest:
+    """Maps bundle names to their fingerprinted URLs and picks encoded variants"""
+
+    def __init__(self, source_dir, output_dir, url_prefix='/assets'):
+        self.source_dir = source_dir
+        self.output_dir = output_dir
+        self.url_prefix = url_prefix.rstrip('/')
+        self._manifest = {}
+        self._served = set()
+
+    def build(self):
+        """Rebuild the bundles from source; returns the number of bundles"""
+        self._load(build(self.source_dir, self.output_dir))
+        return len(self._manifest)
+
+    def load(self):
+        """Use an existing manifest (from a build at deploy time) if there is one"""
+        try:
+            with open(os.path.join(self.output_dir, MANIFEST)) as f:
+                self._load(json.load(f))
+        except (OSError, ValueError):
+            return False
+        return True
+
+    def _load(self, manifest):
+        self._manifest = dict(manifest)
+        self._served = set(manifest.values())
+        for names in read_history(self.output_dir):
+            self._served.update(names)
+
+    def _built_since_load(self, hashed):
+        # During a reload the new master rebuilds while old workers still
+        # serve; a page from a new worker can link a bundle an old worker's
+        # manifest has never seen
+        if os.path.exists(os.path.join(self.output_dir, hashed)):
+            retained = {name for names in read_history(self.output_dir) for name in names}
+            if hashed in retained:
+                self._served.update(retained)
+                return True
+        return False
+
+    def url(self, name):
+        """
+        URL of a bundle for templates
+
+        Falls back to the unversioned file under /static/ when the bundle is
+        not in the manifest, so a page still renders before the first build.
+        """
+        hashed = self._manifest.get(name)
+        if hashed is None:
+            return f'/static/{name}'
+        return f'{self.url_prefix}/{hashed}'
+
+    def resolve(self, hashed, accept_encodings):
+        """
+        File to send for a fingerprinted name
+
+        Args:
+            hashed: name as it appears in the URL
+            accept_encodings: the request's Accept-Encoding (werkzeug Accept)
+
+        Returns:
+            (file name relative to output_dir, Content-Encoding or None),
+            or (None, None) if the name is not a retained bundle
+        """
+        if hashed not in self._served and not self._built_since_load(hashed):
+            return None, None
+        for encoding, suffix in ENCODINGS:
+            if accept_encodings[encoding] and os.path.exists(os.path.join(self.output_dir, hashed + suffix)):
+                return hashed + suffix, encoding
+        return hashed, None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Build fingerprinted static bundles')
+    parser.add_argument('--source', default='static', help='directory with css/ and js/')
+    parser.add_argument('--output', default=os.path.join('static', 'dist'))
+    args = parser.parse_args(argv)
+
+    manifest = build(args.source, args.output)
+    for name, hashed in sorted(manifest.items()):
+        print(f"   ✅ {name} -> {hashed}")
+    if brotli is None:
+        print("⚠️  brotli is not installed; only gzip variants were written")
+    print(f"📦 {len(manifest)} bundles written to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,145 @@
+"""
+Response compression for SaarthiAI
+Negotiates gzip or brotli from Accept-Encoding for HTML, JSON and other
+text responses, compresses streamed responses chunk by chunk, and keeps
+the compressed bytes of ETag-carrying responses for repeat requests
+"""
+
+import collections
+import hashlib
+import threading
+import zlib
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE = frozenset({
+    'text/html', 'text/css', 'text/plain', 'text/csv', 'text/javascript', 'text/xml',
+    'application/javascript', 'application/json', 'application/x-ndjson',
+    'application/xml', 'image/svg+xml',
+})
+
+
+def _gzip_compressor(level):
+    # wbits 16 + MAX_WBITS writes a gzip header and trailer
+    return zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+
+class ResponseCompressor:
+    """after_request hook that compresses responses the client can decode"""
+
+    def __init__(self, min_size=1024, level=6, brotli_quality=4, cache_entries=256):
+        """
+        Args:
+            min_size: smaller bodies are sent as they are
+            level: gzip level (1-9)
+            brotli_quality: brotli quality (0-11); high values are too slow per request
+            cache_entries: compressed bodies kept for responses with an ETag (0 disables)
+        """
+        self.min_size = min_size
+        self.level = level
+        self.brotli_quality = brotli_quality
+        self.cache_entries = cache_entries
+        self._cache = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def choose(self, accept_encodings):
+        """'br', 'gzip' or None for a request's Accept-Encoding (werkzeug Accept)"""
+        if brotli is not None and accept_encodings['br']:
+            return 'br'
+        if accept_encodings['gzip']:
+            return 'gzip'
+        return None
+
+    def compress(self, data, encoding):
+        """One-shot compression of a whole body"""
+        if encoding == 'br':
+            return brotli.compress(data, quality=self.brotli_quality)
+        compressor = _gzip_compressor(self.level)
+        return compressor.compress(data) + compressor.flush()
+
+    def stream(self, chunks, encoding):
+        """
+        Compress an iterable of chunks as it is consumed
+
+        Every chunk is flushed, so each piece the view yields still reaches
+        the client straight away; the original iterable is closed at the end.
+        """
+        try:
+            if encoding == 'br':
+                compressor = brotli.Compressor(quality=self.brotli_quality)
+                for chunk in chunks:
+                    data = compressor.process(chunk.encode() if isinstance(chunk, str) else chunk)
+                    data += compressor.flush()
+                    if data:
+                        yield data
+                yield compressor.finish()
+            else:
+                compressor = _gzip_compressor(self.level)
+                for chunk in chunks:
+                    data = compressor.compress(chunk.encode() if isinstance(chunk, str) else chunk)
+                    data += compressor.flush(zlib.Z_SYNC_FLUSH)
+                    if data:
+                        yield data
+                yield compressor.flush()
+        finally:
+            if hasattr(chunks, 'close'):
+                chunks.close()
+
+    def _cached(self, data, encoding):
+        # Keyed by the body itself: equal ETags on different users' responses
+        # must never share bytes, and hashing is far cheaper than compressing
+        key = (encoding, hashlib.blake2b(data, digest_size=16).digest())
+        with self._lock:
+            body = self._cache.get(key)
+            if body is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return body
+            self.misses += 1
+        body = self.compress(data, encoding)
+        with self._lock:
+            self._cache[key] = body
+            while len(self._cache) > self.cache_entries:
+                self._cache.popitem(last=False)
+        return body
+
+    def __call__(self, response, request):
+        """Compress `response` in place for `request` if worthwhile; returns the response"""
+        if (request.method == 'HEAD'
+                or response.status_code < 200 or response.status_code in (204, 304)
+                or response.mimetype not in COMPRESSIBLE
+                or 'Content-Encoding' in response.headers
+                or 'no-transform' in response.headers.get('Cache-Control', '')
+                or response.direct_passthrough):
+            return response
+
+        response.vary.add('Accept-Encoding')
+        encoding = self.choose(request.accept_encodings)
+        if encoding is None:
+            return response
+
+        if response.is_streamed:
+            response.response = self.stream(response.response, encoding)
+            response.headers.pop('Content-Length', None)
+        else:
+            data = response.get_data()
+            if len(data) < self.min_size:
+                return response
+            etag, weak = response.get_etag()
+            if etag and self.cache_entries:
+                body = self._cached(data, encoding)
+            else:
+                body = self.compress(data, encoding)
+            response.set_data(body)
+            if etag and not weak:
+                # A different representation of the same resource; If-None-Match
+                # uses weak comparison, so 304s still work
+                response.set_etag(etag, weak=True)
+
+        response.headers['Content-Encoding'] = encoding
+        return response
@@ -3,5 +3,7 @@ Database module for SaarthiAI
 """
 
 from .db_utils import get_db_connection, init_db
+from .versions import DataVersions
+from .write_queue import WriteQueue
 
-__all__ = ['get_db_connection', 'init_db']
\ No newline at end of file
+__all__ = ['get_db_connection', 'init_db', 'DataVersions', 'WriteQueue']
\ No newline at end of file
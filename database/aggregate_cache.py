@@ -0,0 +1,115 @@
+"""
+Aggregate cache for SaarthiAI
+Keeps expensive dashboard aggregates in memory with a TTL, drops them when
+the data-version counters they depend on move, and refreshes them in the
+background so readers are served immediately
+"""
+
+import threading
+import time
+
+
+class CachedValue:
+    """A cached aggregate plus how old it is"""
+
+    def __init__(self, value, computed_at, stale, refreshing):
+        self.value = value
+        self.computed_at = computed_at
+        self.stale = stale
+        self.refreshing = refreshing
+
+    @property
+    def age(self):
+        """Seconds since the value was computed"""
+        return max(0.0, time.time() - self.computed_at)
+
+
+class AggregateCache:
+    """TTL cache with version invalidation and stale-while-revalidate"""
+
+    def __init__(self, versions, ttl=60, max_stale=600):
+        """
+        Args:
+            versions: DataVersions registry the cached values depend on
+            ttl: seconds a value is served without refreshing
+            max_stale: hard bound on age; older values are recomputed inline
+        """
+        self.versions = versions
+        self.ttl = ttl
+        self.max_stale = max_stale
+        self._entries = {}
+        self._refreshing = set()
+        self._lock = threading.Lock()
+
+    def _stamp(self, scopes):
+        return tuple(self.versions.stamp(scope) for scope in scopes)
+
+    def get(self, key, loader, scopes=()):
+        """
+        Return a cached aggregate, computing or refreshing it as needed
+
+        A fresh value is returned as is. A value past its TTL, or whose
+        scopes have been bumped since it was computed, is returned
+        immediately while one background thread recomputes it. A value older
+        than max_stale, or a missing one, is computed before returning.
+
+        Args:
+            key: cache key
+            loader: zero-argument function computing the value
+            scopes: data-version scopes whose bumps invalidate the value
+
+        Returns:
+            CachedValue
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+        now = time.time()
+        stamp = self._stamp(scopes)
+
+        if entry is not None:
+            value, computed_at, entry_stamp = entry
+            age = now - computed_at
+            if age < self.ttl and entry_stamp == stamp:
+                return CachedValue(value, computed_at, False, False)
+            if age < self.max_stale:
+                refreshing = self._refresh_async(key, loader, scopes)
+                return CachedValue(value, computed_at, True, refreshing)
+
+        value, computed_at = self._load(key, loader, scopes)
+        return CachedValue(value, computed_at, False, False)
+
+    def invalidate(self, key=None):
+        """Forget one key, or everything"""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def _load(self, key, loader, scopes):
+        # Stamp before loading, so writes landing mid-load leave the entry stale
+        stamp = self._stamp(scopes)
+        computed_at = time.time()
+        value = loader()
+        with self._lock:
+            self._entries[key] = (value, computed_at, stamp)
+        return value, computed_at
+
+    def _refresh_async(self, key, loader, scopes):
+        """Start one background refresh per key; True if one is running"""
+        with self._lock:
+            if key in self._refreshing:
+                return True
+            self._refreshing.add(key)
+
+        def refresh():
+            try:
+                self._load(key, loader, scopes)
+            except Exception as e:
+                print(f"❌ Aggregate refresh failed for {key}: {e}")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=refresh, name=f'aggregate-refresh-{key}', daemon=True).start()
+        return True
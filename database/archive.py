@@ -0,0 +1,341 @@
+"""
+Semester archival for SaarthiAI attendance
+Moves closed terms out of the hot attendance table into one SQLite file per
+term, and ATTACHes those files on demand for historical reports
+
+Usage:
+    python -m database.archive --db database/saarthi.db
+    python -m database.archive --db database/saarthi.db --before 2025-01-01 --vacuum
+    python -m database.archive --db database/saarthi.db --list
+
+Terms follow the academic calendar: Spring runs January-June and Fall runs
+July-December. Each term goes through copy -> verify -> purge, and progress
+is recorded in attendance_archive_log, so an interrupted run can simply be
+started again.
+"""
+
+import argparse
+import os
+import sqlite3
+from datetime import date, datetime
+
+from .versions import invalidate_all
+
+ARCHIVE_DIR = os.environ.get('ARCHIVE_DIR', 'database/archive')
+PURGE_BATCH = 20_000
+
+ARCHIVE_LOG_DDL = '''
+    CREATE TABLE IF NOT EXISTS attendance_archive_log (
+        term TEXT PRIMARY KEY,
+        archive_path TEXT NOT NULL,
+        start_date DATE NOT NULL,
+        end_date DATE NOT NULL,
+        row_count INTEGER DEFAULT 0,
+        status TEXT NOT NULL CHECK(status IN ('copying', 'verified', 'purged')),
+        updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+    )
+'''
+
+ARCHIVE_INDEXES = [
+    'CREATE INDEX IF NOT EXISTS idx_attendance_student_date ON attendance(student_id, date)',
+    'CREATE INDEX IF NOT EXISTS idx_attendance_course_date ON attendance(course_id, date)',
+]
+
+
+def term_for(day):
+    """Term key for a date, e.g. 2024_fall"""
+    if isinstance(day, str):
+        day = datetime.strptime(day[:10], '%Y-%m-%d').date()
+    return f"{day.year}_{'spring' if day.month <= 6 else 'fall'}"
+
+
+def term_bounds(term):
+    """(first day, first day of the next term) as ISO strings"""
+    year, season = term.split('_')
+    year = int(year)
+    if season == 'spring':
+        return f'{year}-01-01', f'{year}-07-01'
+    return f'{year}-07-01', f'{year + 1}-01-01'
+
+
+def archive_path(term, archive_dir=ARCHIVE_DIR):
+    return os.path.join(archive_dir, f'attendance_{term}.db')
+
+
+def ensure_archive_log(conn):
+    conn.execute(ARCHIVE_LOG_DDL)
+    conn.commit()
+
+
+def closed_terms(conn, before=None):
+    """Terms with rows still in the hot table that end on or before `before`"""
+    cutoff = before or term_bounds(term_for(date.today()))[0]
+    oldest = conn.execute('SELECT MIN(date) FROM attendance').fetchone()[0]
+    if oldest is None:
+        return []
+    terms = []
+    term = term_for(oldest)
+    while True:
+        start, end = term_bounds(term)
+        if end > cutoff:
+            break
+        has_rows = conn.execute(
+            'SELECT 1 FROM attendance WHERE date >= ? AND date < ? LIMIT 1', (start, end)
+        ).fetchone()
+        if has_rows:
+            terms.append(term)
+        term = term_for(end)
+    return terms
+
+
+def _set_status(conn, term, status, row_count=None):
+    conn.execute('''
+        UPDATE attendance_archive_log
+        SET status = ?, row_count = COALESCE(?, row_count), updated_at = CURRENT_TIMESTAMP
+        WHERE term = ?
+    ''', (status, row_count, term))
+    conn.commit()
+
+
+def _create_archive_file(conn, path):
+    """Create the per-term file with the hot table's exact definition"""
+    ddl = conn.execute(
+        "SELECT sql FROM main.sqlite_master WHERE type = 'table' AND name = 'attendance'"
+    ).fetchone()[0]
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    archive = sqlite3.connect(path)
+    archive.execute(ddl.replace('CREATE TABLE attendance', 'CREATE TABLE IF NOT EXISTS attendance', 1))
+    archive.commit()
+    archive.close()
+
+
+def _copy_rows(conn, columns, where, params):
+    """Upsert matching hot rows into the archive, so a re-copy refreshes updated rows"""
+    names = ', '.join(columns)
+    updates = ', '.join(f'{name} = excluded.{name}' for name in columns if name != 'id')
+    conn.execute(f'''
+        INSERT INTO arc.attendance ({names})
+        SELECT {names} FROM main.attendance WHERE {where}
+        ON CONFLICT(id) DO UPDATE SET {updates}
+    ''', params)
+
+
+def archive_term(conn, term, archive_dir=ARCHIVE_DIR):
+    """
+    Copy, verify and purge one term
+
+    Every step is idempotent: the copy upserts on the primary key,
+    verification compares ids rather than trusting earlier counts, and each
+    purge batch re-copies its rows and deletes only ids present in the
+    archive in the same transaction, so a row inserted or updated after
+    verification is archived with its current values before it is deleted.
+
+    Returns:
+        Number of rows the archive holds for the term
+    """
+    start, end = term_bounds(term)
+    path = archive_path(term, archive_dir)
+
+    conn.execute('''
+        INSERT OR IGNORE INTO attendance_archive_log (term, archive_path, start_date, end_date, status)
+        VALUES (?, ?, ?, ?, 'copying')
+    ''', (term, path, start, end))
+    conn.commit()
+
+    _create_archive_file(conn, path)
+    conn.execute('ATTACH DATABASE ? AS arc', (path,))
+    try:
+        # Copy
+        _set_status(conn, term, 'copying')
+        expected = conn.execute(
+            'SELECT COUNT(*) FROM main.attendance WHERE date >= ? AND date < ?', (start, end)
+        ).fetchone()[0]
+        columns = [row[1] for row in conn.execute('PRAGMA main.table_info(attendance)')]
+        _copy_rows(conn, columns, 'date >= ? AND date < ?', (start, end))
+        conn.commit()
+        for ddl in ARCHIVE_INDEXES:
+            conn.execute(ddl.replace('EXISTS idx_', 'EXISTS arc.idx_'))
+        conn.commit()
+
+        # Verify: every hot row of the term must be in the archive
+        missing = conn.execute('''
+            SELECT COUNT(*) FROM main.attendance m
+            WHERE m.date >= ? AND m.date < ?
+              AND NOT EXISTS (SELECT 1 FROM arc.attendance a WHERE a.id = m.id)
+        ''', (start, end)).fetchone()[0]
+        archived = conn.execute(
+            'SELECT COUNT(*) FROM arc.attendance WHERE date >= ? AND date < ?', (start, end)
+        ).fetchone()[0]
+        if missing or archived < expected:
+            raise RuntimeError(
+                f'Verification failed for {term}: {missing} rows missing, '
+                f'{archived} archived vs {expected} expected'
+            )
+        _set_status(conn, term, 'verified', archived)
+
+        # Purge in short transactions so app writers are not starved. The
+        # batch is taken from the hot table, copied again and then deleted
+        # only where the archive has it, all under one write lock
+        conn.execute('CREATE TEMP TABLE IF NOT EXISTS purge_ids (id INTEGER PRIMARY KEY)')
+        while True:
+            conn.execute('BEGIN IMMEDIATE')
+            conn.execute('DELETE FROM temp.purge_ids')
+            batch = conn.execute('''
+                INSERT INTO temp.purge_ids
+                SELECT id FROM main.attendance WHERE date >= ? AND date < ? ORDER BY id LIMIT ?
+            ''', (start, end, PURGE_BATCH)).rowcount
+            if not batch:
+                conn.commit()
+                break
+            _copy_rows(conn, columns, 'id IN (SELECT id FROM temp.purge_ids)', ())
+            deleted = conn.execute('''
+                DELETE FROM main.attendance
+                WHERE id IN (SELECT id FROM temp.purge_ids)
+                  AND id IN (SELECT id FROM arc.attendance)
+            ''').rowcount
+            conn.commit()
+            if not deleted:
+                # Nothing copied; the check below reports what is left
+                break
+        conn.execute('DROP TABLE temp.purge_ids')
+        archived = conn.execute(
+            'SELECT COUNT(*) FROM arc.attendance WHERE date >= ? AND date < ?', (start, end)
+        ).fetchone()[0]
+
+        remaining = conn.execute(
+            'SELECT COUNT(*) FROM main.attendance WHERE date >= ? AND date < ?', (start, end)
+        ).fetchone()[0]
+        if remaining:
+            raise RuntimeError(f'Purge incomplete for {term}: {remaining} rows left')
+        _set_status(conn, term, 'purged', archived)
+        return archived
+    finally:
+        conn.commit()
+        conn.execute('DETACH DATABASE arc')
+
+
+def run_archival(conn, before=None, archive_dir=ARCHIVE_DIR):
+    """Archive every closed term; returns {term: archived row count}"""
+    ensure_archive_log(conn)
+    results = {}
+    for term in closed_terms(conn, before):
+        print(f"📦 Archiving {term}...")
+        results[term] = archive_term(conn, term, archive_dir)
+        print(f"   ✅ {results[term]:,} rows in {archive_path(term, archive_dir)}")
+    return results
+
+
+def archived_terms(conn, start=None, end=None):
+    """Purged terms from the manifest, optionally limited to a date range"""
+    ensure_archive_log(conn)
+    query = "SELECT term, archive_path FROM attendance_archive_log WHERE status = 'purged'"
+    params = []
+    if start:
+        query += ' AND end_date > ?'
+        params.append(start)
+    if end:
+        query += ' AND start_date <= ?'
+        params.append(end)
+    return conn.execute(query + ' ORDER BY start_date', params).fetchall()
+
+
+def attach_slots(conn):
+    """How many more databases SQLite lets this connection attach (10 by default)"""
+    limit = conn.getlimit(sqlite3.SQLITE_LIMIT_ATTACHED) if hasattr(conn, 'getlimit') else 10
+    attached = [row[1] for row in conn.execute('PRAGMA database_list')]
+    return limit - len([name for name in attached if name not in ('main', 'temp')])
+
+
+def existing_archives(conn, start=None, end=None):
+    """archived_terms() whose files exist; missing files are reported and skipped"""
+    archives = []
+    for term, path in archived_terms(conn, start, end):
+        if not os.path.exists(path):
+            print(f"⚠️  Archive file missing for {term}: {path}")
+            continue
+        archives.append((term, path))
+    return archives
+
+
+def attach_archives(conn, start=None, end=None):
+    """
+    Attach the archive files of terms overlapping [start, end]
+
+    SQLite caps attached databases per connection, so a range spanning more
+    terms than that is rejected; read such ranges one term at a time (see
+    reports.export) or split them.
+
+    Returns:
+        List of (term, schema alias) in term order
+
+    Raises:
+        ValueError: the range spans more archived terms than can be attached
+    """
+    attached = {row[1] for row in conn.execute('PRAGMA database_list')}
+    archives = [(term, path, f'arc_{term}') for term, path in existing_archives(conn, start, end)]
+    needed = [alias for _, _, alias in archives if alias not in attached]
+    slots = attach_slots(conn)
+    if len(needed) > slots:
+        raise ValueError(
+            f'{start or "the beginning"} to {end or "today"} spans {len(archives)} archived terms, '
+            f'but at most {slots} can be read at once; narrow the date range'
+        )
+    for term, path, alias in archives:
+        if alias not in attached:
+            conn.execute('ATTACH DATABASE ? AS ' + alias, (path,))
+    return [(term, alias) for term, _, alias in archives]
+
+
+def attach_history(conn, start=None, end=None, view='attendance_history'):
+    """
+    Attach the archives overlapping [start, end] and expose a unified view
+
+    Creates TEMP VIEW `view` as the hot attendance table UNION ALL every
+    attached term, so reports can query one relation. Only terms that
+    overlap the requested range are attached.
+
+    Returns:
+        List of attached terms
+    """
+    archives = attach_archives(conn, start, end)
+    selects = ['SELECT * FROM main.attendance']
+    selects += [f'SELECT * FROM {alias}.attendance' for _, alias in archives]
+    conn.execute(f'DROP VIEW IF EXISTS temp.{view}')
+    conn.execute(f'CREATE TEMP VIEW {view} AS ' + ' UNION ALL '.join(selects))
+    return [term for term, _ in archives]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Archive closed semesters of attendance')
+    parser.add_argument('--db', default=os.environ.get('DATABASE_PATH', 'database/saarthi.db'))
+    parser.add_argument('--archive-dir', default=ARCHIVE_DIR)
+    parser.add_argument('--before', help='archive terms ending on or before this date (default: current term start)')
+    parser.add_argument('--vacuum', action='store_true', help='VACUUM the hot database afterwards')
+    parser.add_argument('--list', action='store_true', help='show the archive manifest and exit')
+    args = parser.parse_args(argv)
+
+    conn = sqlite3.connect(args.db, timeout=20)
+    conn.execute('PRAGMA journal_mode=WAL')
+    ensure_archive_log(conn)
+
+    if args.list:
+        for row in conn.execute('SELECT term, status, row_count, archive_path FROM attendance_archive_log ORDER BY start_date'):
+            print(f"{row[0]:<12} {row[1]:<9} {row[2]:>12,}  {row[3]}")
+        conn.close()
+        return
+
+    results = run_archival(conn, args.before, args.archive_dir)
+    if results:
+        # Rows left the hot table, so cached responses built from it are stale
+        invalidate_all(args.db)
+    else:
+        print("ℹ️  No closed terms left in the hot table")
+    conn.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+    if args.vacuum:
+        print("🧹 Vacuuming hot database...")
+        conn.execute('VACUUM')
+    conn.close()
+
+
+if __name__ == '__main__':
+    main()
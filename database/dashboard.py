@@ -0,0 +1,412 @@
+"""
+Student dashboard readers for SaarthiAI
+Each section reader takes an open connection and the student's ids, so the
+single-section endpoints and the batched dashboard share the same queries
+"""
+
+from datetime import datetime, timedelta
+
+from .pagination import build_page
+from .projection import fetch_dicts, project, select_list, wants
+from .timeseries import time_series
+
+ATTENDANCE_PAGE = 50
+NOTIFICATIONS_PAGE = 20
+
+
+PRESENT = "SUM(CASE WHEN a.status = 'present' THEN 1 ELSE 0 END)"
+
+# Output columns of each section's row lists, as name -> SQL expression.
+# fields= picks from these; the order here is the order in the response.
+COURSE_COLUMNS = {
+    'id': 'c.id',
+    'course_code': 'c.course_code',
+    'course_name': 'c.course_name',
+    'description': 'c.description',
+    'teacher_id': 'c.teacher_id',
+    'semester': 'c.semester',
+    'credits': 'c.credits',
+    'created_at': 'c.created_at',
+    'teacher_name': 'u.full_name',
+    'total_classes': 'COUNT(DISTINCT a.id)',
+    'present_count': PRESENT,
+    'attendance_percentage': f'ROUND(({PRESENT} * 100.0 / NULLIF(COUNT(DISTINCT a.id), 0)), 2)',
+}
+
+ATTENDANCE_COLUMNS = {
+    'id': 'a.id',
+    'student_id': 'a.student_id',
+    'course_id': 'a.course_id',
+    'date': 'a.date',
+    'status': 'a.status',
+    'method': 'a.method',
+    'confidence': 'a.confidence',
+    'timestamp': 'a.timestamp',
+    'course_name': 'c.course_name',
+    'course_code': 'c.course_code',
+}
+
+GRADE_COLUMNS = {
+    'id': 'g.id',
+    'student_id': 'g.student_id',
+    'course_id': 'g.course_id',
+    'grade': 'g.grade',
+    'marks': 'g.marks',
+    'max_marks': 'g.max_marks',
+    'exam_type': 'g.exam_type',
+    'exam_date': 'g.exam_date',
+    'created_at': 'g.created_at',
+    'course_name': 'c.course_name',
+    'course_code': 'c.course_code',
+}
+
+ASSIGNMENT_COLUMNS = {
+    'id': 'a.id',
+    'course_id': 'a.course_id',
+    'title': 'a.title',
+    'description': 'a.description',
+    'due_date': 'a.due_date',
+    'max_marks': 'a.max_marks',
+    'status': 'a.status',
+    'created_at': 'a.created_at',
+    'course_name': 'c.course_name',
+    'course_code': 'c.course_code',
+    'submission_status': 's.status',
+    'obtained_marks': 's.marks',
+    'feedback': 's.feedback',
+    'submission_date': 's.submission_date',
+}
+
+NOTIFICATION_COLUMNS = {
+    'id': 'id',
+    'user_id': 'user_id',
+    'title': 'title',
+    'message': 'message',
+    'type': 'type',
+    'is_read': 'is_read',
+    'created_at': 'created_at',
+}
+
+# Built in Python from the weekly series rather than selected, so only
+# the names matter
+PERFORMANCE_COLUMNS = {'week': None, 'week_start': None, 'score': None}
+
+
+def courses_section(conn, student_id, user_id, fields=None):
+    """Enrolled courses with per-course attendance"""
+    # The attendance join is only needed for the per-course counts
+    counts = wants(fields, 'total_classes', 'present_count', 'attendance_percentage')
+    courses = fetch_dicts(conn, f'''
+        SELECT {select_list(COURSE_COLUMNS, fields)}
+        FROM courses c
+        JOIN enrollments e ON c.id = e.course_id
+        JOIN users u ON c.teacher_id = u.id
+        {'LEFT JOIN attendance a ON c.id = a.course_id AND a.student_id = :student' if counts else ''}
+        WHERE e.student_id = :student
+        GROUP BY c.id
+    ''', {'student': student_id})
+    return {'courses': courses}
+
+
+def fetch_attendance_page(conn, student_id, cursor, limit, fields=None):
+    """One keyset page of a student's attendance, newest first, on (date, id)"""
+    columns = select_list(ATTENDANCE_COLUMNS, fields, required=('date', 'id'))
+    if cursor is None:
+        rows = fetch_dicts(conn, f'''
+            SELECT {columns}
+            FROM attendance a
+            JOIN courses c ON a.course_id = c.id
+            WHERE a.student_id = ?
+            ORDER BY a.date DESC, a.id DESC
+            LIMIT ?
+        ''', (student_id, limit + 1))
+    else:
+        rows = fetch_dicts(conn, f'''
+            SELECT {columns}
+            FROM attendance a
+            JOIN courses c ON a.course_id = c.id
+            WHERE a.student_id = ? AND (a.date, a.id) < (?, ?)
+            ORDER BY a.date DESC, a.id DESC
+            LIMIT ?
+        ''', (student_id, *cursor, limit + 1))
+    return build_page(rows, limit, lambda r: (r['date'], r['id']))
+
+
+def attendance_section(conn, student_id, user_id, cursor=None, limit=ATTENDANCE_PAGE, fields=None):
+    """Attendance records, with overall statistics on the first page only"""
+    # Overall statistics only on the first page, so deeper pages stay cheap
+    stats = None
+    if cursor is None:
+        stats = conn.execute('''
+            SELECT COUNT(*) as total_classes,
+                   SUM(CASE WHEN status = 'present' THEN 1 ELSE 0 END) as present_count,
+                   SUM(CASE WHEN status = 'absent' THEN 1 ELSE 0 END) as absent_count,
+                   ROUND((SUM(CASE WHEN status = 'present' THEN 1 ELSE 0 END) * 100.0 /
+                          NULLIF(COUNT(*), 0)), 2) as attendance_percentage
+            FROM attendance
+            WHERE student_id = ?
+        ''', (student_id,)).fetchone()
+
+    records, next_cursor = fetch_attendance_page(conn, student_id, cursor, limit, fields)
+    return {
+        'stats': dict(stats) if stats else None,
+        'records': project(records, ATTENDANCE_COLUMNS, fields),
+        'next_cursor': next_cursor
+    }
+
+
+def grades_section(conn, student_id, user_id, fields=None):
+    """Grades, GPA on a 4.0 scale and letter-grade distribution"""
+    grades = fetch_dicts(conn, f'''
+        SELECT {select_list(GRADE_COLUMNS, fields, required=('grade', 'marks', 'max_marks'))}
+        FROM grades g
+        JOIN courses c ON g.course_id = c.id
+        WHERE g.student_id = ?
+        ORDER BY g.created_at DESC
+    ''', (student_id,))
+
+    # Calculate GPA
+    total_marks = 0
+    total_max_marks = 0
+    grade_counts = {'A+': 0, 'A': 0, 'A-': 0, 'B+': 0, 'B': 0, 'B-': 0, 'C+': 0, 'C': 0}
+
+    for grade in grades:
+        if grade['marks'] and grade['max_marks']:
+            total_marks += grade['marks']
+            total_max_marks += grade['max_marks']
+        if grade['grade'] in grade_counts:
+            grade_counts[grade['grade']] += 1
+
+    gpa = round((total_marks / total_max_marks) * 4.0, 2) if total_max_marks > 0 else 0
+
+    return {
+        'grades': project(grades, GRADE_COLUMNS, fields),
+        'gpa': gpa,
+        'grade_distribution': grade_counts
+    }
+
+
+def assignments_section(conn, student_id, user_id, fields=None):
+    """Active assignments split into pending, completed and overdue"""
+    assignments = fetch_dicts(conn, f'''
+        SELECT {select_list(ASSIGNMENT_COLUMNS, fields, required=('due_date', 'submission_status'))}
+        FROM assignments a
+        JOIN courses c ON a.course_id = c.id
+        JOIN enrollments e ON c.id = e.course_id
+        LEFT JOIN assignment_submissions s ON a.id = s.assignment_id AND s.student_id = ?
+        WHERE e.student_id = ? AND a.status = 'active'
+        ORDER BY a.due_date ASC
+    ''', (student_id, student_id))
+
+    # Categorize assignments
+    pending = []
+    completed = []
+    overdue = []
+
+    today = datetime.now().date()
+
+    for assignment in assignments:
+        due_date = datetime.strptime(assignment['due_date'], '%Y-%m-%d').date()
+
+        if assignment['submission_status'] == 'submitted':
+            completed.append(assignment)
+        elif due_date < today:
+            overdue.append(assignment)
+        else:
+            pending.append(assignment)
+
+    return {
+        'pending': project(pending, ASSIGNMENT_COLUMNS, fields),
+        'completed': project(completed, ASSIGNMENT_COLUMNS, fields),
+        'overdue': project(overdue, ASSIGNMENT_COLUMNS, fields),
+        'total': len(assignments)
+    }
+
+
+def notifications_section(conn, student_id, user_id, cursor=None, limit=NOTIFICATIONS_PAGE, fields=None):
+    """Notifications newest first, with the unread count on the first page only"""
+    columns = select_list(NOTIFICATION_COLUMNS, fields, required=('created_at', 'id'))
+    if cursor is None:
+        notifications = fetch_dicts(conn, f'''
+            SELECT {columns} FROM notifications
+            WHERE user_id = ?
+            ORDER BY created_at DESC, id DESC
+            LIMIT ?
+        ''', (user_id, limit + 1))
+
+        unread_count = conn.execute('''
+            SELECT COUNT(*) as count FROM notifications
+            WHERE user_id = ? AND is_read = 0
+        ''', (user_id,)).fetchone()['count']
+    else:
+        notifications = fetch_dicts(conn, f'''
+            SELECT {columns} FROM notifications
+            WHERE user_id = ? AND (created_at, id) < (?, ?)
+            ORDER BY created_at DESC, id DESC
+            LIMIT ?
+        ''', (user_id, *cursor, limit + 1))
+        unread_count = None
+
+    notifications, next_cursor = build_page(notifications, limit, lambda n: (n['created_at'], n['id']))
+    return {
+        'notifications': project(notifications, NOTIFICATION_COLUMNS, fields),
+        'unread_count': unread_count,
+        'next_cursor': next_cursor
+    }
+
+
+def performance_section(conn, student_id, user_id, fields=None):
+    """Average score per calendar week for the last 8 weeks; null for weeks without grades"""
+    today = datetime.now().date()
+    weekly = time_series(conn, 'grades', today - timedelta(weeks=7), today, 'week',
+                         student_ids=[student_id])
+    scores = weekly['series'][0]['values']
+    performance = [
+        {'week': f'Week {i + 1}', 'week_start': week_start, 'score': score}
+        for i, (week_start, score) in enumerate(zip(weekly['buckets'], scores))
+    ]
+    return {'performance': project(performance, PERFORMANCE_COLUMNS, fields)}
+
+
+SECTIONS = {
+    'courses': courses_section,
+    'attendance': attendance_section,
+    'grades': grades_section,
+    'assignments': assignments_section,
+    'notifications': notifications_section,
+    'performance': performance_section,
+}
+
+# Data-version scopes each section reads. Write paths bump a scope after
+# committing; keys are students.id except for notifications (users.id) and
+# assignments (courses.id)
+SECTION_SCOPES = {
+    'courses': ('attendance',),
+    'attendance': ('attendance',),
+    'grades': ('grades',),
+    'assignments': ('assignments', 'submissions'),
+    'notifications': ('notifications',),
+    'performance': ('grades',),
+}
+
+# Sections whose payload also changes with the calendar date
+DATED_SECTIONS = {'assignments', 'performance'}
+
+# Columns a fields= parameter may pick from, per section
+SECTION_FIELDS = {
+    'courses': COURSE_COLUMNS,
+    'attendance': ATTENDANCE_COLUMNS,
+    'grades': GRADE_COLUMNS,
+    'assignments': ASSIGNMENT_COLUMNS,
+    'notifications': NOTIFICATION_COLUMNS,
+    'performance': PERFORMANCE_COLUMNS,
+}
+
+
+def section_versions(versions, sections, student_id, user_id, course_ids):
+    """
+    Counter values covering everything the given sections read
+
+    Args:
+        versions: DataVersions registry
+        sections: section names
+        student_id: students.id
+        user_id: users.id of the student
+        course_ids: enrolled course ids
+
+    Returns:
+        List of counter values, in a stable order
+    """
+    values = []
+    for name in sections:
+        for scope in SECTION_SCOPES[name]:
+            if scope == 'notifications':
+                keys = [user_id]
+            elif scope == 'assignments':
+                keys = course_ids
+            else:
+                keys = [student_id]
+            values.extend(versions.get(scope, key) for key in keys)
+    return values
+
+
+def parse_sections(value):
+    """
+    Validate a comma-separated sections= parameter
+
+    Returns:
+        List of section names in SECTIONS order (all of them when value is empty)
+
+    Raises:
+        ValueError: if an unknown section is requested
+    """
+    if not value:
+        return list(SECTIONS)
+    requested = {name.strip() for name in value.split(',') if name.strip()}
+    unknown = requested - SECTIONS.keys()
+    if unknown:
+        raise ValueError(f"Unknown dashboard sections: {', '.join(sorted(unknown))}")
+    return [name for name in SECTIONS if name in requested]
+
+
+def parse_fields(value, section=None):
+    """
+    Validate a comma-separated fields= parameter
+
+    Names are 'section.column', or a bare 'column' when the request is for
+    a single section. Only the row lists of a section are projected; its
+    summary values (stats, gpa, counts, cursors) are always returned.
+
+    Returns:
+        Dict of section name -> set of column names; sections not mentioned
+        are returned in full
+
+    Raises:
+        ValueError: if an unknown section or column is requested
+    """
+    fields = {}
+    if not value:
+        return fields
+    for name in (part.strip() for part in value.split(',')):
+        if not name:
+            continue
+        if '.' in name:
+            target, column = name.split('.', 1)
+        elif section is not None:
+            target, column = section, name
+        else:
+            raise ValueError(f"Field '{name}' must be given as section.column")
+        if target not in SECTION_FIELDS:
+            raise ValueError(f"Fields cannot be selected for section '{target}'")
+        if column not in SECTION_FIELDS[target]:
+            raise ValueError(f"Unknown {target} field: {column}")
+        fields.setdefault(target, set()).add(column)
+    return fields
+
+
+def load_dashboard(conn, student_id, user_id, sections=None, fields=None):
+    """
+    Run several section readers in one read transaction
+
+    All sections see the same snapshot of the database, and the whole
+    dashboard costs one connection instead of one per section.
+
+    Args:
+        conn: database connection
+        student_id: students.id of the caller
+        user_id: users.id of the caller
+        sections: section names to load (default all)
+        fields: parse_fields() result, to project the row lists
+
+    Returns:
+        Dict of section name -> that section's payload
+    """
+    fields = fields or {}
+    conn.execute('BEGIN')
+    try:
+        return {
+            name: SECTIONS[name](conn, student_id, user_id, **({'fields': fields[name]} if name in fields else {}))
+            for name in sections or SECTIONS
+        }
+    finally:
+        conn.rollback()
@@ -0,0 +1,67 @@
+"""
+Keyset (cursor) pagination helpers for SaarthiAI
+Pages are addressed by the sort key of the last row seen, so every page is
+one index range scan no matter how deep the client has paged
+"""
+
+import base64
+import json
+
+MAX_PAGE_SIZE = 100
+
+
+def encode_cursor(values):
+    """Pack the last row's sort key into an opaque URL-safe token"""
+    raw = json.dumps(list(values), separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(token, size=2):
+    """
+    Unpack a token produced by encode_cursor
+
+    Args:
+        token: cursor string from the client, or None for the first page
+        size: number of key columns the endpoint sorts on
+
+    Returns:
+        Tuple of key values, or None for the first page
+
+    Raises:
+        ValueError: if the token is malformed
+    """
+    if not token:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        values = json.loads(raw)
+    except (ValueError, TypeError):
+        raise ValueError('Invalid cursor')
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError('Invalid cursor')
+    return tuple(values)
+
+
+def page_size(value, default, maximum=MAX_PAGE_SIZE):
+    """Clamp a client-supplied page size"""
+    if value is None:
+        return default
+    return max(1, min(int(value), maximum))
+
+
+def build_page(rows, limit, key):
+    """
+    Split a LIMIT limit+1 result into one page and the next cursor
+
+    Args:
+        rows: rows fetched with LIMIT limit + 1
+        limit: requested page size
+        key: function returning the sort key tuple of a row
+
+    Returns:
+        (rows for this page, next cursor or None when this is the last page)
+    """
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(key(rows[-1]))
@@ -0,0 +1,103 @@
+"""
+Parent dashboard data for SaarthiAI
+Loads every linked child's courses, attendance, recent records and latest
+fees with a fixed number of set-based queries, however many children a
+parent has
+"""
+
+RECENT_ATTENDANCE = 20
+
+
+def _placeholders(values):
+    return ','.join('?' * len(values))
+
+
+def load_children_overview(conn, parent_id, recent_limit=RECENT_ATTENDANCE):
+    """
+    Everything the parent dashboard shows, for all linked children
+
+    Five queries in total: children, then one IN (...) query each for
+    courses, attendance totals, recent attendance and latest fees. The
+    per-child "latest N" lists use ROW_NUMBER() windows.
+
+    Args:
+        conn: database connection
+        parent_id: users.id of the parent
+        recent_limit: recent attendance rows per child
+
+    Returns:
+        List of child dicts (student columns plus courses, attendance_percentage,
+        total_classes, present_count, recent_attendance and fees), in link order
+    """
+    children = [dict(row) for row in conn.execute('''
+        SELECT s.*, u.username
+        FROM students s
+        JOIN parent_student_link psl ON s.id = psl.student_id
+        LEFT JOIN users u ON s.user_id = u.id
+        WHERE psl.parent_id = ?
+        ORDER BY psl.id
+    ''', (parent_id,))]
+    if not children:
+        return []
+
+    ids = [child['id'] for child in children]
+    marks = _placeholders(ids)
+    by_id = {}
+    for child in children:
+        child.update(courses=[], recent_attendance=[], fees=None,
+                     total_classes=0, present_count=0, attendance_percentage=0)
+        by_id[child['id']] = child
+
+    for row in conn.execute(f'''
+        SELECT e.student_id as enrolled_student_id, c.*, u.full_name as teacher_name
+        FROM enrollments e
+        JOIN courses c ON c.id = e.course_id
+        JOIN users u ON c.teacher_id = u.id
+        WHERE e.student_id IN ({marks})
+        ORDER BY e.student_id, c.id
+    ''', ids):
+        course = dict(row)
+        by_id[course.pop('enrolled_student_id')]['courses'].append(course)
+
+    for row in conn.execute(f'''
+        SELECT student_id,
+               COUNT(*) as total_classes,
+               SUM(CASE WHEN status = 'present' THEN 1 ELSE 0 END) as present_count
+        FROM attendance
+        WHERE student_id IN ({marks})
+        GROUP BY student_id
+    ''', ids):
+        child = by_id[row['student_id']]
+        child['total_classes'] = row['total_classes']
+        child['present_count'] = row['present_count']
+        child['attendance_percentage'] = round(row['present_count'] / row['total_classes'] * 100, 1)
+
+    for row in conn.execute(f'''
+        SELECT * FROM (
+            SELECT a.*, c.course_name, c.course_code,
+                   ROW_NUMBER() OVER (PARTITION BY a.student_id ORDER BY a.date DESC, a.id DESC) as rn
+            FROM attendance a
+            JOIN courses c ON a.course_id = c.id
+            WHERE a.student_id IN ({marks})
+        )
+        WHERE rn <= ?
+        ORDER BY student_id, rn
+    ''', (*ids, recent_limit)):
+        record = dict(row)
+        del record['rn']
+        by_id[record['student_id']]['recent_attendance'].append(record)
+
+    for row in conn.execute(f'''
+        SELECT * FROM (
+            SELECT f.*,
+                   ROW_NUMBER() OVER (PARTITION BY f.student_id ORDER BY f.created_at DESC, f.id DESC) as rn
+            FROM fees f
+            WHERE f.student_id IN ({marks})
+        )
+        WHERE rn = 1
+    ''', ids):
+        fees = dict(row)
+        del fees['rn']
+        by_id[fees['student_id']]['fees'] = fees
+
+    return children
@@ -0,0 +1,55 @@
+"""
+Column projection for SaarthiAI API readers
+A reader names its output columns once as name -> SQL expression; a
+fields= parameter then decides which of them are selected, and rows come
+back as plain dicts keyed by the cursor's column names
+"""
+
+
+def fetch_dicts(conn, sql, params=()):
+    """
+    Run a query and return its rows as dicts
+
+    The cursor returns plain tuples, which are zipped with the column names
+    from cursor.description; this skips building sqlite3.Row objects only
+    to copy them into dicts.
+    """
+    cursor = conn.cursor()
+    cursor.row_factory = None
+    cursor.execute(sql, params)
+    names = [column[0] for column in cursor.description]
+    rows = [dict(zip(names, row)) for row in cursor.fetchall()]
+    cursor.close()
+    return rows
+
+
+def select_list(columns, fields=None, required=()):
+    """
+    SQL select list for the requested output columns
+
+    Args:
+        columns: dict of output name -> SQL expression, in output order
+        fields: names requested by the client (None for all)
+        required: names the reader itself needs, selected even if not requested
+
+    Returns:
+        'expr as name, ...' string
+    """
+    return ', '.join(
+        f'{expression} as {name}'
+        for name, expression in columns.items()
+        if fields is None or name in fields or name in required
+    )
+
+
+def wants(fields, *names):
+    """True if any of the names will be in the output"""
+    return fields is None or any(name in fields for name in names)
+
+
+def project(rows, columns, fields=None):
+    """Drop columns that were selected for the reader's own use only"""
+    if fields is None:
+        return rows
+    keep = [name for name in columns if name in fields]
+    return [{name: row[name] for name in keep} for row in rows]
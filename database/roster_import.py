@@ -0,0 +1,512 @@
+"""
+Bulk roster import for SaarthiAI
+Creates student, teacher and parent accounts, enrollments and parent links
+from a CSV or XLSX file
+
+Usage:
+    python -m database.roster_import intake.csv --db database/saarthi.db --report errors.csv
+
+Rows are read as a stream and handled CHUNK_SIZE at a time: each chunk is
+validated, its new passwords are hashed across a process pool, and it is
+written with executemany in one transaction. Accounts are keyed by username
+and student code, and existing enrollments and links are left alone, so
+importing the same file again only adds what is missing.
+
+Columns (header row required, order free):
+    role            student | teacher | parent
+    username        login name, unique
+    email           unique
+    full_name       required for teachers and parents; students default to
+                    first_name + last_name
+    password        optional; blank uses --default-password or a generated one
+    student_code    students only, e.g. STU20260042
+    first_name, last_name, phone, date_of_birth, address
+                    students only
+    courses         students only; course codes separated by ';'
+    parent_username students only; a parent account in this file or the database
+    relationship    students only; e.g. Mother (default: parent)
+"""
+
+import argparse
+import csv
+import io
+import multiprocessing
+import os
+import re
+import secrets
+import sqlite3
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, timedelta
+from xml.etree.ElementTree import iterparse
+
+from werkzeug.security import generate_password_hash
+
+from .versions import invalidate_all
+
+CHUNK_SIZE = 2000
+# Below this many new passwords a chunk is hashed inline; starting workers costs more
+POOL_THRESHOLD = 16
+ROLES = ('student', 'teacher', 'parent')
+COLUMNS = (
+    'role', 'username', 'email', 'full_name', 'password', 'student_code',
+    'first_name', 'last_name', 'phone', 'date_of_birth', 'address',
+    'courses', 'parent_username', 'relationship',
+)
+EMAIL_RE = re.compile(r'^[^@\s]+@[^@\s]+\.[^@\s]+$')
+EXCEL_EPOCH = date(1899, 12, 30)
+
+
+# ============ READERS ============
+
+def read_csv(stream):
+    """Yield dicts from a binary or text CSV stream"""
+    if not isinstance(stream, io.TextIOBase):
+        stream = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+    yield from csv.DictReader(stream)
+
+
+def _local(tag):
+    return tag.rsplit('}', 1)[-1]
+
+
+def _column_index(ref):
+    index = 0
+    for char in ref:
+        if not char.isalpha():
+            break
+        index = index * 26 + ord(char.upper()) - 64
+    return index - 1
+
+
+def read_xlsx(stream):
+    """
+    Yield dicts from the first worksheet of an XLSX file
+
+    Parsed with iterparse and cleared row by row, so only the shared-strings
+    table is held in memory.
+    """
+    with zipfile.ZipFile(stream) as workbook:
+        names = set(workbook.namelist())
+        shared = []
+        if 'xl/sharedStrings.xml' in names:
+            with workbook.open('xl/sharedStrings.xml') as f:
+                for _, element in iterparse(f):
+                    if _local(element.tag) == 'si':
+                        shared.append(''.join(t.text or '' for t in element.iter() if _local(t.tag) == 't'))
+                        element.clear()
+        sheets = sorted((n for n in names if re.fullmatch(r'xl/worksheets/sheet\d+\.xml', n)),
+                        key=lambda n: int(re.search(r'(\d+)\.xml$', n).group(1)))
+        if not sheets:
+            raise ValueError('Workbook has no worksheets')
+
+        header = None
+        with workbook.open(sheets[0]) as f:
+            for _, element in iterparse(f):
+                if _local(element.tag) != 'row':
+                    continue
+                values = {}
+                for cell in element:
+                    if _local(cell.tag) != 'c':
+                        continue
+                    kind = cell.get('t')
+                    text = None
+                    for child in cell.iter():
+                        name = _local(child.tag)
+                        if (name == 'v' and kind != 'inlineStr') or (name == 't' and kind == 'inlineStr'):
+                            text = child.text or ''
+                    if text is None:
+                        continue
+                    if kind == 's':
+                        text = shared[int(text)]
+                    values[_column_index(cell.get('r', ''))] = text
+                element.clear()
+                if not values:
+                    continue
+                row = [values.get(i, '') for i in range(max(values) + 1)]
+                if header is None:
+                    header = [str(name).strip() for name in row]
+                    continue
+                yield dict(zip(header, row))
+
+
+def read_roster(stream, filename):
+    """Pick the reader from the file extension"""
+    if filename.lower().endswith('.xlsx'):
+        return read_xlsx(stream)
+    if filename.lower().endswith('.csv'):
+        return read_csv(stream)
+    raise ValueError('Roster must be a .csv or .xlsx file')
+
+
+# ============ VALIDATION ============
+
+def _as_date(value):
+    """ISO date, or an Excel serial day number from a date-formatted cell"""
+    if re.fullmatch(r'\d+(\.0+)?', value):
+        return (EXCEL_EPOCH + timedelta(days=int(float(value)))).isoformat()
+    return datetime.strptime(value, '%Y-%m-%d').date().isoformat()
+
+
+def _clean(raw):
+    row = {}
+    for column in COLUMNS:
+        value = raw.get(column)
+        row[column] = '' if value is None else str(value).strip()
+    row['role'] = row['role'].lower()
+    row['email'] = row['email'].lower()
+    return row
+
+
+def _validate(row, course_ids):
+    """Problems with a single row, independent of the rest of the file"""
+    problems = []
+    role = row['role']
+    if role not in ROLES:
+        problems.append(f"role must be one of {', '.join(ROLES)}")
+    if not row['username']:
+        problems.append('username is required')
+    if not EMAIL_RE.match(row['email']):
+        problems.append('a valid email is required')
+    if role == 'student':
+        for column in ('student_code', 'first_name', 'last_name'):
+            if not row[column]:
+                problems.append(f'{column} is required for students')
+        if row['date_of_birth']:
+            try:
+                row['date_of_birth'] = _as_date(row['date_of_birth'])
+            except ValueError:
+                problems.append('date_of_birth must be YYYY-MM-DD')
+        codes = [code.strip() for code in row['courses'].split(';') if code.strip()]
+        unknown = [code for code in codes if code not in course_ids]
+        if unknown:
+            problems.append(f"unknown course code(s): {', '.join(unknown)}")
+        row['courses'] = codes
+        if not row['full_name']:
+            row['full_name'] = f"{row['first_name']} {row['last_name']}".strip()
+    else:
+        if not row['full_name']:
+            problems.append('full_name is required')
+        if row['student_code'] or row['courses'] or row['parent_username']:
+            problems.append('student_code, courses and parent_username only apply to students')
+    return problems
+
+
+def _in_clause(values):
+    return ','.join('?' * len(values))
+
+
+# ============ IMPORT ============
+
+class RosterImport:
+    """Runs one import and collects its report"""
+
+    def __init__(self, conn, write=None, default_password=None, workers=None, chunk_size=CHUNK_SIZE):
+        """
+        Args:
+            conn: connection for lookups
+            write: function running fn(connection) in one committed transaction;
+                   defaults to a transaction on conn
+            default_password: initial password for rows without one; when
+                              None a random one is generated and reported
+            workers: password hashing processes (default: CPU count)
+            chunk_size: rows validated, hashed and written together
+        """
+        self.conn = conn
+        self.write = write or self._write_direct
+        self.default_password = default_password
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.created = 0
+        self.existing = 0
+        self.failed = 0
+        self.enrollments = 0
+        self.links = 0
+        self.report = []
+        self._pool = None
+        self._seen = {}
+        self._pending_links = []
+        self._course_ids = {code: course_id for course_id, code in conn.execute('SELECT id, course_code FROM courses')}
+
+    def _write_direct(self, fn):
+        self.conn.execute('BEGIN IMMEDIATE')
+        try:
+            result = fn(self.conn)
+        except Exception:
+            self.conn.execute('ROLLBACK')
+            raise
+        self.conn.execute('COMMIT')
+        return result
+
+    def _fail(self, line, row, message):
+        self.failed += 1
+        self.report.append({'row': line, 'username': row.get('username', ''), 'status': 'error',
+                            'message': message, 'initial_password': ''})
+
+    def run(self, records):
+        """
+        Import an iterable of row dicts
+
+        Returns:
+            Summary dict with created / existing / failed / enrollments / links
+            counts and the report (errors, warnings and generated passwords)
+        """
+        try:
+            chunk = []
+            # Line 1 is the header
+            for line, raw in enumerate(records, start=2):
+                chunk.append((line, raw))
+                if len(chunk) >= self.chunk_size:
+                    self._import_chunk(chunk)
+                    chunk = []
+            if chunk:
+                self._import_chunk(chunk)
+            self._link_parents()
+            self.report.sort(key=lambda entry: entry['row'])
+        finally:
+            if self._pool is not None:
+                self._pool.shutdown()
+        return self.summary()
+
+    def summary(self):
+        return {
+            'created': self.created,
+            'existing': self.existing,
+            'failed': self.failed,
+            'enrollments': self.enrollments,
+            'parent_links': self.links,
+            'report': self.report,
+        }
+
+    def _claim(self, line, row):
+        """Reject values that repeat an earlier row of the same file"""
+        keys = [('username', row['username']), ('email', row['email'])]
+        if row['student_code']:
+            keys.append(('student_code', row['student_code']))
+        for key in keys:
+            if key in self._seen:
+                return f'{key[0]} {key[1]} repeats row {self._seen[key]}'
+        for key in keys:
+            self._seen[key] = line
+        return None
+
+    def _hash(self, passwords):
+        if len(passwords) < POOL_THRESHOLD or self.workers < 2:
+            return [generate_password_hash(p) for p in passwords]
+        if self._pool is None:
+            # spawn, not fork: the web process has writer and scheduler threads
+            self._pool = ProcessPoolExecutor(max_workers=self.workers,
+                                             mp_context=multiprocessing.get_context('spawn'))
+        chunksize = max(1, len(passwords) // (self.workers * 4))
+        return list(self._pool.map(generate_password_hash, passwords, chunksize=chunksize))
+
+    def _import_chunk(self, chunk):
+        rows = []
+        for line, raw in chunk:
+            row = _clean(raw)
+            problems = _validate(row, self._course_ids)
+            if not problems:
+                duplicate = self._claim(line, row)
+                if duplicate:
+                    problems.append(duplicate)
+            if problems:
+                self._fail(line, row, '; '.join(problems))
+            else:
+                rows.append((line, row))
+        if not rows:
+            return
+
+        usernames = [row['username'] for _, row in rows]
+        existing = {username: (role, email) for username, role, email in self.conn.execute(
+            f'SELECT username, role, email FROM users WHERE username IN ({_in_clause(usernames)})', usernames
+        )}
+        new_emails = [row['email'] for _, row in rows if row['username'] not in existing]
+        taken = {email for (email,) in self.conn.execute(
+            f'SELECT email FROM users WHERE email IN ({_in_clause(new_emails)})', new_emails
+        )} if new_emails else set()
+
+        accepted = []
+        for line, row in rows:
+            current = existing.get(row['username'])
+            if current is not None and current[0] != row['role']:
+                self._fail(line, row, f"username already belongs to a {current[0]} account")
+            elif current is None and row['email'] in taken:
+                self._fail(line, row, 'email already belongs to another account')
+            else:
+                accepted.append((line, row, current is None))
+
+        fresh = [(line, row) for line, row, is_new in accepted if is_new]
+        generated = {}
+        passwords = []
+        for line, row in fresh:
+            password = row['password'] or self.default_password
+            if not password:
+                password = generated[line] = secrets.token_urlsafe(9)
+            passwords.append(password)
+        hashes = dict(zip((line for line, _ in fresh), self._hash(passwords)))
+
+        outcome = self.write(lambda conn: self._write_chunk(conn, accepted, hashes))
+
+        for line, row, is_new in accepted:
+            error = outcome['errors'].get(line)
+            if error:
+                self._fail(line, row, error)
+            elif line in outcome['created']:
+                self.created += 1
+                if line in generated:
+                    self.report.append({'row': line, 'username': row['username'], 'status': 'created',
+                                        'message': 'generated initial password',
+                                        'initial_password': generated[line]})
+            else:
+                self.existing += 1
+        self.enrollments += outcome['enrollments']
+
+    def _write_chunk(self, conn, accepted, hashes):
+        """Insert one validated chunk; runs inside the caller's transaction"""
+        usernames = [row['username'] for _, row, _ in accepted]
+        # Checked again here: another writer may have added some since the lookup
+        before = {u for (u,) in conn.execute(
+            f'SELECT username FROM users WHERE username IN ({_in_clause(usernames)})', usernames
+        )}
+        conn.executemany('''
+            INSERT OR IGNORE INTO users (username, password, full_name, email, role)
+            VALUES (?, ?, ?, ?, ?)
+        ''', [(row['username'], hashes[line], row['full_name'], row['email'], row['role'])
+              for line, row, is_new in accepted if is_new and row['username'] not in before])
+        user_ids = dict(conn.execute(
+            f'SELECT username, id FROM users WHERE username IN ({_in_clause(usernames)})', usernames
+        ))
+
+        errors = {}
+        created = set()
+        for line, row, is_new in accepted:
+            if row['username'] not in user_ids:
+                errors[line] = 'email already belongs to another account'
+            elif row['username'] not in before:
+                created.add(line)
+
+        students = [(line, row) for line, row, _ in accepted
+                    if row['role'] == 'student' and line not in errors]
+        enrollments = 0
+        if students:
+            conn.executemany('''
+                INSERT OR IGNORE INTO students
+                    (user_id, student_id, first_name, last_name, email, phone, date_of_birth, address)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ''', [(user_ids[row['username']], row['student_code'], row['first_name'], row['last_name'],
+                   row['email'], row['phone'] or None, row['date_of_birth'] or None, row['address'] or None)
+                  for _, row in students])
+            codes = [row['student_code'] for _, row in students]
+            student_rows = {code: (student_id, user_id) for student_id, code, user_id in conn.execute(
+                f'SELECT id, student_id, user_id FROM students WHERE student_id IN ({_in_clause(codes)})', codes
+            )}
+
+            enrollment_rows = []
+            for line, row in students:
+                student = student_rows.get(row['student_code'])
+                if student is None:
+                    errors[line] = 'email already belongs to another student'
+                    created.discard(line)
+                    continue
+                if student[1] != user_ids[row['username']]:
+                    errors[line] = f"student_code {row['student_code']} belongs to another account"
+                    created.discard(line)
+                    continue
+                enrollment_rows.extend((student[0], self._course_ids[code]) for code in row['courses'])
+                if row['parent_username']:
+                    self._pending_links.append((line, row['username'], row['student_code'],
+                                                row['parent_username'], row['relationship'] or 'parent'))
+            before_count = conn.total_changes
+            conn.executemany('''
+                INSERT INTO enrollments (student_id, course_id) VALUES (?, ?)
+                ON CONFLICT(student_id, course_id) DO NOTHING
+            ''', enrollment_rows)
+            enrollments = conn.total_changes - before_count
+
+        # Rows that failed after their user was inserted keep no half-made account
+        orphans = [user_ids[row['username']] for line, row, _ in accepted
+                   if line in errors and row['username'] not in before and row['username'] in user_ids]
+        if orphans:
+            conn.execute(f'DELETE FROM users WHERE id IN ({_in_clause(orphans)})', orphans)
+
+        return {'created': created, 'errors': errors, 'enrollments': enrollments}
+
+    def _link_parents(self):
+        """Link students to parents once every chunk is in, so parents may come later in the file"""
+        if not self._pending_links:
+            return
+        pending = self._pending_links
+
+        def link(conn):
+            names = sorted({parent for _, _, _, parent, _ in pending})
+            parents = dict(conn.execute(
+                f"SELECT username, id FROM users WHERE role = 'parent' AND username IN ({_in_clause(names)})", names
+            ))
+            codes = sorted({code for _, _, code, _, _ in pending})
+            students = dict(conn.execute(
+                f'SELECT student_id, id FROM students WHERE student_id IN ({_in_clause(codes)})', codes
+            ))
+            missing = [(line, username, parent) for line, username, _, parent, _ in pending if parent not in parents]
+            before_count = conn.total_changes
+            conn.executemany('''
+                INSERT INTO parent_student_link (parent_id, student_id, relationship)
+                VALUES (?, ?, ?)
+                ON CONFLICT(parent_id, student_id) DO NOTHING
+            ''', [(parents[parent], students[code], relationship)
+                  for _, _, code, parent, relationship in pending if parent in parents])
+            return missing, conn.total_changes - before_count
+
+        missing, self.links = self.write(link)
+        for line, username, parent in missing:
+            self.report.append({'row': line, 'username': username, 'status': 'warning',
+                                'message': f'parent account {parent} not found; student imported without link',
+                                'initial_password': ''})
+
+
+def import_roster(conn, records, **options):
+    """Import row dicts into the database; see RosterImport for options"""
+    return RosterImport(conn, **options).run(records)
+
+
+def write_report(report, path):
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=['row', 'username', 'status', 'message', 'initial_password'])
+        writer.writeheader()
+        writer.writerows(report)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Import students, teachers and parents from CSV or XLSX')
+    parser.add_argument('file', help='roster .csv or .xlsx')
+    parser.add_argument('--db', default=os.environ.get('DATABASE_PATH', 'database/saarthi.db'))
+    parser.add_argument('--default-password', help='initial password for rows without one')
+    parser.add_argument('--workers', type=int, default=None, help='password hashing processes')
+    parser.add_argument('--report', help='write errors, warnings and generated passwords to this CSV')
+    args = parser.parse_args(argv)
+
+    conn = sqlite3.connect(args.db, timeout=20, isolation_level=None)
+    conn.execute('PRAGMA journal_mode=WAL')
+
+    started = time.perf_counter()
+    with open(args.file, 'rb') as f:
+        result = import_roster(conn, read_roster(f, args.file),
+                               default_password=args.default_password, workers=args.workers)
+    conn.close()
+    if result['created'] or result['enrollments'] or result['parent_links']:
+        invalidate_all(args.db)
+
+    print(f"✅ Imported in {time.perf_counter() - started:.1f}s: {result['created']} created, "
+          f"{result['existing']} already present, {result['failed']} failed, "
+          f"{result['enrollments']} enrollments, {result['parent_links']} parent links")
+    if args.report:
+        write_report(result['report'], args.report)
+        print(f"📄 Report written to {args.report}")
+    else:
+        for entry in result['report']:
+            if entry['status'] != 'created':
+                print(f"{'❌' if entry['status'] == 'error' else '⚠️ '} Row {entry['row']} ({entry['username']}): {entry['message']}")
+
+
+if __name__ == '__main__':
+    main()
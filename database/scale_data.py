@@ -0,0 +1,432 @@
+"""
+Scale data generator for SaarthiAI
+Fills every table to production-like sizes for load testing
+
+Usage:
+    python -m database.scale_data --db database/scale.db --students 10000 --attendance 10000000
+
+All sampling is vectorized with NumPy and seeded, so the same arguments always
+produce the same database. Rows go in through executemany inside one large
+transaction per table (attendance uses staged INSERT ... SELECT, see below),
+and secondary indexes are built after the load.
+"""
+
+import argparse
+import os
+import sqlite3
+import time
+from datetime import date, datetime, timedelta
+
+import numpy as np
+from werkzeug.security import generate_password_hash
+
+from .schema import create_tables, create_indexes
+from .search import create_search_index
+from .versions import invalidate_all
+
+CHUNK_SIZE = 200_000
+
+FIRST_NAMES = np.array(['Aarav', 'Diya', 'Rohan', 'Ananya', 'Vivaan', 'Isha', 'Arjun', 'Priya',
+                        'Kabir', 'Sneha', 'Aditya', 'Kavya', 'Rahul', 'Pinki', 'Sonam', 'Neha',
+                        'Karan', 'Meera', 'Vikram', 'Pooja'], dtype=object)
+LAST_NAMES = np.array(['Sharma', 'Verma', 'Singh', 'Patel', 'Kumar', 'Gupta', 'Reddy', 'Nair',
+                       'Dagar', 'Iyer', 'Joshi', 'Mehta', 'Chopra', 'Das', 'Rao'], dtype=object)
+SUBJECTS = ['Data Structures', 'Machine Learning', 'Database Systems', 'Web Development',
+            'Operating Systems', 'Computer Networks', 'Discrete Mathematics', 'Calculus',
+            'Physics', 'Digital Electronics', 'Software Engineering', 'Compilers']
+EXAM_TYPES = np.array(['Midterm Exam', 'Assignment 1', 'Assignment 2', 'Lab Work', 'Quiz', 'Final Exam'], dtype=object)
+GRADE_CUTS = [(95, 'A+'), (90, 'A'), (85, 'A-'), (80, 'B+'), (70, 'B'), (60, 'B-'), (50, 'C+'), (0, 'C')]
+DAYS = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday']
+TIME_SLOTS = ['09:00-10:00', '10:00-11:00', '11:15-12:15', '12:15-13:15', '14:00-15:00', '15:00-16:00']
+NOTIFICATION_TYPES = np.array(['info', 'success', 'warning'], dtype=object)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Generate a scale database for load testing')
+    parser.add_argument('--db', default='database/scale.db', help='output database file')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--students', type=int, default=10_000)
+    parser.add_argument('--teachers', type=int, default=200)
+    parser.add_argument('--courses', type=int, default=400)
+    parser.add_argument('--courses-per-student', type=int, default=5)
+    parser.add_argument('--attendance', type=int, default=10_000_000, help='total attendance rows')
+    parser.add_argument('--grades-per-enrollment', type=int, default=4)
+    parser.add_argument('--assignments-per-course', type=int, default=10)
+    parser.add_argument('--notifications-per-user', type=int, default=20)
+    parser.add_argument('--chats-per-student', type=int, default=5)
+    parser.add_argument('--announcements', type=int, default=2_000)
+    parser.add_argument('--parent-ratio', type=float, default=0.8,
+                        help='fraction of students with a linked parent account')
+    parser.add_argument('--password', default='student123', help='password shared by all generated accounts')
+    parser.add_argument('--force', action='store_true', help='overwrite an existing output file')
+    return parser.parse_args(argv)
+
+
+def connect_for_load(path):
+    """Open a connection tuned for a one-shot bulk load"""
+    conn = sqlite3.connect(path, isolation_level=None)
+    conn.execute('PRAGMA journal_mode=OFF')
+    conn.execute('PRAGMA synchronous=OFF')
+    conn.execute('PRAGMA locking_mode=EXCLUSIVE')
+    conn.execute('PRAGMA temp_store=MEMORY')
+    conn.execute('PRAGMA cache_size=-262144')
+    return conn
+
+
+def bulk_insert(conn, sql, rows):
+    """executemany in CHUNK_SIZE slices inside a single transaction"""
+    conn.execute('BEGIN')
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= CHUNK_SIZE:
+            conn.executemany(sql, batch)
+            batch = []
+    if batch:
+        conn.executemany(sql, batch)
+    conn.execute('COMMIT')
+
+
+def letter_grades(percent):
+    """Vectorized marks-percentage to letter grade"""
+    thresholds = np.array([cut for cut, _ in GRADE_CUTS])
+    letters = np.array([letter for _, letter in GRADE_CUTS], dtype=object)
+    return letters[np.argmax(percent[:, None] >= thresholds[None, :], axis=1)]
+
+
+def iso_days(start, count):
+    """Object array of ISO date strings start, start+1, ..."""
+    return np.array([(start + timedelta(days=i)).isoformat() for i in range(count)], dtype=object)
+
+
+def class_days(end, count):
+    """The last `count` weekdays up to and including `end`, oldest first"""
+    days = []
+    day = end
+    while len(days) < count:
+        if day.weekday() < 5:
+            days.append(day.isoformat())
+        day -= timedelta(days=1)
+    return np.array(days[::-1], dtype=object)
+
+
+def generate(args):
+    rng = np.random.default_rng(args.seed)
+    today = date.today()
+
+    if os.path.exists(args.db):
+        if not args.force:
+            raise SystemExit(f"❌ {args.db} already exists (use --force to overwrite)")
+        os.remove(args.db)
+    os.makedirs(os.path.dirname(args.db) or '.', exist_ok=True)
+
+    conn = connect_for_load(args.db)
+    create_tables(conn)
+    timings = {}
+
+    def timed(name, fn):
+        started = time.perf_counter()
+        count = fn()
+        timings[name] = (count, time.perf_counter() - started)
+        print(f"   ✅ {name:<24} {count:>12,} rows  {timings[name][1]:6.1f}s")
+
+    # One hash for every account keeps generation fast and logins usable
+    password = generate_password_hash(args.password)
+
+    n_students = args.students
+    n_teachers = args.teachers
+    n_parents = int(n_students * args.parent_ratio)
+
+    # users ids: 1 admin, then teachers, students, parents
+    teacher_user_ids = np.arange(2, 2 + n_teachers)
+    student_user_ids = np.arange(2 + n_teachers, 2 + n_teachers + n_students)
+    parent_user_ids = np.arange(2 + n_teachers + n_students, 2 + n_teachers + n_students + n_parents)
+
+    first = FIRST_NAMES[rng.integers(0, len(FIRST_NAMES), n_students)]
+    last = LAST_NAMES[rng.integers(0, len(LAST_NAMES), n_students)]
+
+    def users():
+        def rows():
+            yield ('admin', password, 'Admin User', 'admin@saarthi.ai', 'admin')
+            for i in range(n_teachers):
+                yield (f'teacher{i + 1:04d}', password, f'Teacher {i + 1}', f'teacher{i + 1:04d}@saarthi.ai', 'teacher')
+            for i in range(n_students):
+                yield (f'student{i + 1:06d}', password, f'{first[i]} {last[i]}', f'student{i + 1:06d}@saarthi.ai', 'student')
+            for i in range(n_parents):
+                yield (f'parent{i + 1:06d}', password, f'Parent of {first[i]} {last[i]}', f'parent{i + 1:06d}@saarthi.ai', 'parent')
+        bulk_insert(conn, 'INSERT INTO users (username, password, full_name, email, role) VALUES (?, ?, ?, ?, ?)', rows())
+        return 1 + n_teachers + n_students + n_parents
+    timed('users', users)
+
+    def students():
+        year = today.year
+        dob = iso_days(date(year - 22, 1, 1), 5 * 365)[rng.integers(0, 5 * 365, n_students)]
+        phones = rng.integers(7_000_000_000, 9_999_999_999, n_students)
+        rows = zip(student_user_ids.tolist(),
+                   [f'STU{year}{i + 1:06d}' for i in range(n_students)],
+                   first.tolist(), last.tolist(),
+                   [f'student{i + 1:06d}@student.saarthi.ai' for i in range(n_students)],
+                   [f'+91 {p}' for p in phones.tolist()],
+                   dob.tolist())
+        bulk_insert(conn, '''
+            INSERT INTO students (user_id, student_id, first_name, last_name, email, phone, date_of_birth)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        ''', rows)
+        return n_students
+    timed('students', students)
+
+    n_courses = args.courses
+    course_teacher = teacher_user_ids[rng.integers(0, n_teachers, n_courses)]
+
+    def courses():
+        rows = ((f'C{i + 1:04d}', f'{SUBJECTS[i % len(SUBJECTS)]} {i // len(SUBJECTS) + 1}',
+                 f'Generated course {i + 1}', int(course_teacher[i]), 'Fall 2024', 4)
+                for i in range(n_courses))
+        bulk_insert(conn, '''
+            INSERT INTO courses (course_code, course_name, description, teacher_id, semester, credits)
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', rows)
+        subject_rows = ((f'S{i + 1:04d}', f'{SUBJECTS[i % len(SUBJECTS)]} Core', 4, int(course_teacher[i]), i + 1)
+                        for i in range(n_courses))
+        bulk_insert(conn, '''
+            INSERT INTO subjects (subject_code, subject_name, credits, teacher_id, course_id)
+            VALUES (?, ?, ?, ?, ?)
+        ''', subject_rows)
+        timetable_rows = ((i + 1, DAYS[i % len(DAYS)], TIME_SLOTS[(i // len(DAYS)) % len(TIME_SLOTS)],
+                           f'Room {100 + i % 60}', int(course_teacher[i]))
+                          for i in range(n_courses))
+        bulk_insert(conn, 'INSERT INTO timetable (course_id, day, time_slot, room, teacher_id) VALUES (?, ?, ?, ?, ?)',
+                    timetable_rows)
+        return n_courses
+    timed('courses', courses)
+
+    # Each student takes k distinct courses: argsort of random keys per row
+    k = min(args.courses_per_student, n_courses)
+    picks = np.argsort(rng.random((n_students, n_courses)), axis=1)[:, :k] if n_courses <= 2000 else \
+        np.stack([rng.choice(n_courses, k, replace=False) for _ in range(n_students)])
+    enroll_student = np.repeat(np.arange(1, n_students + 1), k)
+    enroll_course = picks.reshape(-1) + 1
+
+    def enrollments():
+        bulk_insert(conn, 'INSERT INTO enrollments (student_id, course_id) VALUES (?, ?)',
+                    zip(enroll_student.tolist(), enroll_course.tolist()))
+        return len(enroll_student)
+    timed('enrollments', enrollments)
+
+    def attendance():
+        n_pairs = len(enroll_student)
+        if n_pairs == 0 or args.attendance <= 0:
+            return 0
+        n_days = -(-args.attendance // n_pairs)
+        days = class_days(today, n_days)
+        # Per-student presence rate, skewed so some students fall below 75%
+        propensity = rng.beta(8, 2, n_students + 1)[enroll_student]
+
+        # Binding 10M tuples through executemany is dominated by Python
+        # overhead, so the (student, course) pairs are staged once and every
+        # class day becomes one INSERT ... SELECT. NumPy samples a one-byte
+        # code per row (status, method, confidence bucket), passed as a BLOB
+        # and decoded through a small lookup table.
+        conn.execute('CREATE TEMP TABLE scale_pairs (idx INTEGER PRIMARY KEY, student_id INTEGER, course_id INTEGER)')
+        conn.execute('CREATE TEMP TABLE scale_codes (code BLOB PRIMARY KEY, status TEXT, method TEXT, confidence REAL) WITHOUT ROWID')
+        bulk_insert(conn, 'INSERT INTO scale_pairs VALUES (?, ?, ?)',
+                    zip(range(1, n_pairs + 1), enroll_student.tolist(), enroll_course.tolist()))
+        statuses = ['present', 'absent', 'late']
+        levels = 80
+        codes = [(bytes([s]), statuses[s], 'manual', 0.0) for s in range(3)]
+        codes += [(bytes([3 + s * levels + level]), statuses[s], 'face_recognition', round(90.0 + level * 0.12, 2))
+                  for s in range(3) for level in range(levels)]
+        bulk_insert(conn, 'INSERT INTO scale_codes VALUES (?, ?, ?, ?)', codes)
+
+        conn.execute('BEGIN')
+        emitted = 0
+        for day in days:
+            take = min(n_pairs, args.attendance - emitted)
+            roll = rng.random(take)
+            p = propensity[:take]
+            status = np.where(roll < p, 0, np.where(roll < p + (1 - p) * 0.2, 2, 1))
+            face = rng.random(take) < 0.5
+            code = np.where(face, 3 + status * levels + rng.integers(0, levels, take), status).astype(np.uint8)
+            conn.execute('''
+                INSERT INTO attendance (student_id, course_id, date, status, method, confidence)
+                SELECT p.student_id, p.course_id, ?, k.status, k.method, k.confidence
+                FROM scale_pairs p
+                JOIN scale_codes k ON k.code = substr(?, p.idx, 1)
+                WHERE p.idx <= ?
+            ''', (day, code.tobytes(), take))
+            emitted += take
+        conn.execute('COMMIT')
+        conn.execute('DROP TABLE scale_pairs')
+        conn.execute('DROP TABLE scale_codes')
+        return emitted
+    timed('attendance', attendance)
+
+    def grades():
+        g = args.grades_per_enrollment
+        s = np.repeat(enroll_student, g)
+        c = np.repeat(enroll_course, g)
+        percent = np.clip(rng.normal(78, 12, len(s)), 20, 100).round(0)
+        exam = EXAM_TYPES[np.tile(np.arange(g) % len(EXAM_TYPES), len(enroll_student))]
+        exam_date = iso_days(today - timedelta(days=120), 120)[rng.integers(0, 120, len(s))]
+        rows = zip(s.tolist(), c.tolist(), letter_grades(percent).tolist(), percent.tolist(),
+                   [100.0] * len(s), exam.tolist(), exam_date.tolist())
+        bulk_insert(conn, '''
+            INSERT INTO grades (student_id, course_id, grade, marks, max_marks, exam_type, exam_date)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        ''', rows)
+        return len(s)
+    timed('grades', grades)
+
+    n_assignments = n_courses * args.assignments_per_course
+
+    def assignments():
+        course = np.repeat(np.arange(1, n_courses + 1), args.assignments_per_course)
+        due = iso_days(today - timedelta(days=60), 90)[rng.integers(0, 90, n_assignments)]
+        rows = ((int(course[i]), f'Assignment {i % args.assignments_per_course + 1} - C{course[i]:04d}',
+                 'Generated assignment', due[i], 100) for i in range(n_assignments))
+        bulk_insert(conn, '''
+            INSERT INTO assignments (course_id, title, description, due_date, max_marks)
+            VALUES (?, ?, ?, ?, ?)
+        ''', rows)
+        resource_rows = ((i + 1, f'Lecture notes {j + 1}', 'Generated resource', 'pdf', '1.2 MB', int(course_teacher[i]))
+                         for i in range(n_courses) for j in range(3))
+        bulk_insert(conn, '''
+            INSERT INTO resources (course_id, title, description, file_type, file_size, uploaded_by)
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', resource_rows)
+        return n_assignments
+    timed('assignments', assignments)
+
+    def submissions():
+        # Every enrolled student submits about 60% of their course's assignments
+        per = args.assignments_per_course
+        s = np.repeat(enroll_student, per)
+        a = (np.repeat(enroll_course - 1, per) * per + np.tile(np.arange(per), len(enroll_student))) + 1
+        keep = rng.random(len(s)) < 0.6
+        s, a = s[keep], a[keep]
+        marks = np.clip(rng.normal(75, 15, len(s)), 0, 100).round(0)
+        rows = zip(a.tolist(), s.tolist(), marks.tolist(), ['submitted'] * len(s))
+        bulk_insert(conn, '''
+            INSERT INTO assignment_submissions (assignment_id, student_id, marks, status)
+            VALUES (?, ?, ?, ?)
+        ''', rows)
+        return len(s)
+    timed('assignment_submissions', submissions)
+
+    def fees():
+        total = np.full(n_students, 50000.0)
+        paid = rng.choice([50000.0, 40000.0, 25000.0, 0.0], n_students, p=[0.5, 0.25, 0.15, 0.1])
+        status = np.where(paid >= total, 'paid', np.where(paid > 0, 'partial', 'pending'))
+        due = (today + timedelta(days=30)).isoformat()
+        rows = zip(range(1, n_students + 1), total.tolist(), paid.tolist(), (total - paid).tolist(),
+                   [due] * n_students, status.tolist())
+        bulk_insert(conn, '''
+            INSERT INTO fees (student_id, total_amount, paid_amount, due_amount, due_date, status)
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', rows)
+        return n_students
+    timed('fees', fees)
+
+    def parent_links():
+        rows = zip(parent_user_ids.tolist(), range(1, n_parents + 1), ['parent'] * n_parents)
+        bulk_insert(conn, 'INSERT INTO parent_student_link (parent_id, student_id, relationship) VALUES (?, ?, ?)', rows)
+        return n_parents
+    timed('parent_student_link', parent_links)
+
+    def notifications():
+        per = args.notifications_per_user
+        users = np.repeat(np.concatenate([student_user_ids, parent_user_ids]), per)
+        kind = NOTIFICATION_TYPES[rng.integers(0, len(NOTIFICATION_TYPES), len(users))]
+        is_read = (rng.random(len(users)) < 0.7).astype(int)
+        start = datetime.combine(today, datetime.min.time()) - timedelta(days=60)
+        offsets = np.sort(rng.integers(0, 60 * 86400, len(users)))
+        created = [(start + timedelta(seconds=int(o))).strftime('%Y-%m-%d %H:%M:%S') for o in offsets.tolist()]
+        rows = zip(users.tolist(), ['Attendance Update'] * len(users),
+                   ['Your attendance has been recorded'] * len(users),
+                   kind.tolist(), is_read.tolist(), created)
+        bulk_insert(conn, '''
+            INSERT INTO notifications (user_id, title, message, type, is_read, created_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', rows)
+        return len(users)
+    timed('notifications', notifications)
+
+    def chat_history():
+        per = args.chats_per_student
+        s = np.repeat(np.arange(1, n_students + 1), per)
+        topic = np.array(SUBJECTS, dtype=object)[rng.integers(0, len(SUBJECTS), len(s))]
+        kind = np.array(['general', 'explain', 'quiz', 'flashcard'], dtype=object)[rng.integers(0, 4, len(s))]
+        start = datetime.combine(today, datetime.min.time()) - timedelta(days=60)
+        offsets = rng.integers(0, 60 * 86400, len(s))
+        created = [(start + timedelta(seconds=int(o))).strftime('%Y-%m-%d %H:%M:%S') for o in offsets.tolist()]
+        rows = zip(s.tolist(), [f'Explain {t}' for t in topic.tolist()],
+                   [f'{t} is a core topic. Here are the key ideas...' for t in topic.tolist()],
+                   kind.tolist(), created)
+        bulk_insert(conn, '''
+            INSERT INTO ai_chat_history (student_id, message, response, chat_type, created_at)
+            VALUES (?, ?, ?, ?, ?)
+        ''', rows)
+        return len(s)
+    timed('ai_chat_history', chat_history)
+
+    def announcements():
+        audiences = np.array(['all', 'students', 'parents', 'teachers'], dtype=object)
+        priority = np.array(['low', 'normal', 'high'], dtype=object)
+        topic = np.array(SUBJECTS, dtype=object)[rng.integers(0, len(SUBJECTS), args.announcements)]
+        rows = zip([f'{t} update {i + 1}' for i, t in enumerate(topic.tolist())],
+                   [f'Schedule and reading list changes for {t}. Please check the portal.' for t in topic.tolist()],
+                   priority[rng.integers(0, 3, args.announcements)].tolist(),
+                   audiences[rng.integers(0, 4, args.announcements)].tolist(),
+                   [1] * args.announcements)
+        bulk_insert(conn, '''
+            INSERT INTO announcements (title, content, priority, target_audience, created_by)
+            VALUES (?, ?, ?, ?, ?)
+        ''', rows)
+        return args.announcements
+    timed('announcements', announcements)
+
+    def misc():
+        events = [(f'Event {i + 1}', (today + timedelta(days=7 * i)).isoformat(), '10:00', 'Main Campus',
+                   'Generated event') for i in range(20)]
+        bulk_insert(conn, 'INSERT INTO events (name, date, time, location, description) VALUES (?, ?, ?, ?, ?)', events)
+        low = np.flatnonzero(rng.random(n_students) < 0.05) + 1
+        bulk_insert(conn, '''
+            INSERT INTO attendance_alerts (student_id, course_id, attendance_percentage, alert_sent, last_alert_date)
+            VALUES (?, ?, ?, 1, ?)
+        ''', ((int(s), int(enroll_course[(s - 1) * k]), 70.0, today.isoformat()) for s in low))
+        bulk_insert(conn, '''
+            INSERT INTO email_logs (recipient_email, recipient_name, subject, message, email_type, sent_by)
+            VALUES (?, ?, 'Low Attendance Alert', 'Generated alert', 'low_attendance', 1)
+        ''', ((f'student{s:06d}@student.saarthi.ai', f'{first[s - 1]} {last[s - 1]}') for s in low))
+        return 20 + 2 * len(low)
+    timed('events/alerts/email_logs', misc)
+
+    started = time.perf_counter()
+    create_indexes(conn)
+    conn.execute('BEGIN')
+    create_search_index(conn)
+    conn.execute('PRAGMA analysis_limit=1000')
+    conn.execute('ANALYZE')
+    print(f"   ✅ {'indexes + FTS + ANALYZE':<24} {'':>12}       {time.perf_counter() - started:6.1f}s")
+
+    conn.execute('PRAGMA locking_mode=NORMAL')
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.close()
+    invalidate_all(args.db)
+    return timings
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    print("=" * 60)
+    print(f"🏗️  Generating scale database at {args.db} (seed {args.seed})")
+    print("=" * 60)
+    started = time.perf_counter()
+    generate(args)
+    print("=" * 60)
+    print(f"✅ Done in {time.perf_counter() - started:.1f}s")
+    print(f"   Login with any generated account, e.g. student000001 / {args.password}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,300 @@
+"""
+Schema definitions for SaarthiAI
+Shared by the app, the scale data generator and maintenance jobs
+"""
+
+TABLES = [
+    # Users table
+    '''
+        CREATE TABLE IF NOT EXISTS users (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            username TEXT UNIQUE NOT NULL,
+            password TEXT NOT NULL,
+            full_name TEXT NOT NULL,
+            email TEXT UNIQUE NOT NULL,
+            role TEXT NOT NULL CHECK(role IN ('admin', 'teacher', 'student', 'parent')),
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+    ''',
+    # Students table
+    '''
+        CREATE TABLE IF NOT EXISTS students (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER,
+            student_id TEXT UNIQUE NOT NULL,
+            first_name TEXT NOT NULL,
+            last_name TEXT NOT NULL,
+            email TEXT UNIQUE NOT NULL,
+            phone TEXT,
+            date_of_birth DATE,
+            address TEXT,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users(id)
+        )
+    ''',
+    # Courses table
+    '''
+        CREATE TABLE IF NOT EXISTS courses (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            course_code TEXT UNIQUE NOT NULL,
+            course_name TEXT NOT NULL,
+            description TEXT,
+            teacher_id INTEGER,
+            semester TEXT,
+            credits INTEGER DEFAULT 4,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (teacher_id) REFERENCES users(id)
+        )
+    ''',
+    # Subjects table
+    '''
+        CREATE TABLE IF NOT EXISTS subjects (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            subject_code TEXT UNIQUE NOT NULL,
+            subject_name TEXT NOT NULL,
+            credits INTEGER DEFAULT 4,
+            teacher_id INTEGER,
+            course_id INTEGER,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (teacher_id) REFERENCES users(id),
+            FOREIGN KEY (course_id) REFERENCES courses(id)
+        )
+    ''',
+    # Enrollments table
+    '''
+        CREATE TABLE IF NOT EXISTS enrollments (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            student_id INTEGER NOT NULL,
+            course_id INTEGER NOT NULL,
+            enrollment_date DATETIME DEFAULT CURRENT_TIMESTAMP,
+            status TEXT DEFAULT 'active',
+            FOREIGN KEY (student_id) REFERENCES students(id),
+            FOREIGN KEY (course_id) REFERENCES courses(id),
+            UNIQUE(student_id, course_id)
+        )
+    ''',
+    # Attendance table
+    '''
+        CREATE TABLE IF NOT EXISTS attendance (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            student_id INTEGER NOT NULL,
+            course_id INTEGER NOT NULL,
+            date DATE NOT NULL,
+            status TEXT NOT NULL CHECK(status IN ('present', 'absent', 'late')),
+            method TEXT DEFAULT 'manual',
+            confidence REAL DEFAULT 0,
+            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (student_id) REFERENCES students(id),
+            FOREIGN KEY (course_id) REFERENCES courses(id)
+        )
+    ''',
+    # Grades table
+    '''
+        CREATE TABLE IF NOT EXISTS grades (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            student_id INTEGER NOT NULL,
+            course_id INTEGER NOT NULL,
+            grade TEXT,
+            marks REAL,
+            max_marks REAL,
+            exam_type TEXT,
+            exam_date DATE,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (student_id) REFERENCES students(id),
+            FOREIGN KEY (course_id) REFERENCES courses(id)
+        )
+    ''',
+    # Assignments table
+    '''
+        CREATE TABLE IF NOT EXISTS assignments (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            course_id INTEGER NOT NULL,
+            title TEXT NOT NULL,
+            description TEXT,
+            due_date DATE NOT NULL,
+            max_marks REAL DEFAULT 100,
+            status TEXT DEFAULT 'active',
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (course_id) REFERENCES courses(id)
+        )
+    ''',
+    # Assignment submissions table
+    '''
+        CREATE TABLE IF NOT EXISTS assignment_submissions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            assignment_id INTEGER NOT NULL,
+            student_id INTEGER NOT NULL,
+            submission_date DATETIME DEFAULT CURRENT_TIMESTAMP,
+            marks REAL,
+            feedback TEXT,
+            status TEXT DEFAULT 'pending',
+            FOREIGN KEY (assignment_id) REFERENCES assignments(id),
+            FOREIGN KEY (student_id) REFERENCES students(id)
+        )
+    ''',
+    # Resources table
+    '''
+        CREATE TABLE IF NOT EXISTS resources (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            course_id INTEGER NOT NULL,
+            title TEXT NOT NULL,
+            description TEXT,
+            file_type TEXT,
+            file_size TEXT,
+            uploaded_by INTEGER,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (course_id) REFERENCES courses(id),
+            FOREIGN KEY (uploaded_by) REFERENCES users(id)
+        )
+    ''',
+    # Email logs table
+    '''
+        CREATE TABLE IF NOT EXISTS email_logs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            recipient_email TEXT NOT NULL,
+            recipient_name TEXT,
+            subject TEXT NOT NULL,
+            message TEXT,
+            status TEXT DEFAULT 'sent',
+            sent_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            sent_by INTEGER,
+            email_type TEXT,
+            FOREIGN KEY (sent_by) REFERENCES users(id)
+        )
+    ''',
+    # Attendance alerts table
+    '''
+        CREATE TABLE IF NOT EXISTS attendance_alerts (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            student_id INTEGER NOT NULL,
+            course_id INTEGER NOT NULL,
+            attendance_percentage REAL,
+            alert_sent INTEGER DEFAULT 0,
+            last_alert_date DATE,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (student_id) REFERENCES students(id),
+            FOREIGN KEY (course_id) REFERENCES courses(id)
+        )
+    ''',
+    # Fees table
+    '''
+        CREATE TABLE IF NOT EXISTS fees (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            student_id INTEGER NOT NULL,
+            total_amount REAL NOT NULL,
+            paid_amount REAL DEFAULT 0,
+            due_amount REAL NOT NULL,
+            due_date DATE NOT NULL,
+            status TEXT DEFAULT 'pending',
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (student_id) REFERENCES students(id)
+        )
+    ''',
+    # Parent-Student Link table
+    '''
+        CREATE TABLE IF NOT EXISTS parent_student_link (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            parent_id INTEGER NOT NULL,
+            student_id INTEGER NOT NULL,
+            relationship TEXT NOT NULL,
+            linked_date DATETIME DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (parent_id) REFERENCES users(id),
+            FOREIGN KEY (student_id) REFERENCES students(id),
+            UNIQUE(parent_id, student_id)
+        )
+    ''',
+    # Events table
+    '''
+        CREATE TABLE IF NOT EXISTS events (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            date DATE NOT NULL,
+            time TIME,
+            location TEXT,
+            description TEXT,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+    ''',
+    # Timetable table
+    '''
+        CREATE TABLE IF NOT EXISTS timetable (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            course_id INTEGER NOT NULL,
+            day TEXT NOT NULL,
+            time_slot TEXT NOT NULL,
+            room TEXT,
+            teacher_id INTEGER,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (course_id) REFERENCES courses(id),
+            FOREIGN KEY (teacher_id) REFERENCES users(id)
+        )
+    ''',
+    # Notifications table
+    '''
+        CREATE TABLE IF NOT EXISTS notifications (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            title TEXT NOT NULL,
+            message TEXT NOT NULL,
+            type TEXT DEFAULT 'info',
+            is_read INTEGER DEFAULT 0,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users(id)
+        )
+    ''',
+    # Announcements table
+    '''
+        CREATE TABLE IF NOT EXISTS announcements (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            title TEXT NOT NULL,
+            content TEXT NOT NULL,
+            priority TEXT DEFAULT 'normal' CHECK(priority IN ('low', 'normal', 'high')),
+            target_audience TEXT DEFAULT 'all',
+            created_by INTEGER,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (created_by) REFERENCES users(id)
+        )
+    ''',
+    # AI chat history table
+    '''
+        CREATE TABLE IF NOT EXISTS ai_chat_history (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            student_id INTEGER NOT NULL,
+            message TEXT NOT NULL,
+            response TEXT NOT NULL,
+            chat_type TEXT DEFAULT 'general',
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (student_id) REFERENCES students(id)
+        )
+    ''',
+]
+
+# Secondary indexes for the hot dashboard queries. Kept apart from TABLES so
+# bulk loaders can create them after the data is in. SQLite appends the rowid
+# to every index, so (student_id, date) also serves keyset pages on (date, id).
+INDEXES = [
+    'CREATE INDEX IF NOT EXISTS idx_students_user ON students(user_id)',
+    'CREATE INDEX IF NOT EXISTS idx_enrollments_course ON enrollments(course_id)',
+    'CREATE INDEX IF NOT EXISTS idx_attendance_student_date ON attendance(student_id, date)',
+    'CREATE INDEX IF NOT EXISTS idx_attendance_course_date ON attendance(course_id, date)',
+    'CREATE INDEX IF NOT EXISTS idx_grades_student_date ON grades(student_id, exam_date)',
+    'CREATE INDEX IF NOT EXISTS idx_assignments_course ON assignments(course_id, due_date)',
+    'CREATE INDEX IF NOT EXISTS idx_submissions_assignment ON assignment_submissions(assignment_id, student_id)',
+    'CREATE INDEX IF NOT EXISTS idx_resources_course ON resources(course_id)',
+    'CREATE INDEX IF NOT EXISTS idx_fees_student ON fees(student_id, created_at)',
+    'CREATE INDEX IF NOT EXISTS idx_parent_link_student ON parent_student_link(student_id)',
+    'CREATE INDEX IF NOT EXISTS idx_notifications_user ON notifications(user_id, created_at)',
+    'CREATE INDEX IF NOT EXISTS idx_chat_history_student ON ai_chat_history(student_id, created_at)',
+]
+
+def create_tables(conn):
+    """Create all tables that do not exist yet"""
+    for ddl in TABLES:
+        conn.execute(ddl)
+    conn.commit()
+
+def create_indexes(conn):
+    """Create secondary indexes that do not exist yet"""
+    for ddl in INDEXES:
+        conn.execute(ddl)
+    conn.commit()
@@ -0,0 +1,247 @@
+"""
+Full-text search for SaarthiAI
+FTS5 indexes over announcements, resources, assignments and AI chat history,
+kept in sync by triggers and queried with BM25 ranking
+
+Usage (migration for an existing database):
+    python -m database.search --db database/saarthi.db
+"""
+
+import argparse
+import html
+import os
+import re
+import sqlite3
+
+# source name -> (content table, text columns, title column, owner column)
+# An owner column is indexed as an extra FTS column so per-owner searches
+# intersect doclists inside FTS instead of ranking every match first
+SOURCES = {
+    'announcements': ('announcements', ('title', 'content'), 'title', None),
+    'resources': ('resources', ('title', 'description'), 'title', None),
+    'assignments': ('assignments', ('title', 'description'), 'title', None),
+    'chat_history': ('ai_chat_history', ('message', 'response'), 'message', 'student_id'),
+}
+
+AUDIENCES = {
+    'student': ('all', 'students'),
+    'teacher': ('all', 'teachers'),
+    'parent': ('all', 'parents'),
+}
+
+# Sentinels survive html.escape and are swapped for <mark> afterwards, so
+# snippets are safe to insert as HTML
+_MARK_OPEN = '\x02'
+_MARK_CLOSE = '\x03'
+_TOKEN = re.compile(r'\w+', re.UNICODE)
+
+
+def _fts_ddl(name, table, columns):
+    cols = ', '.join(columns)
+    new_vals = ', '.join(f'new.{c}' for c in columns)
+    old_vals = ', '.join(f'old.{c}' for c in columns)
+    return [
+        f'''CREATE VIRTUAL TABLE IF NOT EXISTS {name}_fts USING fts5(
+                {cols}, content='{table}', content_rowid='id',
+                tokenize='porter unicode61', prefix='2 3')''',
+        f'''CREATE TRIGGER IF NOT EXISTS {name}_fts_ai AFTER INSERT ON {table} BEGIN
+                INSERT INTO {name}_fts(rowid, {cols}) VALUES (new.id, {new_vals});
+            END''',
+        f'''CREATE TRIGGER IF NOT EXISTS {name}_fts_ad AFTER DELETE ON {table} BEGIN
+                INSERT INTO {name}_fts({name}_fts, rowid, {cols}) VALUES ('delete', old.id, {old_vals});
+            END''',
+        f'''CREATE TRIGGER IF NOT EXISTS {name}_fts_au AFTER UPDATE ON {table} BEGIN
+                INSERT INTO {name}_fts({name}_fts, rowid, {cols}) VALUES ('delete', old.id, {old_vals});
+                INSERT INTO {name}_fts(rowid, {cols}) VALUES (new.id, {new_vals});
+            END''',
+    ]
+
+
+def create_search_index(conn, rebuild=False):
+    """
+    Create FTS tables and sync triggers, backfilling any that are new
+
+    Args:
+        conn: database connection; content tables must already exist
+        rebuild: rebuild every index from its content table
+
+    Returns:
+        List of sources that were (re)built
+    """
+    built = []
+    for name, (table, columns, _, owner) in SOURCES.items():
+        if owner:
+            columns = columns + (owner,)
+        exists = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (f'{name}_fts',)
+        ).fetchone()
+        for ddl in _fts_ddl(name, table, columns):
+            conn.execute(ddl)
+        if rebuild or not exists:
+            conn.execute(f"INSERT INTO {name}_fts({name}_fts) VALUES ('rebuild')")
+            built.append(name)
+    conn.commit()
+    return built
+
+
+def match_expression(text, prefix=True):
+    """
+    Turn free text into a safe FTS5 query
+
+    Every word is quoted, so FTS syntax characters in user input cannot
+    break the query. With prefix=True the last word is a prefix match for
+    search-as-you-type.
+    """
+    tokens = _TOKEN.findall(text or '')
+    if not tokens:
+        return None
+    quoted = [f'"{t}"' for t in tokens]
+    if prefix:
+        quoted[-1] += '*'
+    return ' '.join(quoted)
+
+
+def _snippet(values):
+    """Pick the first column snippet with a hit and make it HTML-safe"""
+    value = next((v for v in values if v and _MARK_OPEN in v), values[0])
+    return html.escape(value or '').replace(_MARK_OPEN, '<mark>').replace(_MARK_CLOSE, '</mark>')
+
+
+def _scope(conn, role, user_id):
+    """Resolve what the caller may see: (course ids or None for all, student id)"""
+    if role == 'admin':
+        return None, None
+    if role == 'teacher':
+        rows = conn.execute('SELECT id FROM courses WHERE teacher_id = ?', (user_id,)).fetchall()
+        return [r[0] for r in rows], None
+    if role == 'student':
+        student = conn.execute('SELECT id FROM students WHERE user_id = ?', (user_id,)).fetchone()
+        if not student:
+            return [], None
+        rows = conn.execute('SELECT course_id FROM enrollments WHERE student_id = ?', (student[0],)).fetchall()
+        return [r[0] for r in rows], student[0]
+    if role == 'parent':
+        rows = conn.execute('''
+            SELECT DISTINCT e.course_id
+            FROM parent_student_link psl
+            JOIN enrollments e ON e.student_id = psl.student_id
+            WHERE psl.parent_id = ?
+        ''', (user_id,)).fetchall()
+        return [r[0] for r in rows], None
+    return [], None
+
+
+def search(conn, text, role, user_id, sources=None, limit=20, scope=None):
+    """
+    Ranked search across the sources the caller is allowed to read
+
+    Args:
+        conn: database connection
+        text: free-text query
+        role: session role of the caller
+        user_id: users.id of the caller
+        sources: subset of SOURCES to search (default all)
+        limit: maximum number of results
+        scope: (course ids, student id) already known for the caller, e.g.
+               from the session student context; resolved here when omitted
+
+    Returns:
+        List of result dicts, BM25-ranked sources first (best score first),
+        then owner-scoped chat history newest first with a null score
+    """
+    expression = match_expression(text)
+    if expression is None:
+        return []
+
+    course_ids, student_id = scope if scope is not None else _scope(conn, role, user_id)
+    course_filter = ''
+    course_params = []
+    if course_ids is not None:
+        course_filter = f" AND d.course_id IN ({','.join('?' * len(course_ids)) or 'NULL'})"
+        course_params = course_ids
+
+    results = []
+    for name in sources or SOURCES:
+        if name not in SOURCES:
+            continue
+        table, columns, title, owner = SOURCES[name]
+        fts = f'{name}_fts'
+        snippets = ', '.join(
+            f"snippet({fts}, {i}, '{_MARK_OPEN}', '{_MARK_CLOSE}', '…', 12)" for i in range(len(columns))
+        )
+        weights = ', '.join(['1.0'] * len(columns) + (['0.0'] if owner else []))
+        score = f'bm25({fts}, {weights})'
+        order = 'score'
+        where = ''
+        params = [expression]
+        if name == 'announcements':
+            if role != 'admin':
+                audiences = AUDIENCES.get(role, ('all',))
+                where = f" AND COALESCE(d.target_audience, 'all') IN ({','.join('?' * len(audiences))})"
+                params += audiences
+            extra = 'NULL AS course_id'
+        elif name == 'chat_history':
+            # Chat history is private to the student who had the conversation
+            if student_id is None:
+                continue
+            # bm25 and prefix expansion both walk every matching document in
+            # the corpus; without them FTS only intersects the owner's short
+            # doclist with the query terms, so rank by recency instead
+            exact = match_expression(text, prefix=False)
+            params = [f'{owner} : "{int(student_id)}" AND {{{" ".join(columns)}}} : ({exact})']
+            score = 'NULL'
+            order = f'{fts}.rowid DESC'
+            extra = 'NULL AS course_id'
+        else:
+            where = course_filter
+            params += course_params
+            extra = 'd.course_id'
+        params.append(limit)
+
+        rows = conn.execute(f'''
+            SELECT d.id, d.{title} AS title, {extra}, d.created_at,
+                   {score} AS score, {snippets}
+            FROM {fts}
+            JOIN {table} d ON d.id = {fts}.rowid
+            WHERE {fts} MATCH ?{where}
+            ORDER BY {order}
+            LIMIT ?
+        ''', params).fetchall()
+
+        for row in rows:
+            results.append({
+                'type': name,
+                'id': row[0],
+                'title': row[1],
+                'course_id': row[2],
+                'created_at': row[3],
+                'snippet': _snippet(row[5:]),
+                'score': round(row[4], 4) if row[4] is not None else None,
+            })
+
+    results.sort(key=lambda r: (r['score'] is None, r['score'] or 0))
+    return results[:limit]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Create and backfill the full-text search index')
+    parser.add_argument('--db', default=os.environ.get('DATABASE_PATH', 'database/saarthi.db'))
+    parser.add_argument('--rebuild', action='store_true', help='rebuild indexes that already exist')
+    args = parser.parse_args(argv)
+
+    from .schema import create_indexes, create_tables
+
+    conn = sqlite3.connect(args.db, timeout=20)
+    conn.execute('PRAGMA journal_mode=WAL')
+    create_tables(conn)
+    create_indexes(conn)
+    built = create_search_index(conn, rebuild=args.rebuild)
+    for name in SOURCES:
+        conn.execute(f"INSERT INTO {name}_fts({name}_fts) VALUES ('optimize')")
+    conn.commit()
+    conn.close()
+    print(f"✅ Search index ready (built: {', '.join(built) or 'none'})")
+
+
+if __name__ == '__main__':
+    main()
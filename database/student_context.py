@@ -0,0 +1,101 @@
+"""
+Cached student context for SaarthiAI
+Everything a student's requests keep re-deriving (row id, enrolled courses,
+teachers, linked parents), resolved once and cached server-side; the
+session cookie only carries the student id and the version it was built at
+"""
+
+import collections
+import threading
+
+# Counter bumped whenever enrollments, parent links or course teachers change
+ROSTER_SCOPE = 'roster'
+
+
+def load_student_context(conn, user_id):
+    """
+    Resolve a student's identity and relationships
+
+    Args:
+        conn: database connection
+        user_id: users.id of the student
+
+    Returns:
+        JSON-serialisable dict, or None if the user has no student record
+    """
+    student = conn.execute(
+        'SELECT id, student_id FROM students WHERE user_id = ?', (user_id,)
+    ).fetchone()
+    if not student:
+        return None
+
+    courses = conn.execute('''
+        SELECT c.id, c.teacher_id, u.full_name as teacher_name
+        FROM enrollments e
+        JOIN courses c ON c.id = e.course_id
+        LEFT JOIN users u ON u.id = c.teacher_id
+        WHERE e.student_id = ?
+        ORDER BY c.id
+    ''', (student['id'],)).fetchall()
+
+    parents = conn.execute('''
+        SELECT u.id, u.full_name, u.email
+        FROM parent_student_link psl
+        JOIN users u ON u.id = psl.parent_id
+        WHERE psl.student_id = ?
+        ORDER BY u.id
+    ''', (student['id'],)).fetchall()
+
+    return {
+        'student_id': student['id'],
+        'student_code': student['student_id'],
+        'course_ids': [c['id'] for c in courses],
+        'teachers': [
+            {'course_id': c['id'], 'teacher_id': c['teacher_id'], 'name': c['teacher_name']}
+            for c in courses
+        ],
+        'parents': [
+            {'user_id': p['id'], 'name': p['full_name'], 'email': p['email']}
+            for p in parents
+        ],
+    }
+
+
+def invalidate_student_contexts(versions):
+    """Mark every cached context stale; call after roster changes commit"""
+    versions.bump(ROSTER_SCOPE)
+
+
+class StudentContextCache:
+    """
+    Per-process LRU of loaded contexts, keyed by user id
+
+    Contexts hold parent names and emails, so they stay on the server; the
+    signed (not encrypted) session cookie only references them. Each worker
+    process loads a context on its first request for a student.
+    """
+
+    def __init__(self, max_entries=5000):
+        self.max_entries = max_entries
+        self._contexts = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id, version):
+        """Cached context built at `version`, or None"""
+        with self._lock:
+            context = self._contexts.get(user_id)
+            if context is None or context['version'] != version:
+                return None
+            self._contexts.move_to_end(user_id)
+            return context
+
+    def put(self, user_id, context):
+        with self._lock:
+            self._contexts[user_id] = context
+            self._contexts.move_to_end(user_id)
+            while len(self._contexts) > self.max_entries:
+                self._contexts.popitem(last=False)
+
+    def discard(self, user_id):
+        with self._lock:
+            self._contexts.pop(user_id, None)
@@ -0,0 +1,134 @@
+"""
+Time-series analytics for SaarthiAI
+Buckets grades and attendance by day, week or month in one GROUP BY query,
+then fills empty buckets in NumPy so every series has a point per bucket
+"""
+
+from datetime import date, datetime, timedelta
+
+import numpy as np
+
+INTERVALS = ('day', 'week', 'month')
+
+# SQLite expressions mapping a date column to the first day of its bucket;
+# weeks start on Monday
+_BUCKET_SQL = {
+    'day': "date({col})",
+    'week': "date({col}, 'weekday 0', '-6 days')",
+    'month': "strftime('%Y-%m-01', {col})",
+}
+
+# metric -> (table, date column, aggregate columns)
+METRICS = {
+    'grades': ('grades', 'exam_date', '''
+        ROUND(AVG(marks * 100.0 / NULLIF(max_marks, 0)), 2) as value,
+        COUNT(*) as count
+    '''),
+    'attendance': ('attendance', 'date', '''
+        ROUND(SUM(CASE WHEN status = 'present' THEN 1 ELSE 0 END) * 100.0 / COUNT(*), 2) as value,
+        COUNT(*) as count
+    '''),
+}
+
+_GROUP_COLUMNS = {None: None, 'student': 'student_id', 'course': 'course_id'}
+
+
+def _as_date(value):
+    if isinstance(value, date):
+        return value
+    return datetime.strptime(str(value)[:10], '%Y-%m-%d').date()
+
+
+def bucket_starts(start, end, interval):
+    """
+    First day of every bucket overlapping [start, end]
+
+    Returns:
+        numpy datetime64[D] array
+    """
+    start, end = _as_date(start), _as_date(end)
+    if interval == 'day':
+        return np.arange(np.datetime64(start), np.datetime64(end) + 1, dtype='datetime64[D]')
+    if interval == 'week':
+        monday = start - timedelta(days=start.weekday())
+        return np.arange(np.datetime64(monday), np.datetime64(end) + 1, 7, dtype='datetime64[D]')
+    months = np.arange(np.datetime64(start, 'M'), np.datetime64(end, 'M') + 1, dtype='datetime64[M]')
+    return months.astype('datetime64[D]')
+
+
+def time_series(conn, metric, start, end, interval='week', student_ids=None, course_ids=None, by=None):
+    """
+    Bucketed series for a metric in a single query
+
+    Args:
+        conn: database connection
+        metric: 'grades' (average percentage) or 'attendance' (present rate)
+        start, end: inclusive date range (date or ISO string)
+        interval: 'day', 'week' or 'month'
+        student_ids: restrict to these students (None for all)
+        course_ids: restrict to these courses (None for all)
+        by: None for one series, or 'student' / 'course' for one series each
+
+    Returns:
+        {'buckets': [ISO dates], 'series': [{'key', 'values', 'counts'}]}.
+        Empty buckets hold None in values and 0 in counts.
+    """
+    if metric not in METRICS:
+        raise ValueError(f'Unknown metric: {metric}')
+    if interval not in INTERVALS:
+        raise ValueError(f'Unknown interval: {interval}')
+    if by not in _GROUP_COLUMNS:
+        raise ValueError(f'Unknown grouping: {by}')
+
+    start, end = _as_date(start), _as_date(end)
+    if end < start:
+        raise ValueError('end must not be before start')
+
+    table, column, aggregates = METRICS[metric]
+    bucket = _BUCKET_SQL[interval].format(col=column)
+    group_column = _GROUP_COLUMNS[by]
+
+    where = [f'{column} >= ?', f'{column} < ?']
+    params = [start.isoformat(), (end + timedelta(days=1)).isoformat()]
+    for name, values in (('student_id', student_ids), ('course_id', course_ids)):
+        if values is not None:
+            where.append(f"{name} IN ({','.join('?' * len(values)) or 'NULL'})")
+            params.extend(values)
+
+    key = group_column or 'NULL'
+    rows = conn.execute(f'''
+        SELECT {key} as series_key, {bucket} as bucket, {aggregates}
+        FROM {table}
+        WHERE {' AND '.join(where)}
+        GROUP BY series_key, bucket
+        ORDER BY series_key, bucket
+    ''', params).fetchall()
+
+    buckets = bucket_starts(start, end, interval)
+    grouped = {}
+    for row in rows:
+        grouped.setdefault(row['series_key'], []).append(row)
+    if group_column is None and not grouped:
+        grouped[None] = []
+
+    series = []
+    for series_key, series_rows in grouped.items():
+        values = np.full(len(buckets), np.nan)
+        counts = np.zeros(len(buckets), dtype=np.int64)
+        if series_rows:
+            positions = np.searchsorted(
+                buckets, np.array([r['bucket'] for r in series_rows], dtype='datetime64[D]')
+            )
+            values[positions] = [np.nan if r['value'] is None else r['value'] for r in series_rows]
+            counts[positions] = [r['count'] for r in series_rows]
+        series.append({
+            'key': series_key,
+            'values': [None if np.isnan(v) else float(v) for v in values],
+            'counts': counts.tolist(),
+        })
+
+    return {
+        'interval': interval,
+        'buckets': [str(b) for b in buckets],
+        'series': series,
+    }
@@ -0,0 +1,118 @@
+"""
+Data-version counters for SaarthiAI
+Small counters bumped by write paths and compared by readers to tell whether
+cached state is still current, without querying the database
+
+Counters live in a memory-mapped file next to the database, so every worker
+process on the host sees the same values. Keys hash into a fixed number of
+slots; two keys sharing a slot only cause extra invalidations, never stale
+reads. The file carries a random epoch, so deleting it invalidates every
+stamp handed out before.
+"""
+
+import mmap
+import os
+import struct
+import threading
+import zlib
+
+try:
+    import fcntl
+except ImportError:  # Windows: counters are still shared, bumps only lock per process
+    fcntl = None
+
+# Bumped by bulk operations (initialisation, archival, data generation) to
+# invalidate everything derived from the database at once
+GLOBAL_SCOPE = 'all'
+
+_HEADER = struct.Struct('<Q')
+_SLOT = struct.Struct('<Q')
+
+
+class DataVersions:
+    """Shared monotonically increasing counters keyed by (scope, key)"""
+
+    def __init__(self, path, slots=8192):
+        """
+        Args:
+            path: counter file, created on first use
+            slots: number of counter slots in the file
+        """
+        self.path = path
+        self.slots = slots
+        self._size = _HEADER.size + slots * _SLOT.size
+        self._lock = threading.Lock()
+        self._fd = None
+        self._map = None
+        self._epoch = None
+
+    def _open(self):
+        if self._map is not None:
+            return
+        with self._lock:
+            if self._map is not None:
+                return
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            self._lock_file(fd)
+            try:
+                if os.fstat(fd).st_size < self._size:
+                    os.ftruncate(fd, self._size)
+                mapped = mmap.mmap(fd, self._size)
+                if _HEADER.unpack_from(mapped, 0)[0] == 0:
+                    _HEADER.pack_into(mapped, 0, int.from_bytes(os.urandom(8), 'little') or 1)
+                    mapped.flush()
+            finally:
+                self._unlock_file(fd)
+            self._epoch = _HEADER.unpack_from(mapped, 0)[0]
+            self._fd = fd
+            self._map = mapped
+
+    @staticmethod
+    def _lock_file(fd):
+        if fcntl is not None:
+            fcntl.lockf(fd, fcntl.LOCK_EX)
+
+    @staticmethod
+    def _unlock_file(fd):
+        if fcntl is not None:
+            fcntl.lockf(fd, fcntl.LOCK_UN)
+
+    def _offset(self, scope, key):
+        slot = zlib.crc32(f'{scope}:{key}'.encode()) % self.slots
+        return _HEADER.size + slot * _SLOT.size
+
+    def get(self, scope, key=''):
+        """Current counter value for a key"""
+        self._open()
+        return _SLOT.unpack_from(self._map, self._offset(scope, key))[0]
+
+    def bump(self, scope, key=''):
+        """Advance a key's counter; call after the write it describes has committed"""
+        self._open()
+        offset = self._offset(scope, key)
+        # The thread lock orders bumps within a process, the file lock across
+        # processes, so concurrent bumps are never collapsed into one
+        with self._lock:
+            self._lock_file(self._fd)
+            try:
+                value = _SLOT.unpack_from(self._map, offset)[0] + 1
+                _SLOT.pack_into(self._map, offset, value)
+            finally:
+                self._unlock_file(self._fd)
+        return value
+
+    def stamp(self, scope, key=''):
+        """Opaque version string for a key, unique across counter-file resets"""
+        value = self.get(scope, key)
+        return f'{self._epoch:x}-{value}'
+
+
+def versions_path(database_path):
+    """Default counter file for a database"""
+    return database_path + '-versions'
+
+
+def invalidate_all(database_path):
+    """Invalidate every version stamp for a database changed outside the app"""
+    DataVersions(versions_path(database_path)).bump(GLOBAL_SCOPE)
@@ -0,0 +1,207 @@
+"""
+Single-writer queue for SQLite
+Request threads hand write intents to one writer thread, which commits them
+together in short group transactions instead of fighting over the write lock
+"""
+
+import os
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+
+from metrics import SQLITE_LOCK_ERRORS, SQLITE_LOCK_WAIT
+
+
+class WriteQueue:
+    """Drains write intents on a dedicated thread and commits them in batches"""
+
+    def __init__(self, database_path, batch_interval=0.005, max_batch=500, busy_timeout=20):
+        """
+        Args:
+            database_path: SQLite database file the writer owns
+            batch_interval: seconds to keep collecting intents after the first one arrives
+            max_batch: maximum number of intents committed in one transaction
+            busy_timeout: seconds to wait on a lock held by writers outside the queue
+        """
+        self.database_path = database_path
+        self.batch_interval = batch_interval
+        self.max_batch = max_batch
+        self.busy_timeout = busy_timeout
+
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+        self._stopping = False
+
+    def submit(self, sql_or_fn, params=()):
+        """
+        Queue a write and return immediately
+
+        Args:
+            sql_or_fn: SQL statement, or a callable taking the writer connection
+                       for multi-statement units (read-then-write upserts)
+            params: parameters for the SQL statement
+
+        Returns:
+            Future resolved after the batch holding this write has committed.
+            The result is the cursor's lastrowid for SQL intents, or the return
+            value of the callable. Fire-and-forget callers can ignore it.
+        """
+        self._ensure_started()
+        future = Future()
+        self._queue.put((sql_or_fn, params, future))
+        return future
+
+    def execute(self, sql_or_fn, params=(), timeout=30):
+        """Queue a write and block until it is durable"""
+        return self.submit(sql_or_fn, params).result(timeout=timeout)
+
+    def flush(self, timeout=30):
+        """Wait for every write queued so far to commit"""
+        return self.submit(lambda conn: None).result(timeout=timeout)
+
+    def stop(self, timeout=5):
+        """Commit what is queued and stop the writer thread"""
+        with self._lock:
+            thread = self._thread
+            if thread is None or self._pid != os.getpid():
+                return
+            self._stopping = True
+            self._queue.put(None)
+        thread.join(timeout)
+        with self._lock:
+            self._thread = None
+            self._stopping = False
+
+    def _running(self):
+        return self._thread is not None and self._pid == os.getpid() and self._thread.is_alive()
+
+    def _ensure_started(self):
+        """Start the writer lazily, again in a forked child, and again if it died"""
+        if self._running():
+            return
+        with self._lock:
+            if self._running():
+                return
+            if self._pid != os.getpid():
+                # Intents queued in the parent belong to the parent's writer
+                self._queue = queue.Queue()
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name='sqlite-writer', daemon=True)
+            self._thread.start()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.database_path, timeout=self.busy_timeout,
+                               isolation_level=None, check_same_thread=False)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _collect(self, first):
+        """Gather intents that arrive within one batch window"""
+        batch = [first]
+        deadline = time.monotonic() + self.batch_interval
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                self._queue.put(None)
+                break
+            batch.append(item)
+        return batch
+
+    def _run(self):
+        conn = None
+        try:
+            while True:
+                first = self._queue.get()
+                if first is None:
+                    break
+                conn = self._write(conn, self._collect(first))
+            # Drain anything queued behind the stop marker
+            leftover = []
+            while True:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is not None:
+                    leftover.append(item)
+            if leftover:
+                conn = self._write(conn, leftover)
+        finally:
+            if conn is not None:
+                conn.close()
+
+    def _write(self, conn, batch):
+        """
+        Commit a batch without ever letting an error end the writer thread
+
+        Returns:
+            The connection to use for the next batch; after an unexpected
+            failure (a failed ROLLBACK, a connection that could not be
+            opened) the batch is failed and the next one reconnects
+        """
+        try:
+            if conn is None:
+                conn = self._connect()
+            self._commit_batch(conn, batch)
+            return conn
+        except Exception as e:
+            print(f"❌ Writer error, reconnecting: {e}")
+            self._fail(batch, e)
+            if conn is not None:
+                try:
+                    conn.close()
+                except sqlite3.Error:
+                    pass
+            return None
+
+    @staticmethod
+    def _fail(batch, error):
+        for _, _, future in batch:
+            if not future.done():
+                future.set_exception(error)
+
+    def _commit_batch(self, conn, batch):
+        """Run a batch in one transaction, isolating failures per intent"""
+        results = []
+        try:
+            # BEGIN IMMEDIATE is where the writer sits in SQLite's busy handler
+            # while another process holds the write lock
+            with SQLITE_LOCK_WAIT.time(source='write_queue'):
+                conn.execute('BEGIN IMMEDIATE')
+            for sql_or_fn, params, future in batch:
+                conn.execute('SAVEPOINT intent')
+                try:
+                    if callable(sql_or_fn):
+                        result = sql_or_fn(conn)
+                    else:
+                        result = conn.execute(sql_or_fn, params).lastrowid
+                    conn.execute('RELEASE intent')
+                    results.append((future, result, None))
+                except Exception as e:
+                    conn.execute('ROLLBACK TO intent')
+                    conn.execute('RELEASE intent')
+                    results.append((future, None, e))
+            conn.execute('COMMIT')
+        except Exception as e:
+            print(f"❌ Write batch failed: {e}")
+            if isinstance(e, sqlite3.OperationalError) and 'locked' in str(e):
+                SQLITE_LOCK_ERRORS.inc(source='write_queue')
+            if conn.in_transaction:
+                conn.execute('ROLLBACK')
+            self._fail(batch, e)
+            return
+
+        for future, result, error in results:
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
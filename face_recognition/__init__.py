@@ -2,6 +2,6 @@
 Face Recognition module for SaarthiAI
 """
 
-from .recognizer import recognize_face, train_recognizer
+from .recognizer import load_face_data, recognize_face, train_recognizer
 
-__all__ = ['recognize_face', 'train_recognizer']
\ No newline at end of file
+__all__ = ['load_face_data', 'recognize_face', 'train_recognizer']
\ No newline at end of file
@@ -9,6 +9,8 @@ import pickle
 import os
 from datetime import datetime
 
+from metrics import FACE_STAGE
+
 # Face detection cascade
 face_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
 
@@ -20,17 +22,28 @@ def ensure_model_dir():
     """Ensure model directory exists"""
     os.makedirs(MODEL_DIR, exist_ok=True)
 
+# (mtime, size) of the file and the encodings read from it; a server loads
+# the gallery once before forking so workers share it copy-on-write
+_gallery = (None, {})
+
 def load_face_data():
-    """Load saved face encodings"""
+    """Load saved face encodings, re-reading the file only when it changed"""
+    global _gallery
     ensure_model_dir()
-    if os.path.exists(FACE_DATA_FILE):
+    try:
+        stat = os.stat(FACE_DATA_FILE)
+    except FileNotFoundError:
+        return {}
+    key = (stat.st_mtime_ns, stat.st_size)
+    if _gallery[0] != key:
         try:
             with open(FACE_DATA_FILE, 'rb') as f:
-                return pickle.load(f)
+                _gallery = (key, pickle.load(f))
         except Exception as e:
             print(f"Error loading face data: {e}")
             return {}
-    return {}
+    # Callers add and remove students; the cached dict itself stays untouched
+    return dict(_gallery[1])
 
 def save_face_data(face_data):
     """Save face encodings to file"""
@@ -93,17 +106,20 @@ def train_recognizer(image, student_id):
         bool: True if successful, False otherwise
     """
     # Detect face
-    face_coords = detect_face(image)
+    with FACE_STAGE.time(stage='detect'):
+        face_coords = detect_face(image)
     
     if face_coords is None:
         print("No face detected in image")
         return False
     
     # Extract features
-    encoding = extract_face_features(image, face_coords)
+    with FACE_STAGE.time(stage='extract'):
+        encoding = extract_face_features(image, face_coords)
     
     # Load existing data
-    face_data = load_face_data()
+    with FACE_STAGE.time(stage='load'):
+        face_data = load_face_data()
     
     # Add or update student face data
     if student_id in face_data:
@@ -114,7 +130,8 @@ def train_recognizer(image, student_id):
         face_data[student_id] = encoding
     
     # Save updated data
-    success = save_face_data(face_data)
+    with FACE_STAGE.time(stage='save'):
+        success = save_face_data(face_data)
     
     if success:
         print(f"✓ Face registered for student ID: {student_id}")
@@ -155,17 +172,20 @@ def recognize_face(image, threshold=0.7):
         student_id: ID of recognized student or None
     """
     # Detect face
-    face_coords = detect_face(image)
+    with FACE_STAGE.time(stage='detect'):
+        face_coords = detect_face(image)
     
     if face_coords is None:
         print("No face detected")
         return None
     
     # Extract features
-    encoding = extract_face_features(image, face_coords)
+    with FACE_STAGE.time(stage='extract'):
+        encoding = extract_face_features(image, face_coords)
     
     # Load face database
-    face_data = load_face_data()
+    with FACE_STAGE.time(stage='load'):
+        face_data = load_face_data()
     
     if not face_data:
         print("No registered faces in database")
@@ -175,12 +195,13 @@ def recognize_face(image, threshold=0.7):
     best_match_id = None
     best_similarity = 0
     
-    for student_id, stored_encoding in face_data.items():
-        similarity = calculate_similarity(encoding, stored_encoding)
-        
-        if similarity > best_similarity:
-            best_similarity = similarity
-            best_match_id = student_id
+    with FACE_STAGE.time(stage='match'):
+        for student_id, stored_encoding in face_data.items():
+            similarity = calculate_similarity(encoding, stored_encoding)
+            
+            if similarity > best_similarity:
+                best_similarity = similarity
+                best_match_id = student_id
     
     # Check if best match exceeds threshold
     if best_similarity >= threshold:
@@ -0,0 +1,4 @@
+"""
+Load testing for SaarthiAI
+Reproducible traffic against a scale-generated database
+"""
\ No newline at end of file
@@ -0,0 +1,120 @@
+"""
+Response compression benchmark
+Compresses representative payloads (student dashboard JSON from a scale
+database, the page templates and the static bundles) at several gzip
+levels and brotli qualities and reports bytes saved against CPU time
+
+Usage:
+    python -m loadtest.bench_compression --db database/scale.db --students 50
+
+Use the result to pick COMPRESS_LEVEL and COMPRESS_BROTLI_QUALITY: per
+request the compression CPU should stay well below the time the saved
+bytes take on a slow mobile link.
+"""
+
+import argparse
+import glob
+import json
+import os
+import random
+import sqlite3
+import time
+
+from assets.compression import ResponseCompressor, brotli
+from database.dashboard import load_dashboard
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+SETTINGS = [('gzip', 1), ('gzip', 6), ('gzip', 9)] + ([('br', 1), ('br', 4), ('br', 11)] if brotli else [])
+
+
+def dashboard_payloads(db, students, seed):
+    conn = sqlite3.connect(db)
+    conn.row_factory = sqlite3.Row
+    rows = conn.execute('SELECT id, user_id FROM students ORDER BY id').fetchall()
+    payloads = []
+    for row in random.Random(seed).sample(rows, min(students, len(rows))):
+        data = {'success': True, **load_dashboard(conn, row['id'], row['user_id'])}
+        if orjson is not None:
+            payloads.append(orjson.dumps(data, default=str))
+        else:
+            payloads.append(json.dumps(data, separators=(',', ':'), default=str).encode())
+    conn.close()
+    return payloads
+
+
+def file_payloads(pattern):
+    payloads = []
+    for path in sorted(glob.glob(pattern, recursive=True)):
+        with open(path, 'rb') as f:
+            payloads.append(f.read())
+    return payloads
+
+
+def bench(payloads, encoding, level, repeat):
+    compressor = ResponseCompressor(level=level, brotli_quality=level)
+    best = None
+    for _ in range(repeat):
+        started = time.process_time()
+        compressed = sum(len(compressor.compress(data, encoding)) for data in payloads)
+        elapsed = time.process_time() - started
+        best = elapsed if best is None else min(best, elapsed)
+    raw = sum(map(len, payloads))
+    return {
+        'encoding': encoding,
+        'level': level,
+        'raw_bytes': raw / len(payloads),
+        'compressed_bytes': compressed / len(payloads),
+        'saved': 1 - compressed / raw,
+        'ms_per_response': 1000 * best / len(payloads),
+        'mb_per_cpu_second': raw / best / 1e6 if best else float('inf'),
+    }
+
+
+def print_report(name, results):
+    print(f"\n{name}")
+    print(f"{'encoding':<10}{'level':>6}{'raw B':>10}{'sent B':>10}{'saved':>8}{'ms/resp':>10}{'MB/cpu-s':>10}")
+    for r in results:
+        print(f"{r['encoding']:<10}{r['level']:>6}{r['raw_bytes']:>10.0f}{r['compressed_bytes']:>10.0f}"
+              f"{r['saved']:>7.1%}{r['ms_per_response']:>10.3f}{r['mb_per_cpu_second']:>10.1f}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark response compression settings')
+    parser.add_argument('--db', help='scale database for dashboard JSON payloads')
+    parser.add_argument('--students', type=int, default=50)
+    parser.add_argument('--repeat', type=int, default=3, help='runs per measurement; the best is kept')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help='write results as JSON')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    groups = {
+        'templates (HTML)': file_payloads(os.path.join('templates', '**', '*.html')),
+        'static bundles (CSS/JS)': file_payloads(os.path.join('static', '[cj]s*', '*')),
+    }
+    if args.db:
+        groups['student dashboard (JSON)'] = dashboard_payloads(args.db, args.students, args.seed)
+    if brotli is None:
+        print("⚠️  brotli is not installed; only gzip is measured")
+
+    results = {}
+    for name, payloads in groups.items():
+        if not payloads:
+            continue
+        results[name] = [bench(payloads, encoding, level, args.repeat) for encoding, level in SETTINGS]
+        print_report(f"{name}: {len(payloads)} payloads", results[name])
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"\n💾 Results written to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,131 @@
+"""
+JSON serialization benchmark for the student API
+Loads each dashboard section for a sample of students and reports the CPU
+time of jsonify-style stdlib json against orjson, and the payload size of
+the full response against a fields= projection
+
+Usage:
+    python -m database.scale_data --db database/scale.db --students 10000
+    python -m loadtest.bench_json --db database/scale.db --students 200
+
+The readers run against the database directly, so query time and
+serialization time are measured separately and no server is needed.
+"""
+
+import argparse
+import json
+import random
+import sqlite3
+import time
+
+from database.dashboard import SECTIONS, parse_fields
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# What the dashboard page actually renders from each section
+PROJECTIONS = {
+    'courses': 'course_code,course_name,teacher_name,attendance_percentage',
+    'attendance': 'date,status,course_code',
+    'grades': 'course_code,exam_type,grade,marks,max_marks',
+    'assignments': 'title,course_code,due_date,submission_status',
+    'notifications': 'title,message,is_read,created_at',
+}
+
+
+def stdlib_dumps(payload):
+    """What jsonify() does with the default Flask settings"""
+    return json.dumps(payload, sort_keys=True, separators=(',', ':'), default=str).encode()
+
+
+def fast_dumps(payload):
+    """What the student endpoints do now"""
+    if orjson is not None:
+        return orjson.dumps(payload, default=str, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(payload, separators=(',', ':'), default=str).encode()
+
+
+def sample_students(conn, count, seed):
+    rows = conn.execute('SELECT id, user_id FROM students ORDER BY id').fetchall()
+    return random.Random(seed).sample(rows, min(count, len(rows)))
+
+
+def timed(fn, repeat):
+    """Best-of-repeat CPU seconds of fn(), and its last result"""
+    best = None
+    result = None
+    for _ in range(repeat):
+        started = time.process_time()
+        result = fn()
+        elapsed = time.process_time() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def bench_section(conn, name, students, repeat):
+    reader = SECTIONS[name]
+    fields = parse_fields(PROJECTIONS[name], name).get(name)
+
+    query_time, payloads = timed(
+        lambda: [reader(conn, sid, uid) for sid, uid in students], repeat)
+    projected_time, projected = timed(
+        lambda: [reader(conn, sid, uid, fields=fields) for sid, uid in students], repeat)
+    stdlib_time, stdlib_bodies = timed(lambda: [stdlib_dumps(p) for p in payloads], repeat)
+    fast_time, fast_bodies = timed(lambda: [fast_dumps(p) for p in payloads], repeat)
+    _, projected_bodies = timed(lambda: [fast_dumps(p) for p in projected], 1)
+
+    count = len(students)
+    return {
+        'section': name,
+        'query_ms': 1000 * query_time / count,
+        'projected_query_ms': 1000 * projected_time / count,
+        'stdlib_ms': 1000 * stdlib_time / count,
+        'fast_ms': 1000 * fast_time / count,
+        'stdlib_bytes': sum(map(len, stdlib_bodies)) / count,
+        'fast_bytes': sum(map(len, fast_bodies)) / count,
+        'projected_bytes': sum(map(len, projected_bodies)) / count,
+    }
+
+
+def print_report(results):
+    print(f"{'section':<14}{'query ms':>10}{'proj. q ms':>12}{'json ms':>10}{'fast ms':>10}"
+          f"{'speedup':>9}{'bytes':>10}{'proj. bytes':>13}")
+    for r in results:
+        speedup = r['stdlib_ms'] / r['fast_ms'] if r['fast_ms'] else float('inf')
+        print(f"{r['section']:<14}{r['query_ms']:>10.3f}{r['projected_query_ms']:>12.3f}"
+              f"{r['stdlib_ms']:>10.3f}{r['fast_ms']:>10.3f}{speedup:>8.1f}x"
+              f"{r['stdlib_bytes']:>10.0f}{r['projected_bytes']:>13.0f}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark JSON serialization of the student API')
+    parser.add_argument('--db', required=True, help='scale database to read from')
+    parser.add_argument('--students', type=int, default=200, help='students sampled per section')
+    parser.add_argument('--repeat', type=int, default=3, help='runs per measurement; the best is kept')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help='write results as JSON')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    conn = sqlite3.connect(args.db)
+    conn.row_factory = sqlite3.Row
+    students = [(row['id'], row['user_id']) for row in sample_students(conn, args.students, args.seed)]
+    encoder = 'orjson' if orjson is not None else 'compact stdlib json (orjson not installed)'
+    print(f"🧪 JSON benchmark: {len(students)} students, fast path uses {encoder}")
+
+    results = [bench_section(conn, name, students, args.repeat) for name in PROJECTIONS]
+    conn.close()
+    print_report(results)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"💾 Results written to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,355 @@
+"""
+Morning attendance rush
+Hundreds of students log in, open their dashboard, mark face attendance
+and poll notifications while teachers submit attendance for their courses
+
+Usage:
+    python -m database.scale_data --db database/scale.db --students 10000
+    python -m loadtest.rush --db database/scale.db --students 300 --teachers 20 --output rush.json
+    python -m loadtest.rush --db database/scale.db --baseline rush.json
+
+The server is started from loadtest.server in a subprocess unless --url
+points at one already running. Users are sampled from the database with a
+fixed seed, so a run is repeatable. The exit status is 1 when a threshold
+or the baseline comparison fails.
+"""
+
+import argparse
+import http.cookiejar
+import json
+import random
+import socket
+import sqlite3
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from datetime import date
+
+import numpy as np
+
+
+class _NoRedirect(urllib.request.HTTPRedirectHandler):
+    """Report redirects as responses so login is timed on its own"""
+
+    def redirect_request(self, *args, **kwargs):
+        return None
+
+
+class Recorder:
+    """Latency samples per route, shared by all virtual users"""
+
+    def __init__(self):
+        self.samples = {}
+        self.lock_errors = 0
+        self._lock = threading.Lock()
+
+    def add(self, route, status, seconds, body=b''):
+        ok = 0 < status < 400
+        locked = not ok and b'locked' in body
+        with self._lock:
+            self.samples.setdefault(route, []).append((seconds, ok))
+            if locked:
+                self.lock_errors += 1
+
+
+class Client:
+    """One virtual user with its own cookie jar"""
+
+    def __init__(self, base_url, recorder, timeout):
+        self.base_url = base_url.rstrip('/')
+        self.recorder = recorder
+        self.timeout = timeout
+        self.opener = urllib.request.build_opener(
+            urllib.request.HTTPCookieProcessor(http.cookiejar.CookieJar()), _NoRedirect()
+        )
+
+    def request(self, route, path, form=None, json_body=None, headers=None):
+        """
+        Send one request and record it under `route`
+
+        Returns:
+            (status, headers, body); status 0 for connection failures
+        """
+        data = None
+        headers = dict(headers or {})
+        if form is not None:
+            data = urllib.parse.urlencode(form).encode()
+            headers['Content-Type'] = 'application/x-www-form-urlencoded'
+        elif json_body is not None:
+            data = json.dumps(json_body).encode()
+            headers['Content-Type'] = 'application/json'
+        req = urllib.request.Request(self.base_url + path, data=data, headers=headers)
+        started = time.perf_counter()
+        try:
+            with self.opener.open(req, timeout=self.timeout) as response:
+                status, response_headers, body = response.status, response.headers, response.read()
+        except urllib.error.HTTPError as e:
+            status, response_headers, body = e.code, e.headers, e.read()
+        except (urllib.error.URLError, socket.timeout, ConnectionError):
+            status, response_headers, body = 0, {}, b''
+        self.recorder.add(route, status, time.perf_counter() - started, body)
+        return status, response_headers, body
+
+    def login(self, username, password, role):
+        status, _, _ = self.request('POST /login', '/login',
+                                    form={'username': username, 'password': password, 'role': role})
+        return status == 302
+
+
+# ============ SCENARIO ============
+
+def build_plan(db, students, teachers, seed):
+    """Pick users and each teacher's courses and rosters from the database"""
+    conn = sqlite3.connect(f'file:{db}?mode=ro', uri=True)
+    rng = random.Random(seed)
+    student_names = [row[0] for row in conn.execute("SELECT username FROM users WHERE role = 'student' ORDER BY id")]
+    teacher_ids = [row[0] for row in conn.execute(
+        "SELECT DISTINCT teacher_id FROM courses WHERE teacher_id IS NOT NULL ORDER BY teacher_id")]
+    plan_students = rng.sample(student_names, min(students, len(student_names)))
+    plan_teachers = []
+    for teacher_id in rng.sample(teacher_ids, min(teachers, len(teacher_ids))):
+        username = conn.execute('SELECT username FROM users WHERE id = ?', (teacher_id,)).fetchone()[0]
+        courses = {}
+        for course_id, student_id in conn.execute('''
+            SELECT c.id, e.student_id
+            FROM courses c JOIN enrollments e ON e.course_id = c.id
+            WHERE c.teacher_id = ?
+            ORDER BY c.id, e.student_id
+        ''', (teacher_id,)):
+            courses.setdefault(course_id, []).append(student_id)
+        plan_teachers.append((username, courses))
+    conn.close()
+    return plan_students, plan_teachers
+
+
+def student_session(client, username, args, rng):
+    if not client.login(username, args.password, 'student'):
+        return
+    client.request('GET /student/dashboard', '/student/dashboard')
+    status, _, body = client.request('GET /api/student/dashboard', '/api/student/dashboard')
+    courses = []
+    if status == 200:
+        courses = [course['id'] for course in json.loads(body).get('courses', {}).get('courses', [])]
+    time.sleep(rng.uniform(0, args.think))
+    if courses:
+        client.request('POST /api/student/face-attendance', '/api/student/face-attendance',
+                       json_body={'course_id': rng.choice(courses), 'confidence': round(rng.uniform(95, 99), 2)})
+    etag = None
+    for _ in range(args.polls):
+        time.sleep(args.poll_interval)
+        status, headers, _ = client.request('GET /api/student/notifications', '/api/student/notifications',
+                                            headers={'If-None-Match': etag} if etag else None)
+        etag = headers.get('ETag') or etag
+
+
+def teacher_session(client, username, courses, args, rng):
+    if not client.login(username, args.password, 'teacher'):
+        return
+    today = date.today().isoformat()
+    for course_id, roster in courses.items():
+        time.sleep(rng.uniform(0, args.think))
+        client.request('POST /api/mark-attendance', '/api/mark-attendance', json_body={
+            'course_id': course_id,
+            'date': today,
+            'attendance': [{'student_id': student_id, 'status': 'present' if rng.random() < 0.85 else 'absent'}
+                           for student_id in roster],
+        })
+
+
+# ============ SERVER AND METRICS ============
+
+def start_server(db, port):
+    process = subprocess.Popen([sys.executable, '-m', 'loadtest.server', '--db', db, '--port', str(port)])
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise SystemExit('❌ Load test server exited during startup')
+        try:
+            urllib.request.urlopen(f'http://127.0.0.1:{port}/login', timeout=1).close()
+            return process
+        except (urllib.error.URLError, ConnectionError, socket.timeout):
+            time.sleep(0.2)
+    process.terminate()
+    raise SystemExit('❌ Load test server did not start within 60s')
+
+
+def sqlite_counters(base_url, token):
+    """Lock errors and write-lock wait from the server's /metrics"""
+    headers = {'Authorization': f'Bearer {token}'} if token else {}
+    try:
+        with urllib.request.urlopen(urllib.request.Request(base_url + '/metrics', headers=headers), timeout=10) as r:
+            text = r.read().decode()
+    except (urllib.error.URLError, ConnectionError, socket.timeout):
+        return None
+    counters = {'lock_errors': 0.0, 'lock_wait_seconds': 0.0, 'lock_waits': 0.0}
+    names = {
+        'saarthi_sqlite_lock_errors_total': 'lock_errors',
+        'saarthi_sqlite_lock_wait_seconds_sum': 'lock_wait_seconds',
+        'saarthi_sqlite_lock_wait_seconds_count': 'lock_waits',
+    }
+    for line in text.splitlines():
+        name = line.split('{', 1)[0].split(' ', 1)[0]
+        if name in names:
+            counters[names[name]] += float(line.rsplit(' ', 1)[1])
+    return counters
+
+
+# ============ REPORT ============
+
+def summarize(recorder, duration):
+    routes = {}
+    for route, samples in sorted(recorder.samples.items()):
+        seconds = np.array([s for s, _ in samples]) * 1000
+        errors = sum(1 for _, ok in samples if not ok)
+        p50, p95, p99 = np.percentile(seconds, [50, 95, 99])
+        routes[route] = {
+            'requests': len(samples),
+            'errors': errors,
+            'rps': round(len(samples) / duration, 2),
+            'p50_ms': round(float(p50), 1),
+            'p95_ms': round(float(p95), 1),
+            'p99_ms': round(float(p99), 1),
+            'max_ms': round(float(seconds.max()), 1),
+        }
+    return routes
+
+
+def check(result, args):
+    """Threshold and baseline failures, as messages"""
+    failures = []
+    total = sum(r['requests'] for r in result['routes'].values())
+    errors = sum(r['errors'] for r in result['routes'].values())
+    if total and errors / total > args.max_error_rate:
+        failures.append(f'error rate {errors / total:.2%} above {args.max_error_rate:.2%}')
+    if result['lock_errors'] > args.max_lock_errors:
+        failures.append(f"{result['lock_errors']} SQLite lock errors (allowed {args.max_lock_errors})")
+    for limit in args.max_p99:
+        route, _, ms = limit.rpartition('=')
+        stats = result['routes'].get(route)
+        if stats and stats['p99_ms'] > float(ms):
+            failures.append(f"{route} p99 {stats['p99_ms']}ms above {ms}ms")
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        for route, stats in result['routes'].items():
+            before = baseline.get('routes', {}).get(route)
+            # A few milliseconds of jitter on fast routes is not a regression
+            if before and stats['p99_ms'] > max(before['p99_ms'] * (1 + args.tolerance), before['p99_ms'] + 5):
+                failures.append(f"{route} p99 {stats['p99_ms']}ms regressed from {before['p99_ms']}ms")
+        if result['throughput'] < baseline.get('throughput', 0) * (1 - args.tolerance):
+            failures.append(f"throughput {result['throughput']} req/s regressed from {baseline['throughput']}")
+    return failures
+
+
+def print_report(result):
+    print(f"\n{'route':<36} {'reqs':>7} {'err':>5} {'rps':>7} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8}")
+    for route, r in result['routes'].items():
+        print(f"{route:<36} {r['requests']:>7} {r['errors']:>5} {r['rps']:>7} "
+              f"{r['p50_ms']:>7}ms {r['p95_ms']:>7}ms {r['p99_ms']:>7}ms {r['max_ms']:>7}ms")
+    print(f"\n📈 {result['throughput']} req/s over {result['duration']}s")
+    print(f"🔒 SQLite lock errors: {result['lock_errors']}", end='')
+    if result.get('lock_wait_seconds') is not None:
+        print(f", write-lock wait {result['lock_wait_seconds']}s over {result['lock_waits']} batches")
+    else:
+        print()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Simulate the morning attendance rush')
+    parser.add_argument('--db', required=True, help='scale database; users are sampled from it')
+    parser.add_argument('--url', help='running server to test (default: start loadtest.server)')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--students', type=int, default=300)
+    parser.add_argument('--teachers', type=int, default=20)
+    parser.add_argument('--password', default='student123', help='password of the generated accounts')
+    parser.add_argument('--ramp', type=float, default=10.0, help='seconds over which users arrive')
+    parser.add_argument('--think', type=float, default=1.0, help='maximum pause between steps')
+    parser.add_argument('--polls', type=int, default=5, help='notification polls per student')
+    parser.add_argument('--poll-interval', type=float, default=2.0)
+    parser.add_argument('--timeout', type=float, default=30.0, help='per-request timeout')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--metrics-token', help='METRICS_TOKEN of the server under test')
+    parser.add_argument('--output', help='write results as JSON (usable as a later --baseline)')
+    parser.add_argument('--baseline', help='results JSON of an earlier run to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='allowed p99 / throughput regression')
+    parser.add_argument('--max-error-rate', type=float, default=0.01)
+    parser.add_argument('--max-lock-errors', type=int, default=0)
+    parser.add_argument('--max-p99', action='append', default=[], metavar='ROUTE=MS',
+                        help="e.g. 'GET /api/student/dashboard=250'; repeatable")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    students, teachers = build_plan(args.db, args.students, args.teachers, args.seed)
+    print(f"🏫 Morning rush: {len(students)} students, {len(teachers)} teachers, ramp {args.ramp}s")
+
+    server = None
+    base_url = args.url
+    if not base_url:
+        server = start_server(args.db, args.port)
+        base_url = f'http://127.0.0.1:{args.port}'
+
+    try:
+        before = sqlite_counters(base_url, args.metrics_token)
+        recorder = Recorder()
+        users = [('student', name, None) for name in students] + [('teacher', name, courses) for name, courses in teachers]
+        random.Random(args.seed).shuffle(users)
+
+        def run_user(index, role, username, courses):
+            rng = random.Random(f'{args.seed}-{username}')
+            time.sleep(args.ramp * index / max(1, len(users)))
+            client = Client(base_url, recorder, args.timeout)
+            if role == 'student':
+                student_session(client, username, args, rng)
+            else:
+                teacher_session(client, username, courses, args, rng)
+
+        threads = [threading.Thread(target=run_user, args=(i, *user), daemon=True) for i, user in enumerate(users)]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        duration = time.perf_counter() - started
+        after = sqlite_counters(base_url, args.metrics_token)
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    routes = summarize(recorder, duration)
+    result = {
+        'config': {k: v for k, v in vars(args).items() if k not in ('baseline', 'output', 'metrics_token')},
+        'duration': round(duration, 2),
+        'throughput': round(sum(r['requests'] for r in routes.values()) / duration, 2),
+        'routes': routes,
+        'lock_errors': recorder.lock_errors,
+        'lock_wait_seconds': None,
+        'lock_waits': None,
+    }
+    if before is not None and after is not None:
+        result['lock_errors'] = max(recorder.lock_errors, int(after['lock_errors'] - before['lock_errors']))
+        result['lock_wait_seconds'] = round(after['lock_wait_seconds'] - before['lock_wait_seconds'], 3)
+        result['lock_waits'] = int(after['lock_waits'] - before['lock_waits'])
+
+    print_report(result)
+    failures = check(result, args)
+    result['failures'] = failures
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(result, f, indent=2)
+        print(f"📄 Results written to {args.output}")
+    if failures:
+        for failure in failures:
+            print(f"❌ {failure}")
+        sys.exit(1)
+    print("✅ All thresholds met")
+
+
+if __name__ == '__main__':
+    main()
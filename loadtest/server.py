@@ -0,0 +1,38 @@
+"""
+Test server for load runs
+Serves the app against a given database with Werkzeug's threaded server
+
+Usage:
+    python -m loadtest.server --db database/scale.db --port 8765
+"""
+
+import argparse
+import logging
+import os
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Serve SaarthiAI against a database for load testing')
+    parser.add_argument('--db', required=True)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.db):
+        raise SystemExit(f"❌ {args.db} not found (generate one with python -m database.scale_data)")
+    # app reads its configuration at import time
+    os.environ['DATABASE_PATH'] = args.db
+
+    from werkzeug.serving import make_server
+
+    from app import app
+
+    # One access-log line per request would dominate the run
+    logging.getLogger('werkzeug').setLevel(logging.WARNING)
+    server = make_server(args.host, args.port, app, threaded=True)
+    print(f"🚀 Load test server on http://{args.host}:{args.port} ({args.db})", flush=True)
+    server.serve_forever()
+
+
+if __name__ == '__main__':
+    main()
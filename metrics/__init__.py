@@ -0,0 +1,16 @@
+"""
+Metrics module for SaarthiAI
+Prometheus-style counters and latency histograms
+"""
+
+from .instruments import (
+    AI_CACHE_REQUESTS, AI_COALESCED, FACE_STAGE, GEMINI_ERRORS, GEMINI_LATENCY, HTTP_LATENCY, HTTP_REQUESTS,
+    SMTP_ERRORS, SMTP_SEND, SQLITE_LOCK_ERRORS, SQLITE_LOCK_WAIT,
+)
+from .registry import REGISTRY, Counter, Histogram, Registry, track
+
+__all__ = [
+    'REGISTRY', 'Counter', 'Histogram', 'Registry', 'track',
+    'AI_CACHE_REQUESTS', 'AI_COALESCED', 'FACE_STAGE', 'GEMINI_ERRORS', 'GEMINI_LATENCY', 'HTTP_LATENCY', 'HTTP_REQUESTS',
+    'SMTP_ERRORS', 'SMTP_SEND', 'SQLITE_LOCK_ERRORS', 'SQLITE_LOCK_WAIT',
+]
\ No newline at end of file
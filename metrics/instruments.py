@@ -0,0 +1,43 @@
+"""
+Metric families recorded by SaarthiAI
+"""
+
+from .registry import REGISTRY
+
+HTTP_REQUESTS = REGISTRY.counter(
+    'saarthi_http_requests_total', 'HTTP requests by route, method and status',
+    ('route', 'method', 'status'))
+HTTP_LATENCY = REGISTRY.histogram(
+    'saarthi_http_request_duration_seconds', 'Time spent in the request handler',
+    ('route', 'method'))
+
+SQLITE_LOCK_WAIT = REGISTRY.histogram(
+    'saarthi_sqlite_lock_wait_seconds', 'Time spent waiting for the SQLite write lock',
+    ('source',), buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 20.0))
+SQLITE_LOCK_ERRORS = REGISTRY.counter(
+    'saarthi_sqlite_lock_errors_total', 'Writes that failed with "database is locked"',
+    ('source',))
+
+GEMINI_LATENCY = REGISTRY.histogram(
+    'saarthi_gemini_request_duration_seconds', 'Gemini generate_content latency',
+    ('operation',), buckets=(0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 16.0, 32.0, 64.0))
+GEMINI_ERRORS = REGISTRY.counter(
+    'saarthi_gemini_errors_total', 'Gemini calls that raised',
+    ('operation',))
+AI_CACHE_REQUESTS = REGISTRY.counter(
+    'saarthi_ai_cache_requests_total', 'AI response cache lookups by operation and hit/miss',
+    ('operation', 'result'))
+AI_COALESCED = REGISTRY.counter(
+    'saarthi_ai_coalesced_requests_total', 'AI requests that waited on an identical in-flight call',
+    ('operation', 'result'))
+
+SMTP_SEND = REGISTRY.histogram(
+    'saarthi_smtp_send_duration_seconds', 'Time to connect, authenticate and send one email',
+    ('email_type',), buckets=(0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0))
+SMTP_ERRORS = REGISTRY.counter(
+    'saarthi_smtp_errors_total', 'Emails that failed to send',
+    ('email_type',))
+
+FACE_STAGE = REGISTRY.histogram(
+    'saarthi_face_recognition_stage_seconds', 'Face recognition time per pipeline stage',
+    ('stage',), buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0))
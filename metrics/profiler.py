@@ -0,0 +1,143 @@
+"""
+Sampling profiler for SaarthiAI
+Samples the stacks of selected request threads from one background thread
+and saves them as collapsed stacks (flamegraph.pl / speedscope input)
+"""
+
+import collections
+import json
+import os
+import re
+import sys
+import threading
+import time
+
+
+class Profile:
+    """Stack samples collected for one request thread"""
+
+    def __init__(self, label, thread_id):
+        self.label = label
+        self.thread_id = thread_id
+        self.started = time.time()
+        self.stacks = collections.Counter()
+        self.samples = 0
+
+
+class SamplingProfiler:
+    """Periodically snapshots the stacks of registered threads"""
+
+    def __init__(self, directory, interval=0.005, keep=100):
+        """
+        Args:
+            directory: where finished profiles are written
+            interval: seconds between samples
+            keep: number of profiles kept on disk; older ones are deleted
+        """
+        self.directory = directory
+        self.interval = interval
+        self.keep = keep
+        self._active = {}
+        self._names = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        self._pid = None
+
+    def start(self, label):
+        """Begin sampling the calling thread"""
+        profile = Profile(label, threading.get_ident())
+        with self._lock:
+            if self._thread is None or self._pid != os.getpid():
+                self._pid = os.getpid()
+                self._thread = threading.Thread(target=self._run, name='stack-sampler', daemon=True)
+                self._thread.start()
+            self._active[profile.thread_id] = profile
+            self._wake.set()
+        return profile
+
+    def stop(self, profile, **metadata):
+        """
+        Stop sampling and save the profile
+
+        Returns:
+            File name of the saved profile, or None if no sample was taken
+        """
+        with self._lock:
+            self._active.pop(profile.thread_id, None)
+        if not profile.samples:
+            return None
+        return self._save(profile, metadata)
+
+    def _run(self):
+        while True:
+            self._wake.wait()
+            with self._lock:
+                if not self._active:
+                    self._wake.clear()
+                    continue
+                frames = sys._current_frames()
+                for thread_id, profile in self._active.items():
+                    frame = frames.get(thread_id)
+                    if frame is not None:
+                        profile.stacks[self._collapse(frame)] += 1
+                        profile.samples += 1
+                del frames
+            time.sleep(self.interval)
+
+    def _collapse(self, frame):
+        names = []
+        while frame is not None:
+            code = frame.f_code
+            name = self._names.get(code)
+            if name is None:
+                path = code.co_filename.replace(os.sep, '/').rsplit('/', 2)
+                name = self._names[code] = (
+                    f"{code.co_name} ({'/'.join(path[-2:])}:{code.co_firstlineno})".replace(';', ':')
+                )
+            names.append(name)
+            frame = frame.f_back
+        return ';'.join(reversed(names))
+
+    def _save(self, profile, metadata):
+        os.makedirs(self.directory, exist_ok=True)
+        slug = re.sub(r'[^A-Za-z0-9]+', '-', profile.label).strip('-')[:60] or 'request'
+        name = f"{time.strftime('%Y%m%d-%H%M%S', time.localtime(profile.started))}-{slug}-{os.urandom(3).hex()}"
+        with open(os.path.join(self.directory, name + '.folded'), 'w') as f:
+            for stack, count in profile.stacks.most_common():
+                f.write(f'{stack} {count}\n')
+        with open(os.path.join(self.directory, name + '.json'), 'w') as f:
+            json.dump({
+                'name': name + '.folded',
+                'label': profile.label,
+                'started': profile.started,
+                'duration': round(time.time() - profile.started, 4),
+                'samples': profile.samples,
+                'interval': self.interval,
+                **metadata,
+            }, f)
+        self._prune()
+        return name + '.folded'
+
+    def _prune(self):
+        saved = sorted(f for f in os.listdir(self.directory) if f.endswith('.json'))
+        for old in saved[:-self.keep] if self.keep else ():
+            for extension in ('.json', '.folded'):
+                try:
+                    os.remove(os.path.join(self.directory, old[:-5] + extension))
+                except FileNotFoundError:
+                    pass
+
+    def list_profiles(self):
+        """Metadata of saved profiles, newest first"""
+        if not os.path.isdir(self.directory):
+            return []
+        profiles = []
+        for file in sorted(os.listdir(self.directory), reverse=True):
+            if file.endswith('.json'):
+                try:
+                    with open(os.path.join(self.directory, file)) as f:
+                        profiles.append(json.load(f))
+                except (OSError, ValueError):
+                    continue
+        return profiles
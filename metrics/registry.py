@@ -0,0 +1,267 @@
+"""
+Metric registry for SaarthiAI
+Counters and histograms rendered in the Prometheus text format, with
+optional per-process snapshot files for multi-process servers
+"""
+
+import atexit
+import bisect
+import glob
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(names, values, extra=()):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    pairs += [f'{name}="{value}"' for name, value in extra]
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Family:
+    """A named metric with a fixed set of label names"""
+
+    kind = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children = {}
+        # One short critical section per update; nothing slow happens under it
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        return tuple(str(labels.get(name, '')) for name in self.labelnames)
+
+    def snapshot(self):
+        with self._lock:
+            return {key: self._copy(value) for key, value in self._children.items()}
+
+    def reset(self):
+        with self._lock:
+            self._children.clear()
+
+
+class Counter(_Family):
+    """Monotonic count; by convention the name ends in _total"""
+
+    kind = 'counter'
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._children[key] = self._children.get(key, 0) + amount
+
+    @staticmethod
+    def _copy(value):
+        return value
+
+    @staticmethod
+    def merge(a, b):
+        return a + b
+
+    def render(self, samples):
+        for key, value in sorted(samples.items()):
+            yield f'{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}'
+
+
+class Histogram(_Family):
+    """Distribution of observed values in fixed buckets, plus sum and count"""
+
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            child = self._children.get(key)
+            if child is None:
+                # Per-bucket (not cumulative) counts, then +Inf, sum and count
+                child = self._children[key] = [0] * (len(self.buckets) + 1) + [0.0, 0]
+            child[index] += 1
+            child[-2] += value
+            child[-1] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe the duration of a with-block in seconds, even if it raises"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    @staticmethod
+    def _copy(value):
+        return list(value)
+
+    @staticmethod
+    def merge(a, b):
+        return [x + y for x, y in zip(a, b)]
+
+    def render(self, samples):
+        bounds = self.buckets + (float('inf'),)
+        for key, child in sorted(samples.items()):
+            cumulative = 0
+            for bound, count in zip(bounds, child):
+                cumulative += count
+                labels = _format_labels(self.labelnames, key, [('le', _format_value(bound))])
+                yield f'{self.name}_bucket{labels} {cumulative}'
+            labels = _format_labels(self.labelnames, key)
+            yield f'{self.name}_sum{labels} {_format_value(child[-2])}'
+            yield f'{self.name}_count{labels} {child[-1]}'
+
+
+@contextmanager
+def track(histogram, errors, **labels):
+    """Time a with-block into `histogram` and count it in `errors` if it raises"""
+    try:
+        with histogram.time(**labels):
+            yield
+    except Exception:
+        errors.inc(**labels)
+        raise
+
+
+class Registry:
+    """All metric families of a process"""
+
+    def __init__(self):
+        self._families = {}
+        self._directory = None
+        self._interval = None
+        self._path = None
+        self._flusher = None
+        self._lock = threading.Lock()
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self._after_fork)
+
+    def register(self, family):
+        if family.name in self._families:
+            raise ValueError(f'Metric already registered: {family.name}')
+        self._families[family.name] = family
+        return family
+
+    def counter(self, name, documentation, labelnames=()):
+        return self.register(Counter(name, documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    # ============ MULTI-PROCESS ============
+
+    def enable_multiprocess(self, directory, interval=5.0):
+        """
+        Share metrics between the worker processes of one server
+
+        Each process writes a snapshot of its values to its own file in
+        `directory` every `interval` seconds and at exit; a scrape of any
+        worker adds up every file. Files of exited workers are kept so
+        counters do not go backwards, so clear the directory when the
+        server is restarted.
+        """
+        if self._directory is not None:
+            return
+        os.makedirs(directory, exist_ok=True)
+        self._directory = directory
+        self._interval = interval
+        self._start_flusher()
+        atexit.register(self.flush)
+
+    def _start_flusher(self):
+        self._path = os.path.join(self._directory, f'metrics-{os.getpid()}-{os.urandom(4).hex()}.json')
+        self._flusher = threading.Thread(target=self._flush_loop, name='metrics-flush', daemon=True)
+        self._flusher.start()
+
+    def _after_fork(self):
+        # A forked worker starts from zero; the parent's values are in the
+        # parent's own file and must not be counted twice
+        self._lock = threading.Lock()
+        for family in self._families.values():
+            family._lock = threading.Lock()
+            family._children.clear()
+        if self._directory is not None:
+            self._start_flusher()
+
+    def _flush_loop(self):
+        while True:
+            time.sleep(self._interval)
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"❌ Metrics flush failed: {e}")
+
+    def flush(self):
+        """Write this process's snapshot file (multi-process mode only)"""
+        if self._directory is None:
+            return
+        data = {
+            name: {json.dumps(key): value for key, value in samples.items()}
+            for name, samples in self._snapshot().items()
+        }
+        with self._lock:
+            temporary = self._path + '.tmp'
+            with open(temporary, 'w') as f:
+                json.dump(data, f)
+            os.replace(temporary, self._path)
+
+    def _snapshot(self):
+        return {name: family.snapshot() for name, family in self._families.items()}
+
+    def _collect(self):
+        merged = self._snapshot()
+        if self._directory is None:
+            return merged
+        for path in glob.glob(os.path.join(self._directory, 'metrics-*.json')):
+            if path == self._path:
+                continue
+            try:
+                with open(path) as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                continue
+            for name, samples in data.items():
+                family = self._families.get(name)
+                if family is None:
+                    continue
+                target = merged[name]
+                for key, value in samples.items():
+                    key = tuple(json.loads(key))
+                    target[key] = family.merge(target[key], value) if key in target else value
+        return merged
+
+    # ============ EXPOSITION ============
+
+    def render(self):
+        """All metrics in the Prometheus text exposition format"""
+        lines = []
+        for name, samples in self._collect().items():
+            family = self._families[name]
+            lines.append(f'# HELP {name} {family.documentation}')
+            lines.append(f'# TYPE {name} {family.kind}')
+            lines.extend(family.render(samples))
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = Registry()
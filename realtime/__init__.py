@@ -0,0 +1,8 @@
+"""
+Realtime module for SaarthiAI
+In-process publish/subscribe feeding Server-Sent Events
+"""
+
+from .broker import EventBroker
+
+__all__ = ['EventBroker']
\ No newline at end of file
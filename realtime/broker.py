@@ -0,0 +1,234 @@
+"""
+Event broker for SaarthiAI
+Write paths publish events to named channels; each SSE connection holds a
+bounded buffer and can resume from the last event id it saw
+"""
+
+import collections
+import glob
+import itertools
+import json
+import os
+import queue
+import socket
+import threading
+
+
+class Subscription:
+    """One connection's view of the broker"""
+
+    def __init__(self, channels, buffer_size):
+        self.channels = frozenset(channels)
+        self.queue = queue.Queue(maxsize=buffer_size)
+        self.overflowed = False
+
+    def deliver(self, event):
+        try:
+            self.queue.put_nowait(event)
+        except queue.Full:
+            # A slow client must not hold memory or stall publishers; it gets
+            # a resync and catches up from history when it reconnects
+            self.overflowed = True
+
+
+def format_event(event_id, event, data):
+    """One SSE frame"""
+    return f'id: {event_id}\nevent: {event}\ndata: {json.dumps(data, default=str)}\n\n'
+
+
+class EventBroker:
+    """In-process pub/sub with a replay window for reconnecting clients"""
+
+    def __init__(self, history=500, buffer_size=100):
+        """
+        Args:
+            history: events kept for Last-Event-ID replay
+            buffer_size: events buffered per connection before it is dropped
+        """
+        self.buffer_size = buffer_size
+        # Event ids carry a per-process epoch, so an id from before a restart
+        # is recognised as foreign instead of being compared with new ids
+        self.epoch = os.urandom(4).hex()
+        self._ids = itertools.count(1)
+        self._last = 0
+        self._history = collections.deque(maxlen=history)
+        self._subscribers = collections.defaultdict(set)
+        self._lock = threading.Lock()
+        self._relay_dir = None
+        self._relay_pid = None
+        self._receiver = None
+        self._sender = None
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self._after_fork)
+
+    def _after_fork(self):
+        # A forked worker numbers its own events, so it needs its own epoch;
+        # otherwise a client reconnecting to a sibling worker would pass the
+        # epoch check and be replayed the wrong events instead of a resync
+        self._lock = threading.Lock()
+        self.epoch = os.urandom(4).hex()
+        self._ids = itertools.count(1)
+        self._last = 0
+        self._history.clear()
+        self._subscribers.clear()
+
+    def latest_id(self):
+        return f'{self.epoch}-{self._last}'
+
+    # ============ MULTI-PROCESS ============
+
+    def enable_relay(self, directory):
+        """
+        Share events between the worker processes of one server
+
+        Each process that has subscribers binds a Unix datagram socket in
+        `directory`, and publish() also sends the event to every other
+        socket there. Event ids stay per process, so a client that
+        reconnects to a different worker gets a resync.
+        """
+        os.makedirs(directory, exist_ok=True)
+        self._relay_dir = directory
+
+    def _ensure_relay(self):
+        # Sockets are opened lazily, and again in a forked child
+        if self._relay_dir is None or self._relay_pid == os.getpid():
+            return
+        with self._lock:
+            if self._relay_pid == os.getpid():
+                return
+            self._sender = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+            # A worker whose buffer is full misses the event rather than
+            # stalling the publisher
+            self._sender.setblocking(False)
+            self._receiver = None
+            self._relay_pid = os.getpid()
+
+    def _ensure_receiver(self):
+        self._ensure_relay()
+        if self._relay_dir is None or self._receiver is not None:
+            return
+        with self._lock:
+            if self._receiver is not None:
+                return
+            path = os.path.join(self._relay_dir, f'events-{os.getpid()}.sock')
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            receiver = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+            receiver.bind(path)
+            self._receiver = receiver
+            threading.Thread(target=self._receive, args=(receiver,), name='event-relay', daemon=True).start()
+
+    def _receive(self, receiver):
+        while True:
+            try:
+                channel, event, data = json.loads(receiver.recv(65536))
+            except (OSError, ValueError) as e:
+                print(f"❌ Event relay receive failed: {e}")
+                continue
+            self._publish_local(channel, event, data)
+
+    def _forward(self, channel, event, data):
+        message = json.dumps([channel, event, data], default=str).encode()
+        own = os.path.join(self._relay_dir, f'events-{os.getpid()}.sock')
+        for path in glob.glob(os.path.join(self._relay_dir, 'events-*.sock')):
+            if path == own:
+                continue
+            try:
+                self._sender.sendto(message, path)
+            except (ConnectionRefusedError, FileNotFoundError):
+                # The worker that bound it has exited
+                try:
+                    os.unlink(path)
+                except FileNotFoundError:
+                    pass
+            except OSError:
+                continue
+
+    # ============ PUBLISH / SUBSCRIBE ============
+
+    def publish(self, channel, event, data):
+        """Send an event to every subscriber of a channel; safe from any thread"""
+        self._publish_local(channel, event, data)
+        if self._relay_dir is not None:
+            self._ensure_relay()
+            self._forward(channel, event, data)
+
+    def _publish_local(self, channel, event, data):
+        with self._lock:
+            self._last = next(self._ids)
+            item = (self._last, channel, f'{self.epoch}-{self._last}', event, data)
+            self._history.append(item)
+            subscribers = list(self._subscribers.get(channel, ()))
+        for subscription in subscribers:
+            subscription.deliver(item[2:])
+
+    def subscribe(self, channels, last_event_id=None):
+        """
+        Register a connection and work out what it missed
+
+        Args:
+            channels: channel names to receive
+            last_event_id: Last-Event-ID header from a reconnecting client
+
+        Returns:
+            (Subscription, replay events). When the missed events are no longer
+            in history, replay is a single resync event telling the client to
+            reload its data.
+        """
+        self._ensure_receiver()
+        subscription = Subscription(channels, self.buffer_size)
+        with self._lock:
+            for channel in subscription.channels:
+                self._subscribers[channel].add(subscription)
+            replay = self._replay(subscription.channels, last_event_id)
+        return subscription, replay
+
+    def stream(self, channels, last_event_id=None, heartbeat=15):
+        """
+        Yield SSE frames for a connection until it overflows or goes away
+
+        The subscription is registered when iteration starts and removed when
+        the generator is closed, so a client that disconnects before the
+        first byte never leaves a subscriber behind.
+
+        Args:
+            channels: channel names to receive
+            last_event_id: Last-Event-ID header from a reconnecting client
+            heartbeat: seconds of silence before a keep-alive comment
+        """
+        subscription, replay = self.subscribe(channels, last_event_id)
+        try:
+            yield f'retry: {int(heartbeat * 1000 / 3)}\n\n'
+            for event in replay:
+                yield format_event(*event)
+            while not subscription.overflowed:
+                try:
+                    event = subscription.queue.get(timeout=heartbeat)
+                except queue.Empty:
+                    yield ': heartbeat\n\n'
+                    continue
+                yield format_event(*event)
+            yield format_event(self.latest_id(), 'resync', {'reason': 'buffer_overflow'})
+        finally:
+            self.unsubscribe(subscription)
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            for channel in subscription.channels:
+                subscribers = self._subscribers.get(channel)
+                if subscribers is not None:
+                    subscribers.discard(subscription)
+                    if not subscribers:
+                        del self._subscribers[channel]
+
+    def _replay(self, channels, last_event_id):
+        if not last_event_id:
+            return []
+        epoch, _, seq = last_event_id.partition('-')
+        oldest = self._history[0][0] if self._history else self._last + 1
+        if epoch != self.epoch or not seq.isdigit() or int(seq) + 1 < oldest:
+            return [(self.latest_id(), 'resync', {'reason': 'history_gap'})]
+        seq = int(seq)
+        return [item[2:] for item in self._history if item[0] > seq and item[1] in channels]
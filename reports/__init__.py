@@ -0,0 +1,8 @@
+"""
+Reports module for SaarthiAI
+Attendance reports and streaming CSV / NDJSON / XLSX writers
+"""
+
+from .streaming import gzip_stream, stream_csv, stream_ndjson, stream_xlsx
+
+__all__ = ['gzip_stream', 'stream_csv', 'stream_ndjson', 'stream_xlsx']
\ No newline at end of file
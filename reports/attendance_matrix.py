@@ -0,0 +1,164 @@
+"""
+Course attendance matrix for SaarthiAI
+Pivots one course's attendance into a student x date status matrix with
+NumPy and derives per-student and per-date rates from it
+"""
+
+import numpy as np
+
+# Matrix cell codes; -1 means no record for that student on that date
+UNMARKED = -1
+STATUS_CODES = {'absent': 0, 'present': 1, 'late': 2, 'excused': 3}
+STATUS_LABELS = np.array(['', 'A', 'P', 'L', 'E'])
+
+
+def _rates(present, marked):
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rates = np.round(present * 100.0 / marked, 1)
+    return [None if np.isnan(rate) else float(rate) for rate in rates]
+
+
+def build_attendance_matrix(conn, course_id, start=None, end=None):
+    """
+    Dense attendance matrix for one course
+
+    The roster is everyone enrolled plus anyone with a record in the range.
+    Attendance comes from a single query ordered by student and date, and
+    is scattered into an int8 matrix with one column per class day.
+
+    Args:
+        conn: database connection
+        course_id: courses.id
+        start, end: optional inclusive ISO date bounds
+
+    Returns:
+        Dict with course, students, dates, status (numpy int8 matrix of
+        STATUS_CODES / UNMARKED), present/marked counts and rates per
+        student and per date, or None if the course does not exist
+    """
+    course = conn.execute(
+        'SELECT id, course_code, course_name, teacher_id FROM courses WHERE id = ?',
+        (course_id,)
+    ).fetchone()
+    if course is None:
+        return None
+
+    where = ['course_id = ?']
+    params = [course_id]
+    if start:
+        where.append('date >= ?')
+        params.append(start)
+    if end:
+        where.append('date <= ?')
+        params.append(end)
+    where = ' AND '.join(where)
+
+    students = [dict(row) for row in conn.execute(f'''
+        SELECT id as student_id, student_id as student_code, first_name, last_name
+        FROM students
+        WHERE id IN (
+            SELECT student_id FROM enrollments WHERE course_id = ?
+            UNION
+            SELECT student_id FROM attendance WHERE {where}
+        )
+        ORDER BY last_name, first_name, id
+    ''', (course_id, *params))]
+
+    records = conn.execute(f'''
+        SELECT student_id, date, status
+        FROM attendance
+        WHERE {where}
+        ORDER BY student_id, date
+    ''', params).fetchall()
+
+    if records:
+        record_students = np.fromiter((r['student_id'] for r in records), dtype=np.int64, count=len(records))
+        record_dates = np.array([str(r['date'])[:10] for r in records])
+        record_codes = np.fromiter((STATUS_CODES[r['status']] for r in records), dtype=np.int8, count=len(records))
+        dates, columns = np.unique(record_dates, return_inverse=True)
+    else:
+        record_students = np.empty(0, dtype=np.int64)
+        record_codes = np.empty(0, dtype=np.int8)
+        dates, columns = np.empty(0, dtype=str), np.empty(0, dtype=np.intp)
+
+    # Map students.id to matrix rows, which follow the roster's name order
+    roster_ids = np.array([s['student_id'] for s in students], dtype=np.int64)
+    by_id = np.argsort(roster_ids)
+    rows = by_id[np.searchsorted(roster_ids[by_id], record_students)]
+
+    status = np.full((len(students), len(dates)), UNMARKED, dtype=np.int8)
+    status[rows, columns] = record_codes
+
+    marked = status != UNMARKED
+    present = status == STATUS_CODES['present']
+    student_present, student_marked = present.sum(axis=1), marked.sum(axis=1)
+    date_present, date_marked = present.sum(axis=0), marked.sum(axis=0)
+    total_present, total_marked = student_present.sum(keepdims=True), student_marked.sum(keepdims=True)
+
+    return {
+        'course': dict(course),
+        'start': start,
+        'end': end,
+        'students': students,
+        'dates': dates.tolist(),
+        'status': status,
+        'student_present': student_present.tolist(),
+        'student_marked': student_marked.tolist(),
+        'student_rates': _rates(student_present, student_marked),
+        'date_present': date_present.tolist(),
+        'date_marked': date_marked.tolist(),
+        'date_rates': _rates(date_present, date_marked),
+        'present': int(total_present[0]),
+        'marked': int(total_marked[0]),
+        'attendance_percentage': _rates(total_present, total_marked)[0],
+    }
+
+
+def matrix_header(matrix):
+    return ['Student ID', 'Name', *matrix['dates'], 'Present', 'Marked', 'Attendance %']
+
+
+def matrix_rows(matrix):
+    """
+    Table rows for CSV / XLSX export, generated one at a time
+
+    Cells are P / A / L / E (blank when unmarked); the last row holds the
+    attendance rate for each date.
+    """
+    labels = STATUS_LABELS[matrix['status'].astype(np.intp) + 1]
+    for i, student in enumerate(matrix['students']):
+        yield [
+            student['student_code'],
+            f"{student['first_name']} {student['last_name']}",
+            *labels[i].tolist(),
+            matrix['student_present'][i],
+            matrix['student_marked'][i],
+            matrix['student_rates'][i],
+        ]
+    yield ['', 'Attendance %', *matrix['date_rates'],
+           matrix['present'], matrix['marked'], matrix['attendance_percentage']]
+
+
+def matrix_json(matrix):
+    """JSON-ready form of a matrix, with status labels in place of codes"""
+    labels = STATUS_LABELS[matrix['status'].astype(np.intp) + 1]
+    return {
+        'course': matrix['course'],
+        'start': matrix['start'],
+        'end': matrix['end'],
+        'dates': matrix['dates'],
+        'date_rates': matrix['date_rates'],
+        'present': matrix['present'],
+        'marked': matrix['marked'],
+        'attendance_percentage': matrix['attendance_percentage'],
+        'students': [
+            {
+                **student,
+                'statuses': labels[i].tolist(),
+                'present': matrix['student_present'][i],
+                'marked': matrix['student_marked'][i],
+                'attendance_percentage': matrix['student_rates'][i],
+            }
+            for i, student in enumerate(matrix['students'])
+        ],
+    }
@@ -0,0 +1,83 @@
+"""
+Attendance export for SaarthiAI
+Walks the hot attendance table and every overlapping archived term with
+fetchmany, so an export of any size runs in constant memory
+"""
+
+from database.archive import existing_archives
+
+EXPORT_COLUMNS = (
+    'id', 'term', 'date', 'course_code', 'course_name', 'student_code',
+    'student_name', 'status', 'method', 'confidence', 'timestamp',
+)
+STATUSES = ('present', 'absent', 'late')
+BATCH_SIZE = 1000
+# Schema name each archived term is attached under while it is read
+EXPORT_ALIAS = 'arc_export'
+
+
+def export_attendance(conn, course_ids=None, start=None, end=None, statuses=None, batch_size=BATCH_SIZE):
+    """
+    Yield attendance rows matching the filters, oldest term first
+
+    Each archived term is attached, read and detached in turn, then the hot
+    table is read, each in id order, so no sort over the whole history is
+    needed and any number of terms stays within SQLite's attach limit. Rows
+    are pulled batch_size at a time from the cursor.
+
+    Args:
+        conn: database connection, kept open until the generator finishes
+        course_ids: restrict to these courses (None for all)
+        start, end: optional inclusive ISO date bounds
+        statuses: restrict to these statuses (None for all)
+        batch_size: rows fetched per round trip
+
+    Yields:
+        sqlite3.Row with EXPORT_COLUMNS
+    """
+    where = []
+    params = []
+    if course_ids:
+        where.append(f"a.course_id IN ({','.join('?' * len(course_ids))})")
+        params.extend(course_ids)
+    if start:
+        where.append('a.date >= ?')
+        params.append(start)
+    if end:
+        where.append('a.date <= ?')
+        params.append(end)
+    if statuses:
+        where.append(f"a.status IN ({','.join('?' * len(statuses))})")
+        params.extend(statuses)
+    where = ' AND '.join(where) or '1 = 1'
+
+    for term, path in existing_archives(conn, start, end):
+        conn.execute(f'ATTACH DATABASE ? AS {EXPORT_ALIAS}', (path,))
+        try:
+            yield from _read(conn, EXPORT_ALIAS, term, where, params, batch_size)
+        finally:
+            conn.execute(f'DETACH DATABASE {EXPORT_ALIAS}')
+    yield from _read(conn, 'main', None, where, params, batch_size)
+
+
+def _read(conn, schema, term, where, params, batch_size):
+    cursor = conn.execute(f'''
+        SELECT a.id, ? as term, a.date, c.course_code, c.course_name,
+               s.student_id as student_code,
+               s.first_name || ' ' || s.last_name as student_name,
+               a.status, a.method, a.confidence, a.timestamp
+        FROM {schema}.attendance a
+        LEFT JOIN main.courses c ON a.course_id = c.id
+        LEFT JOIN main.students s ON a.student_id = s.id
+        WHERE {where}
+        ORDER BY a.id
+    ''', (term, *params))
+    try:
+        while True:
+            batch = cursor.fetchmany(batch_size)
+            if not batch:
+                break
+            yield from batch
+    finally:
+        # An open cursor would keep the archive from being detached
+        cursor.close()
@@ -0,0 +1,202 @@
+"""
+Streaming file writers for SaarthiAI reports
+Each writer is a generator over rows that yields encoded chunks, so a Flask
+response can send a report while it is still being produced
+"""
+
+import csv
+import io
+import json
+import zipfile
+import zlib
+from xml.sax.saxutils import escape
+
+ROWS_PER_CHUNK = 500
+
+
+def stream_csv(rows, header=None, rows_per_chunk=ROWS_PER_CHUNK):
+    """
+    Yield CSV as UTF-8 bytes, a few hundred rows per chunk
+
+    Args:
+        rows: iterable of sequences
+        header: optional first row
+        rows_per_chunk: rows encoded per yielded chunk
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(header)
+    pending = 0
+    for row in rows:
+        writer.writerow(['' if value is None else value for value in row])
+        pending += 1
+        if pending >= rows_per_chunk:
+            yield buffer.getvalue().encode('utf-8')
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+    if buffer.tell():
+        yield buffer.getvalue().encode('utf-8')
+
+
+def stream_ndjson(records, rows_per_chunk=ROWS_PER_CHUNK):
+    """
+    Yield newline-delimited JSON as UTF-8 bytes
+
+    Args:
+        records: iterable of JSON-serialisable dicts
+        rows_per_chunk: records encoded per yielded chunk
+    """
+    lines = []
+    for record in records:
+        lines.append(json.dumps(record, default=str))
+        if len(lines) >= rows_per_chunk:
+            lines.append('')
+            yield '\n'.join(lines).encode('utf-8')
+            lines = []
+    if lines:
+        lines.append('')
+        yield '\n'.join(lines).encode('utf-8')
+
+
+def gzip_stream(chunks, level=6):
+    """
+    Gzip a stream of byte chunks as it is produced
+
+    Args:
+        chunks: iterable of bytes
+        level: zlib compression level
+    """
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+class _ChunkSink:
+    """Write-only file object that hands written bytes back to a generator"""
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    '</Types>'
+)
+
+_ROOT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="xl/workbook.xml"/>'
+    '</Relationships>'
+)
+
+_WORKBOOK = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheets><sheet name="{name}" sheetId="1" r:id="rId1"/></sheets>'
+    '</workbook>'
+)
+
+_WORKBOOK_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+    'Target="worksheets/sheet1.xml"/>'
+    '</Relationships>'
+)
+
+
+def _column_letter(index):
+    """0 -> A, 25 -> Z, 26 -> AA"""
+    letters = ''
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+
+def _xlsx_row(row_number, row, columns):
+    cells = []
+    for i, value in enumerate(row):
+        if value is None:
+            continue
+        while len(columns) <= i:
+            columns.append(_column_letter(len(columns)))
+        ref = f'{columns[i]}{row_number}'
+        if isinstance(value, bool):
+            cells.append(f'<c r="{ref}" t="b"><v>{int(value)}</v></c>')
+        elif isinstance(value, (int, float)):
+            cells.append(f'<c r="{ref}"><v>{value}</v></c>')
+        else:
+            cells.append(f'<c r="{ref}" t="inlineStr"><is><t>{escape(str(value))}</t></is></c>')
+    return f'<row r="{row_number}">{"".join(cells)}</row>'
+
+
+def stream_xlsx(rows, header=None, sheet_name='Sheet1', rows_per_chunk=ROWS_PER_CHUNK):
+    """
+    Yield a single-sheet XLSX workbook, written row by row
+
+    The zip is written to a non-seekable sink, so zipfile uses data
+    descriptors and nothing but the current chunk is held in memory. Strings
+    are stored inline, so there is no shared-strings table to build first.
+
+    Args:
+        rows: iterable of sequences of str / int / float / None
+        header: optional first row
+        sheet_name: worksheet name
+        rows_per_chunk: rows written between yields
+    """
+    sink = _ChunkSink()
+    columns = []
+    with zipfile.ZipFile(sink, 'w', compression=zipfile.ZIP_DEFLATED) as workbook:
+        workbook.writestr('[Content_Types].xml', _CONTENT_TYPES)
+        workbook.writestr('_rels/.rels', _ROOT_RELS)
+        workbook.writestr('xl/workbook.xml', _WORKBOOK.format(name=escape(sheet_name[:31], {'"': '&quot;'})))
+        workbook.writestr('xl/_rels/workbook.xml.rels', _WORKBOOK_RELS)
+        yield sink.drain()
+
+        with workbook.open('xl/worksheets/sheet1.xml', 'w') as sheet:
+            sheet.write(
+                b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                b'<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+            )
+            row_number = 0
+            if header:
+                row_number += 1
+                sheet.write(_xlsx_row(row_number, header, columns).encode('utf-8'))
+            for row in rows:
+                row_number += 1
+                sheet.write(_xlsx_row(row_number, row, columns).encode('utf-8'))
+                if row_number % rows_per_chunk == 0:
+                    yield sink.drain()
+            sheet.write(b'</sheetData></worksheet>')
+    yield sink.drain()
@@ -0,0 +1,370 @@
+"""
+Production server for SaarthiAI
+Loads the app once in a master process, then forks worker processes that
+accept on a shared socket and handle requests on a fixed pool of threads
+
+Usage:
+    python serve.py --port 7860 --workers 4 --threads 16
+
+Signals to the master:
+    TERM, INT   graceful shutdown: workers stop accepting, finish in-flight
+                requests (up to --graceful-timeout) and exit
+    HUP         graceful reload: the master re-executes itself on the same
+                listening socket, preloads the new code, starts new workers
+                and only then drains the old ones
+
+Liveness is /healthz and readiness is /readyz; a draining worker answers
+/readyz with 503. SSE streams (/api/events) run on a thread each rather
+than on the pool, up to --max-streams per worker; beyond that the client
+gets 503 with Retry-After, and open streams are closed when a worker
+drains, so their clients reconnect to another worker. Every worker keeps its own SQLite connections, write
+queue and caches. Data-version counters are shared through their file
+next to the database; metrics and SSE events through a per-server
+directory (see METRICS_DIR and EVENT_RELAY_DIR).
+"""
+
+import argparse
+import gc
+import logging
+import os
+import shutil
+import signal
+import socket
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+LISTEN_FD_ENV = 'SAARTHI_LISTEN_FD'
+OLD_WORKERS_ENV = 'SAARTHI_OLD_WORKERS'
+# Long-lived responses; served on their own threads instead of the pool
+STREAM_PATHS = ('/api/events',)
+STREAM_RETRY_AFTER = 5
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Serve SaarthiAI with preforked workers')
+    parser.add_argument('--host', default=os.environ.get('HOST', '0.0.0.0'))
+    parser.add_argument('--port', type=int, default=int(os.environ.get('PORT', '7860')))
+    parser.add_argument('--workers', type=int, default=int(os.environ.get('WEB_WORKERS', '0')) or os.cpu_count() or 1)
+    parser.add_argument('--threads', type=int, default=int(os.environ.get('WEB_THREADS', '16')),
+                        help='request threads per worker')
+    parser.add_argument('--max-streams', type=int, default=int(os.environ.get('MAX_STREAMS', '1000')),
+                        help='open SSE streams per worker, each on its own thread; more get 503')
+    parser.add_argument('--backlog', type=int, default=2048)
+    parser.add_argument('--keepalive', type=float, default=float(os.environ.get('KEEPALIVE_TIMEOUT', '10')),
+                        help='seconds an idle connection may hold a request thread')
+    parser.add_argument('--access-log', action='store_true', help='log every request')
+    parser.add_argument('--graceful-timeout', type=float, default=float(os.environ.get('GRACEFUL_TIMEOUT', '30')))
+    return parser.parse_args(argv)
+
+
+def shared_dirs(port):
+    """Per-server directories for metrics snapshots and the event relay"""
+    base = os.path.join(tempfile.gettempdir(), f'saarthi-{port}')
+    return {
+        'METRICS_DIR': os.path.join(base, 'metrics'),
+        'EVENT_RELAY_DIR': os.path.join(base, 'events'),
+    }
+
+
+def listen(args):
+    """The listening socket, inherited from the previous master on reload"""
+    fd = os.environ.get(LISTEN_FD_ENV)
+    if fd:
+        sock = socket.socket(fileno=int(fd))
+    else:
+        sock = socket.create_server((args.host, args.port), backlog=args.backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+def preload(application):
+    """
+    Load everything workers would otherwise load on their first request
+
+    The database is created and migrated here, templates are compiled and
+    the face gallery is read, so forked workers share these pages
+    copy-on-write. Connections are not opened here: SQLite connections
+    must not cross a fork.
+    """
+    application.prepare_database()
+    for name in application.app.jinja_env.list_templates():
+        application.app.jinja_env.get_template(name)
+    try:
+        from face_recognition import load_face_data
+        load_face_data()
+    except Exception as e:
+        # Face recognition is optional for serving; a broken OpenCV install
+        # must not keep the server from starting
+        print(f"⚠️  Warning: face gallery not preloaded: {e}")
+    # Objects that exist now are never collected, so the collector does not
+    # write to (and un-share) their pages in every worker
+    gc.collect()
+    gc.freeze()
+
+
+# ============ WORKER ============
+
+def make_worker_server(app, sock, args):
+    from werkzeug.serving import BaseWSGIServer, WSGIRequestHandler
+
+    class RequestHandler(WSGIRequestHandler):
+        # Keep-alive connections hold a pool thread between requests, so an
+        # idle one is closed after a while
+        protocol_version = 'HTTP/1.1'
+        timeout = args.keepalive
+        detached = False
+
+        def run_wsgi(self):
+            if not self.path.startswith(STREAM_PATHS):
+                return super().run_wsgi()
+            # An SSE stream stays open for as long as the page does; on a
+            # pool thread a few dozen dashboards would starve every other
+            # request, so the connection moves to a thread of its own
+            if not self.server.open_stream():
+                self.close_connection = True
+                self.send_response(503)
+                self.send_header('Retry-After', str(STREAM_RETRY_AFTER))
+                self.send_header('Content-Length', '0')
+                self.send_header('Connection', 'close')
+                self.end_headers()
+                return
+            self.detached = True
+            self.close_connection = True
+            threading.Thread(target=self._stream, name='sse', daemon=True).start()
+
+        def _stream(self):
+            try:
+                super().run_wsgi()
+                self.wfile.flush()
+            except (ConnectionError, socket.timeout) as e:
+                self.connection_dropped(e)
+            except Exception:
+                self.server.handle_error(self.request, self.client_address)
+            finally:
+                super().finish()
+                self.server.shutdown_request(self.request)
+                self.server.close_stream()
+
+        def finish(self):
+            # The stream thread finishes the connection, not the pool thread
+            if not self.detached:
+                super().finish()
+
+    class PooledWSGIServer(BaseWSGIServer):
+        """Werkzeug server handing each connection to a fixed thread pool"""
+
+        multithread = True
+
+        def __init__(self):
+            super().__init__(args.host, args.port, app, handler=RequestHandler, fd=sock.fileno())
+            self.pool = ThreadPoolExecutor(args.threads, thread_name_prefix='wsgi')
+            self.active = 0
+            self.streams = 0
+            self.active_lock = threading.Lock()
+
+        def process_request(self, request, client_address):
+            with self.active_lock:
+                self.active += 1
+            self.pool.submit(self._handle, request, client_address)
+
+        def _handle(self, request, client_address):
+            handler = None
+            try:
+                handler = RequestHandler(request, client_address, self)
+            except Exception:
+                self.handle_error(request, client_address)
+            finally:
+                if handler is None or not handler.detached:
+                    self.shutdown_request(request)
+                with self.active_lock:
+                    self.active -= 1
+
+        def open_stream(self):
+            with self.active_lock:
+                if self.streams >= args.max_streams:
+                    return False
+                self.streams += 1
+                return True
+
+        def close_stream(self):
+            with self.active_lock:
+                self.streams -= 1
+
+    return PooledWSGIServer()
+
+
+def run_worker(application, sock, args):
+    """Serve until TERM, then drain; never returns"""
+    app = application.app
+    for signum in (signal.SIGINT, signal.SIGHUP):
+        signal.signal(signum, signal.SIG_IGN)
+    server = make_worker_server(app, sock, args)
+
+    def drain(signum, frame):
+        app.config['DRAINING'] = True
+        # shutdown() waits for serve_forever to return, so not on this thread
+        threading.Thread(target=server.shutdown, daemon=True).start()
+
+    signal.signal(signal.SIGTERM, drain)
+    try:
+        server.serve_forever()
+    finally:
+        deadline = time.monotonic() + args.graceful_timeout
+        while server.active and time.monotonic() < deadline:
+            time.sleep(0.1)
+        if server.active:
+            print(f"⚠️  Worker {os.getpid()}: {server.active} requests cut off at shutdown", flush=True)
+        try:
+            application.write_queue.stop()
+            application.METRICS.flush()
+        finally:
+            os._exit(0)
+
+
+# ============ MASTER ============
+
+class Master:
+    """Keeps args.workers workers running and handles shutdown and reload"""
+
+    def __init__(self, application, sock, args):
+        self.application = application
+        self.sock = sock
+        self.args = args
+        self.workers = {}
+        self.stopping = False
+        self.reloading = False
+
+    def spawn(self):
+        pid = os.fork()
+        if pid == 0:
+            run_worker(self.application, self.sock, self.args)
+        self.workers[pid] = time.monotonic()
+        return pid
+
+    def reap(self):
+        """Collect exited workers; returns {pid: seconds it lived}"""
+        exited = {}
+        while True:
+            try:
+                pid, _ = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                break
+            if pid == 0:
+                break
+            started = self.workers.pop(pid, None)
+            if started is not None:
+                exited[pid] = time.monotonic() - started
+            self._forget(pid)
+        return exited
+
+    def _forget(self, pid):
+        relay = os.environ.get('EVENT_RELAY_DIR')
+        if relay:
+            try:
+                os.unlink(os.path.join(relay, f'events-{pid}.sock'))
+            except FileNotFoundError:
+                pass
+
+    def stop(self, pids):
+        """TERM the given workers and wait for them, KILLing stragglers"""
+        for pid in pids:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        deadline = time.monotonic() + self.args.graceful_timeout + 5
+        remaining = set(pids)
+        while remaining and time.monotonic() < deadline:
+            for pid in list(remaining):
+                try:
+                    done, _ = os.waitpid(pid, os.WNOHANG)
+                except ChildProcessError:
+                    done = pid
+                if done:
+                    remaining.discard(pid)
+                    self.workers.pop(pid, None)
+                    self._forget(pid)
+            time.sleep(0.1)
+        for pid in remaining:
+            print(f"⚠️  Worker {pid} did not stop in time; killing it", flush=True)
+            try:
+                os.kill(pid, signal.SIGKILL)
+                os.waitpid(pid, 0)
+            except (ProcessLookupError, ChildProcessError):
+                pass
+            self.workers.pop(pid, None)
+            self._forget(pid)
+
+    def run(self):
+        signal.signal(signal.SIGTERM, self._on_stop)
+        signal.signal(signal.SIGINT, self._on_stop)
+        signal.signal(signal.SIGHUP, self._on_reload)
+
+        for _ in range(self.args.workers):
+            self.spawn()
+        # Workers of the master we were re-executed from are still our
+        # children; retire them now that the new ones are accepting
+        old = [int(pid) for pid in os.environ.pop(OLD_WORKERS_ENV, '').split(',') if pid]
+        if old:
+            self.stop(old)
+            print(f"🔁 Reload complete: {len(old)} old workers drained", flush=True)
+        print(f"🚀 SaarthiAI on http://{self.args.host}:{self.args.port} "
+              f"({self.args.workers} workers × {self.args.threads} threads, master {os.getpid()})", flush=True)
+
+        while not self.stopping and not self.reloading:
+            for pid, lived in self.reap().items():
+                print(f"⚠️  Worker {pid} exited after {lived:.1f}s; starting a new one", flush=True)
+                # Do not spin when workers die on startup
+                if lived < 1:
+                    time.sleep(1)
+            while len(self.workers) < self.args.workers and not self.stopping:
+                self.spawn()
+            time.sleep(0.5)
+
+        if self.reloading:
+            self.reexec()
+        self.stop(list(self.workers))
+        print("👋 SaarthiAI stopped", flush=True)
+
+    def reexec(self):
+        """Replace this process with a fresh master, keeping socket and workers"""
+        print("🔁 Reloading: starting a new master on the same socket", flush=True)
+        os.environ[LISTEN_FD_ENV] = str(self.sock.fileno())
+        os.environ[OLD_WORKERS_ENV] = ','.join(str(pid) for pid in self.workers)
+        sys.stdout.flush()
+        os.execv(sys.executable, [sys.executable] + sys.argv)
+
+    def _on_stop(self, signum, frame):
+        self.stopping = True
+
+    def _on_reload(self, signum, frame):
+        self.reloading = True
+
+
+def main(argv=None):
+    if not hasattr(os, 'fork'):
+        raise SystemExit("❌ serve.py needs os.fork(); on Windows run python app.py")
+    args = parse_args(argv)
+
+    reload = LISTEN_FD_ENV in os.environ
+    for name, path in shared_dirs(args.port).items():
+        path = os.environ.setdefault(name, path)
+        # Snapshots of a previous run would be added to this run's counters
+        if not reload:
+            shutil.rmtree(path, ignore_errors=True)
+        os.makedirs(path, exist_ok=True)
+
+    sock = listen(args)
+    if not args.access_log:
+        logging.getLogger('werkzeug').setLevel(logging.WARNING)
+    # app reads its configuration at import time
+    import app as application
+    preload(application)
+    Master(application, sock, args).run()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,800 @@
+// Particle animation
+const canvas = document.getElementById('particles-canvas');
+const ctx = canvas.getContext('2d');
+canvas.width = window.innerWidth;
+canvas.height = window.innerHeight;
+
+const particles = [];
+for (let i = 0; i < 50; i++) {
+    particles.push({
+        x: Math.random() * canvas.width,
+        y: Math.random() * canvas.height,
+        vx: (Math.random() - 0.5) * 0.5,
+        vy: (Math.random() - 0.5) * 0.5,
+        radius: Math.random() * 2
+    });
+}
+
+function animateParticles() {
+    ctx.clearRect(0, 0, canvas.width, canvas.height);
+    ctx.fillStyle = 'rgba(102, 126, 234, 0.5)';
+
+    particles.forEach(p => {
+        ctx.beginPath();
+        ctx.arc(p.x, p.y, p.radius, 0, Math.PI * 2);
+        ctx.fill();
+
+        p.x += p.vx;
+        p.y += p.vy;
+
+        if (p.x < 0 || p.x > canvas.width) p.vx *= -1;
+        if (p.y < 0 || p.y > canvas.height) p.vy *= -1;
+    });
+
+    requestAnimationFrame(animateParticles);
+}
+animateParticles();
+
+window.addEventListener('resize', () => {
+    canvas.width = window.innerWidth;
+    canvas.height = window.innerHeight;
+});
+
+// Initialize Attendance Chart
+const attendanceCtx = document.getElementById('attendanceChart');
+if (attendanceCtx) {
+    new Chart(attendanceCtx, {
+        type: 'line',
+        data: {
+            labels: ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday'],
+            datasets: [{
+                label: 'Attendance %',
+                data: [92, 88, 94, 89, 91, 87],
+                borderColor: 'rgba(102, 126, 234, 1)',
+                backgroundColor: 'rgba(102, 126, 234, 0.1)',
+                borderWidth: 3,
+                fill: true,
+                tension: 0.4,
+                pointBackgroundColor: 'rgba(102, 126, 234, 1)',
+                pointBorderColor: '#fff',
+                pointBorderWidth: 2,
+                pointRadius: 6,
+                pointHoverRadius: 8
+            }]
+        },
+        options: {
+            responsive: true,
+            maintainAspectRatio: false,
+            plugins: {
+                legend: {
+                    display: false
+                }
+            },
+            scales: {
+                y: {
+                    beginAtZero: false,
+                    min: 80,
+                    max: 100,
+                    grid: {
+                        color: 'rgba(255, 255, 255, 0.1)'
+                    },
+                    ticks: {
+                        color: 'rgba(255, 255, 255, 0.7)',
+                        callback: function(value) {
+                            return value + '%';
+                        }
+                    }
+                },
+                x: {
+                    grid: {
+                        color: 'rgba(255, 255, 255, 0.1)'
+                    },
+                    ticks: {
+                        color: 'rgba(255, 255, 255, 0.7)'
+                    }
+                }
+            }
+        }
+    });
+}
+
+// Navigation
+function showSection(sectionName) {
+    document.querySelectorAll('.section').forEach(s => s.classList.remove('active'));
+    document.querySelectorAll('.nav-link').forEach(l => l.classList.remove('active'));
+
+    document.getElementById(sectionName).classList.add('active');
+    event.target.closest('.nav-link').classList.add('active');
+
+    const titles = {
+        dashboard: 'Dashboard',
+        students: 'Students',
+        teachers: 'Teachers',
+        courses: 'Courses',
+        subjects: 'Subjects',
+        timetable: 'Timetable',
+        attendance: 'Attendance',
+        notifications: 'Notifications',
+        reports: 'Reports',
+        settings: 'Settings'
+    };
+
+    document.getElementById('breadcrumbCurrent').textContent = titles[sectionName];
+
+    if (window.innerWidth <= 768) {
+        document.getElementById('sidebar').classList.remove('active');
+    }
+}
+
+function toggleSidebar() {
+    document.getElementById('sidebar').classList.toggle('active');
+}
+
+function openModal(type) {
+    const modal = document.getElementById('addModal');
+    const formFields = document.getElementById('formFields');
+    const form = document.getElementById('addForm');
+
+    // Clear any previous edit mode
+    delete form.dataset.editId;
+
+    form.dataset.type = type;
+
+    // Define form fields for each type
+    const formConfigs = {
+        addStudent: {
+            title: '➕ Add Student',
+            fields: [
+                { label: 'Full Name', id: 'fullName', type: 'text', required: true },
+                { label: 'Email', id: 'email', type: 'email', required: true },
+                { label: 'Phone', id: 'phone', type: 'tel', required: true },
+                { label: 'Course', id: 'course', type: 'select', options: ['Computer Science', 'Mathematics', 'Physics'], required: true }
+            ]
+        },
+        addTeacher: {
+            title: '➕ Add Teacher',
+            fields: [
+                { label: 'Full Name', id: 'fullName', type: 'text', required: true },
+                { label: 'Email', id: 'email', type: 'email', required: true },
+                { label: 'Phone', id: 'phone', type: 'tel', required: true },
+                { label: 'Subject', id: 'subject', type: 'text', required: true }
+            ]
+        },
+        addCourse: {
+            title: '➕ Add Course',
+            fields: [
+                { label: 'Course Name', id: 'courseName', type: 'text', required: true },
+                { label: 'Course Code', id: 'courseCode', type: 'text', required: true },
+                { label: 'Duration (Years)', id: 'duration', type: 'number', required: true },
+                { label: 'Description', id: 'description', type: 'textarea', required: false }
+            ]
+        },
+        addSubject: {
+            title: '➕ Add Subject',
+            fields: [
+                { label: 'Subject Name', id: 'subjectName', type: 'text', required: true },
+                { label: 'Subject Code', id: 'subjectCode', type: 'text', required: true },
+                { label: 'Credits', id: 'credits', type: 'number', required: true },
+                { label: 'Assign Teacher', id: 'teacher', type: 'select', options: ['Dr. Amit Patel', 'Prof. Sharma', 'Dr. Verma'], required: true },
+                { label: 'Course', id: 'course', type: 'select', options: ['Computer Science', 'Mathematics', 'Physics'], required: true }
+            ]
+        },
+        createTimetable: {
+            title: '🗓️ Create Timetable',
+            fields: [
+                { label: 'Class/Course', id: 'timetableClass', type: 'select', options: ['Computer Science - Year 1', 'Computer Science - Year 2', 'Mathematics - Year 1'], required: true },
+                { label: 'Day', id: 'day', type: 'select', options: ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday'], required: true },
+                { label: 'Time Slot', id: 'timeSlot', type: 'select', options: ['09:00 - 10:00', '10:00 - 11:00', '11:30 - 12:30', '12:30 - 13:30'], required: true },
+                { label: 'Subject', id: 'subject', type: 'select', options: ['Physics', 'Mathematics', 'Computer Science', 'Chemistry', 'English'], required: true },
+                { label: 'Teacher', id: 'teacher', type: 'select', options: ['Dr. Amit Patel', 'Prof. Sharma', 'Dr. Verma'], required: true },
+                { label: 'Room/Lab', id: 'room', type: 'text', required: true }
+            ]
+        }
+    };
+
+    const config = formConfigs[type];
+    document.getElementById('modalTitle').textContent = config.title;
+
+    // Build form fields
+    formFields.innerHTML = '';
+    config.fields.forEach(field => {
+        const formGroup = document.createElement('div');
+        formGroup.className = 'form-group';
+
+        const label = document.createElement('label');
+        label.className = 'form-label';
+        label.textContent = field.label;
+        formGroup.appendChild(label);
+
+        let input;
+        if (field.type === 'select') {
+            input = document.createElement('select');
+            input.className = 'form-select';
+            field.options.forEach(opt => {
+                const option = document.createElement('option');
+                option.value = opt;
+                option.textContent = opt;
+                input.appendChild(option);
+            });
+        } else if (field.type === 'textarea') {
+            input = document.createElement('textarea');
+            input.className = 'form-textarea';
+        } else {
+            input = document.createElement('input');
+            input.type = field.type;
+            input.className = 'form-input';
+        }
+
+        input.id = field.id;
+        input.required = field.required;
+        formGroup.appendChild(input);
+        formFields.appendChild(formGroup);
+    });
+
+    modal.classList.add('active');
+}
+
+function closeModal(modalId) {
+    document.getElementById(modalId).classList.remove('active');
+    document.getElementById('modalSuccess').classList.remove('show');
+    document.getElementById('addForm').reset();
+}
+
+document.getElementById('addForm').addEventListener('submit', function(e) {
+    e.preventDefault();
+
+    const formType = this.dataset.type;
+    const formData = {};
+
+    // Collect form data
+    const inputs = this.querySelectorAll('input, select, textarea');
+    inputs.forEach(input => {
+        formData[input.id] = input.value;
+    });
+
+    // Check if this is an edit operation
+    const isEdit = this.dataset.editId ? true : false;
+    const editId = this.dataset.editId;
+
+    // Determine endpoint
+    const endpoints = {
+        addStudent: isEdit ? `/api/edit-student/${editId}` : '/api/add-student',
+        addTeacher: isEdit ? `/api/edit-teacher/${editId}` : '/api/add-teacher',
+        addCourse: isEdit ? `/api/edit-course/${editId}` : '/api/add-course',
+        addSubject: isEdit ? `/api/edit-subject/${editId}` : '/api/add-subject',
+        createTimetable: '/api/create-timetable'
+    };
+
+    const endpoint = endpoints[formType];
+    const method = isEdit ? 'PUT' : 'POST';
+
+    // Show loading state
+    const submitBtn = this.querySelector('button[type="submit"]');
+    const originalBtnText = submitBtn.innerHTML;
+    submitBtn.disabled = true;
+    submitBtn.innerHTML = '<span class="loading-spinner"></span> Processing...';
+
+    // Real API call with better error handling
+    fetch(endpoint, {
+        method: method,
+        headers: { 
+            'Content-Type': 'application/json'
+        },
+        body: JSON.stringify(formData)
+    })
+    .then(response => {
+        // Check if response is ok
+        if (!response.ok) {
+            return response.json().then(err => {
+                throw new Error(err.message || `HTTP error! status: ${response.status}`);
+            });
+        }
+        return response.json();
+    })
+    .then(data => {
+        if (data.success) {
+            document.getElementById('successText').textContent = data.message || (isEdit ? 'Updated successfully!' : 'Added successfully!');
+            document.getElementById('modalSuccess').classList.add('show');
+
+            setTimeout(() => {
+                closeModal('addModal');
+                location.reload();
+            }, 1500);
+        } else {
+            throw new Error(data.message || 'Operation failed');
+        }
+    })
+    .catch(error => {
+        console.error('Error details:', error);
+
+        // Show detailed error message
+        let errorMessage = error.message;
+
+        if (errorMessage.includes('database is locked')) {
+            errorMessage = '⚠️ Database is currently locked. This usually happens when:\n\n' +
+                         '1. Another operation is in progress\n' +
+                         '2. Database connection timeout\n' +
+                         '3. SQLite file permissions issue\n\n' +
+                         'Solutions:\n' +
+                         '- Wait a moment and try again\n' +
+                         '- Check if another admin is making changes\n' +
+                         '- Contact your system administrator\n' +
+                         '- Consider upgrading to MySQL/PostgreSQL for better concurrency';
+        } else if (errorMessage.includes('Failed to fetch')) {
+            errorMessage = '⚠️ Cannot connect to server!\n\n' +
+                         'Please check:\n' +
+                         '- Is the backend server running?\n' +
+                         '- Is the API endpoint correct?\n' +
+                         '- Check your internet connection';
+        } else if (errorMessage.includes('duplicate') || errorMessage.includes('unique')) {
+            errorMessage = '⚠️ This record already exists!\n\n' +
+                         'Email or ID might be duplicate.';
+        }
+
+        alert('Error: ' + errorMessage);
+
+        // Re-enable button
+        submitBtn.disabled = false;
+        submitBtn.innerHTML = originalBtnText;
+    });
+});
+
+function markAttendance() {
+    const classVal = document.getElementById('classSelect').value;
+    const date = document.getElementById('attendanceDate').value;
+
+    if (!date) {
+        alert('Please select a date');
+        return;
+    }
+
+    alert('Attendance marking feature ready! Selected: ' + classVal + ' on ' + date);
+}
+
+function sendNotification() {
+    const target = document.getElementById('notificationTarget').value;
+    const subject = document.getElementById('notificationSubject').value;
+    const message = document.getElementById('notificationMessage').value;
+
+    if (!subject || !message) {
+        alert('Please fill in all fields');
+        return;
+    }
+
+    fetch('/api/send-notification', {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ target, subject, message })
+    })
+    .then(response => response.json())
+    .then(data => {
+        if (data.success) {
+            document.getElementById('notificationSuccess').classList.add('show');
+            alert(data.message);
+
+            setTimeout(() => {
+                document.getElementById('notificationSuccess').classList.remove('show');
+                document.getElementById('notificationSubject').value = '';
+                document.getElementById('notificationMessage').value = '';
+            }, 3000);
+        } else {
+            alert('Error: ' + data.message);
+        }
+    })
+    .catch(error => {
+        alert('Error: ' + error.message);
+        console.error('Error:', error);
+    });
+}
+
+function sendLowAttendanceAlerts() {
+    if (!confirm('Send email alerts to all students with low attendance?')) {
+        return;
+    }
+
+    const btn = event.target;
+    btn.disabled = true;
+    btn.innerHTML = '<span class="loading-spinner"></span> Sending...';
+
+    fetch('/api/check-low-attendance', {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' }
+    })
+    .then(response => response.json())
+    .then(data => {
+        if (data.success) {
+            document.getElementById('lowAttendanceSuccessText').textContent = data.message;
+            document.getElementById('lowAttendanceSuccess').classList.add('show');
+
+            setTimeout(() => {
+                document.getElementById('lowAttendanceSuccess').classList.remove('show');
+            }, 5000);
+        } else {
+            alert('Error: ' + data.message);
+        }
+    })
+    .catch(error => {
+        alert('Error: ' + error.message);
+        console.error('Error:', error);
+    })
+    .finally(() => {
+        btn.disabled = false;
+        btn.innerHTML = '📧 Send Alerts to All Low Attendance Students';
+    });
+}
+
+function sendIndividualAlert(studentId, studentName) {
+    if (!confirm(`Send attendance alert to ${studentName}?`)) {
+        return;
+    }
+
+    const btn = event.target;
+    btn.disabled = true;
+    btn.innerHTML = '<span class="loading-spinner"></span>';
+
+    fetch('/api/send-low-attendance-alert', {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ student_id: studentId })
+    })
+    .then(response => response.json())
+    .then(data => {
+        if (data.success) {
+            alert(data.message);
+        } else {
+            alert('Error: ' + data.message);
+        }
+    })
+    .catch(error => {
+        alert('Error: ' + error.message);
+        console.error('Error:', error);
+    })
+    .finally(() => {
+        btn.disabled = false;
+        btn.innerHTML = '📧 Send Alert';
+    });
+}
+
+function saveSettings() {
+    document.getElementById('settingsSuccess').classList.add('show');
+    setTimeout(() => {
+        document.getElementById('settingsSuccess').classList.remove('show');
+    }, 3000);
+}
+
+function resetSettings() {
+    document.getElementById('institutionName').value = 'SaarthiAI School';
+    document.getElementById('contactEmail').value = 'admin@saarthi.ai';
+    document.getElementById('phoneNumber').value = '+91 9876543210';
+}
+
+function generateReport(type) {
+    const types = {
+        attendance: 'Attendance',
+        performance: 'Performance',
+        fees: 'Fees',
+        custom: 'Custom'
+    };
+    alert(types[type] + ' Report generated! Ready to download.');
+}
+
+// Edit and Delete Functions for Students
+function editStudent(id, name, email, course) {
+    // Open modal in edit mode
+    openModal('addStudent');
+
+    // Wait for modal to open, then fill the fields
+    setTimeout(() => {
+        const form = document.getElementById('addForm');
+
+        // Set form to edit mode
+        form.dataset.editId = id;
+
+        // Update modal title
+        document.getElementById('modalTitle').textContent = '✏️ Edit Student';
+
+        // Fill form fields
+        document.getElementById('fullName').value = name;
+        document.getElementById('email').value = email;
+        document.getElementById('phone').value = '+91 9876543210'; // You might want to pass this as parameter
+
+        // Find and select the course
+        const courseSelect = document.querySelector('#formFields select');
+        if (courseSelect) {
+            for (let i = 0; i < courseSelect.options.length; i++) {
+                if (courseSelect.options[i].value === course) {
+                    courseSelect.selectedIndex = i;
+                    break;
+                }
+            }
+        }
+
+        // Change submit button text
+        const submitBtn = form.querySelector('button[type="submit"]');
+        submitBtn.innerHTML = '💾 Update Student';
+    }, 100);
+}
+
+function deleteStudent(id, name) {
+    if (confirm(`Are you sure you want to delete ${name}?\n\nThis action cannot be undone.`)) {
+        // Show loading state
+        const btn = event.target;
+        const originalText = btn.innerHTML;
+        btn.disabled = true;
+        btn.innerHTML = '<span class="loading-spinner"></span>';
+
+        // Real API call for delete
+        fetch(`/api/delete-student/${id}`, {
+            method: 'DELETE',
+            headers: { 'Content-Type': 'application/json' }
+        })
+        .then(response => {
+            if (!response.ok) {
+                return response.json().then(err => {
+                    throw new Error(err.message || 'Delete failed');
+                });
+            }
+            return response.json();
+        })
+        .then(data => {
+            if (data.success) {
+                alert(`Student ${name} has been deleted successfully!`);
+
+                // Remove the row from table with animation
+                const row = btn.closest('tr');
+                row.style.transition = 'all 0.3s ease';
+                row.style.opacity = '0';
+                row.style.transform = 'translateX(-20px)';
+
+                setTimeout(() => {
+                    row.remove();
+                }, 300);
+            } else {
+                throw new Error(data.message || 'Delete failed');
+            }
+        })
+        .catch(error => {
+            console.error('Delete error:', error);
+
+            let errorMessage = error.message;
+            if (errorMessage.includes('database is locked')) {
+                errorMessage = '⚠️ Database is locked. Please wait a moment and try again.\n\nIf this persists, contact your administrator.';
+            }
+
+            alert('Error: ' + errorMessage);
+            btn.disabled = false;
+            btn.innerHTML = originalText;
+        });
+    }
+}
+
+// Edit and Delete Functions for Teachers
+function editTeacher(id, name, email, subject) {
+    openModal('addTeacher');
+
+    setTimeout(() => {
+        const form = document.getElementById('addForm');
+        form.dataset.editId = id;
+
+        document.getElementById('modalTitle').textContent = '✏️ Edit Teacher';
+        document.getElementById('fullName').value = name;
+        document.getElementById('email').value = email;
+        document.getElementById('phone').value = '+91 9876543210';
+
+        const subjectInput = document.getElementById('subject');
+        if (subjectInput) {
+            subjectInput.value = subject;
+        }
+
+        const submitBtn = form.querySelector('button[type="submit"]');
+        submitBtn.innerHTML = '💾 Update Teacher';
+    }, 100);
+}
+
+function deleteTeacher(id, name) {
+    if (confirm(`Are you sure you want to delete ${name}?\n\nThis will also remove their teaching assignments.`)) {
+        const btn = event.target;
+        const originalText = btn.innerHTML;
+        btn.disabled = true;
+        btn.innerHTML = '<span class="loading-spinner"></span>';
+
+        fetch(`/api/delete-teacher/${id}`, {
+            method: 'DELETE',
+            headers: { 'Content-Type': 'application/json' }
+        })
+        .then(response => {
+            if (!response.ok) {
+                return response.json().then(err => {
+                    throw new Error(err.message || 'Delete failed');
+                });
+            }
+            return response.json();
+        })
+        .then(data => {
+            if (data.success) {
+                alert(`Teacher ${name} has been deleted successfully!`);
+                const row = btn.closest('tr');
+                row.style.transition = 'all 0.3s ease';
+                row.style.opacity = '0';
+                row.style.transform = 'translateX(-20px)';
+                setTimeout(() => row.remove(), 300);
+            } else {
+                throw new Error(data.message || 'Delete failed');
+            }
+        })
+        .catch(error => {
+            console.error('Delete error:', error);
+            let errorMessage = error.message;
+            if (errorMessage.includes('database is locked')) {
+                errorMessage = '⚠️ Database is locked. Please wait and try again.';
+            }
+            alert('Error: ' + errorMessage);
+            btn.disabled = false;
+            btn.innerHTML = originalText;
+        });
+    }
+}
+
+// Edit and Delete Functions for Courses
+function editCourse(id, name, duration) {
+    openModal('addCourse');
+
+    setTimeout(() => {
+        const form = document.getElementById('addForm');
+        form.dataset.editId = id;
+
+        document.getElementById('modalTitle').textContent = '✏️ Edit Course';
+        document.getElementById('courseName').value = name;
+        document.getElementById('courseCode').value = id;
+
+        // Extract years from duration string (e.g., "4 Years" -> "4")
+        const years = duration.split(' ')[0];
+        const durationInput = document.getElementById('duration');
+        if (durationInput) {
+            durationInput.value = years;
+        }
+
+        const submitBtn = form.querySelector('button[type="submit"]');
+        submitBtn.innerHTML = '💾 Update Course';
+    }, 100);
+}
+
+function deleteCourse(id, name) {
+    if (confirm(`Are you sure you want to delete the course "${name}"?\n\nThis will affect all students enrolled in this course.`)) {
+        const btn = event.target;
+        const originalText = btn.innerHTML;
+        btn.disabled = true;
+        btn.innerHTML = '<span class="loading-spinner"></span>';
+
+        fetch(`/api/delete-course/${id}`, {
+            method: 'DELETE',
+            headers: { 'Content-Type': 'application/json' }
+        })
+        .then(response => {
+            if (!response.ok) {
+                return response.json().then(err => {
+                    throw new Error(err.message || 'Delete failed');
+                });
+            }
+            return response.json();
+        })
+        .then(data => {
+            if (data.success) {
+                alert(`Course "${name}" has been deleted successfully!`);
+                const row = btn.closest('tr');
+                row.style.transition = 'all 0.3s ease';
+                row.style.opacity = '0';
+                row.style.transform = 'translateX(-20px)';
+                setTimeout(() => row.remove(), 300);
+            } else {
+                throw new Error(data.message || 'Delete failed');
+            }
+        })
+        .catch(error => {
+            console.error('Delete error:', error);
+            let errorMessage = error.message;
+            if (errorMessage.includes('database is locked')) {
+                errorMessage = '⚠️ Database is locked. Please wait and try again.';
+            }
+            alert('Error: ' + errorMessage);
+            btn.disabled = false;
+            btn.innerHTML = originalText;
+        });
+    }
+}
+
+// Edit and Delete Functions for Subjects
+function editSubject(id, name, code, credits, teacher) {
+    openModal('addSubject');
+
+    setTimeout(() => {
+        const form = document.getElementById('addForm');
+        form.dataset.editId = id;
+
+        document.getElementById('modalTitle').textContent = '✏️ Edit Subject';
+        document.getElementById('subjectName').value = name;
+        document.getElementById('subjectCode').value = code;
+        document.getElementById('credits').value = credits;
+
+        // Find and select the teacher
+        const teacherSelect = document.getElementById('teacher');
+        if (teacherSelect) {
+            for (let i = 0; i < teacherSelect.options.length; i++) {
+                if (teacherSelect.options[i].value === teacher) {
+                    teacherSelect.selectedIndex = i;
+                    break;
+                }
+            }
+        }
+
+        const submitBtn = form.querySelector('button[type="submit"]');
+        submitBtn.innerHTML = '💾 Update Subject';
+    }, 100);
+}
+
+function deleteSubject(id, name) {
+    if (confirm(`Are you sure you want to delete the subject "${name}"?\n\nThis will remove it from all timetables.`)) {
+        const btn = event.target;
+        const originalText = btn.innerHTML;
+        btn.disabled = true;
+        btn.innerHTML = '<span class="loading-spinner"></span>';
+
+        fetch(`/api/delete-subject/${id}`, {
+            method: 'DELETE',
+            headers: { 'Content-Type': 'application/json' }
+        })
+        .then(response => {
+            if (!response.ok) {
+                return response.json().then(err => {
+                    throw new Error(err.message || 'Delete failed');
+                });
+            }
+            return response.json();
+        })
+        .then(data => {
+            if (data.success) {
+                alert(`Subject "${name}" has been deleted successfully!`);
+                const row = btn.closest('tr');
+                row.style.transition = 'all 0.3s ease';
+                row.style.opacity = '0';
+                row.style.transform = 'translateX(-20px)';
+                setTimeout(() => row.remove(), 300);
+            } else {
+                throw new Error(data.message || 'Delete failed');
+            }
+        })
+        .catch(error => {
+            console.error('Delete error:', error);
+            let errorMessage = error.message;
+            if (errorMessage.includes('database is locked')) {
+                errorMessage = '⚠️ Database is locked. Please wait and try again.';
+            }
+            alert('Error: ' + errorMessage);
+            btn.disabled = false;
+            btn.innerHTML = originalText;
+        });
+    }
+}
+
+// Close modal on outside click
+document.getElementById('addModal').addEventListener('click', function(e) {
+    if (e.target === this) {
+        closeModal('addModal');
+    }
+});
+
+// Mobile sidebar close on outside click
+document.addEventListener('click', function(e) {
+    const sidebar = document.getElementById('sidebar');
+    const toggle = document.querySelector('.mobile-toggle');
+
+    if (window.innerWidth <= 768 && 
+        sidebar.classList.contains('active') && 
+        !sidebar.contains(e.target) && 
+        !toggle.contains(e.target)) {
+        sidebar.classList.remove('active');
+    }
+});
+
+// Set today's date for attendance
+document.getElementById('attendanceDate').valueAsDate = new Date();
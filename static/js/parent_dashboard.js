@@ -0,0 +1,394 @@
+// Particle animation
+const canvas = document.getElementById('particles-canvas');
+const ctx = canvas.getContext('2d');
+canvas.width = window.innerWidth;
+canvas.height = window.innerHeight;
+
+const particles = [];
+for (let i = 0; i < 50; i++) {
+    particles.push({
+        x: Math.random() * canvas.width,
+        y: Math.random() * canvas.height,
+        vx: (Math.random() - 0.5) * 0.5,
+        vy: (Math.random() - 0.5) * 0.5,
+        radius: Math.random() * 2
+    });
+}
+
+function animateParticles() {
+    ctx.clearRect(0, 0, canvas.width, canvas.height);
+    ctx.fillStyle = 'rgba(102, 126, 234, 0.5)';
+
+    particles.forEach(p => {
+        ctx.beginPath();
+        ctx.arc(p.x, p.y, p.radius, 0, Math.PI * 2);
+        ctx.fill();
+
+        p.x += p.vx;
+        p.y += p.vy;
+
+        if (p.x < 0 || p.x > canvas.width) p.vx *= -1;
+        if (p.y < 0 || p.y > canvas.height) p.vy *= -1;
+    });
+
+    requestAnimationFrame(animateParticles);
+}
+animateParticles();
+
+window.addEventListener('resize', () => {
+    canvas.width = window.innerWidth;
+    canvas.height = window.innerHeight;
+});
+
+// Initialize Charts
+// Attendance Chart
+const attendanceCtx = document.getElementById('attendanceChart');
+if (attendanceCtx) {
+    new Chart(attendanceCtx, {
+        type: 'line',
+        data: {
+            labels: ['Week 1', 'Week 2', 'Week 3', 'Week 4', 'Week 5', 'Week 6'],
+            datasets: [{
+                label: 'Attendance %',
+                data: [92, 88, 94, 89, 91, 88],
+                borderColor: 'rgba(102, 126, 234, 1)',
+                backgroundColor: 'rgba(102, 126, 234, 0.1)',
+                borderWidth: 3,
+                fill: true,
+                tension: 0.4,
+                pointBackgroundColor: 'rgba(102, 126, 234, 1)',
+                pointBorderColor: '#fff',
+                pointBorderWidth: 2,
+                pointRadius: 6,
+                pointHoverRadius: 8
+            }]
+        },
+        options: {
+            responsive: true,
+            maintainAspectRatio: false,
+            plugins: {
+                legend: {
+                    display: false
+                }
+            },
+            scales: {
+                y: {
+                    beginAtZero: false,
+                    min: 80,
+                    max: 100,
+                    grid: {
+                        color: 'rgba(255, 255, 255, 0.1)'
+                    },
+                    ticks: {
+                        color: 'rgba(255, 255, 255, 0.7)',
+                        callback: function(value) {
+                            return value + '%';
+                        }
+                    }
+                },
+                x: {
+                    grid: {
+                        color: 'rgba(255, 255, 255, 0.1)'
+                    },
+                    ticks: {
+                        color: 'rgba(255, 255, 255, 0.7)'
+                    }
+                }
+            }
+        }
+    });
+}
+
+// Subject Attendance Chart
+const subjectCtx = document.getElementById('subjectAttendanceChart');
+if (subjectCtx) {
+    new Chart(subjectCtx, {
+        type: 'bar',
+        data: {
+            labels: ['Mathematics', 'Science', 'English', 'History', 'Computer Science'],
+            datasets: [{
+                label: 'Attendance %',
+                data: [92, 85, 95, 88, 80],
+                backgroundColor: [
+                    'rgba(102, 126, 234, 0.8)',
+                    'rgba(118, 75, 162, 0.8)',
+                    'rgba(240, 147, 251, 0.8)',
+                    'rgba(16, 185, 129, 0.8)',
+                    'rgba(245, 158, 11, 0.8)'
+                ],
+                borderWidth: 0,
+                borderRadius: 8
+            }]
+        },
+        options: {
+            responsive: true,
+            maintainAspectRatio: false,
+            plugins: {
+                legend: {
+                    display: false
+                }
+            },
+            scales: {
+                y: {
+                    beginAtZero: false,
+                    min: 70,
+                    max: 100,
+                    grid: {
+                        color: 'rgba(255, 255, 255, 0.1)'
+                    },
+                    ticks: {
+                        color: 'rgba(255, 255, 255, 0.7)',
+                        callback: function(value) {
+                            return value + '%';
+                        }
+                    }
+                },
+                x: {
+                    grid: {
+                        display: false
+                    },
+                    ticks: {
+                        color: 'rgba(255, 255, 255, 0.7)'
+                    }
+                }
+            }
+        }
+    });
+}
+
+// Grades Chart
+const gradesCtx = document.getElementById('gradesChart');
+if (gradesCtx) {
+    new Chart(gradesCtx, {
+        type: 'line',
+        data: {
+            labels: ['Sem 1', 'Sem 2', 'Sem 3', 'Sem 4', 'Sem 5', 'Sem 6'],
+            datasets: [{
+                label: 'CGPA',
+                data: [7.5, 7.8, 8.0, 8.1, 7.9, 8.2],
+                borderColor: 'rgba(16, 185, 129, 1)',
+                backgroundColor: 'rgba(16, 185, 129, 0.1)',
+                borderWidth: 3,
+                fill: true,
+                tension: 0.4,
+                pointBackgroundColor: 'rgba(16, 185, 129, 1)',
+                pointBorderColor: '#fff',
+                pointBorderWidth: 2,
+                pointRadius: 6,
+                pointHoverRadius: 8
+            }]
+        },
+        options: {
+            responsive: true,
+            maintainAspectRatio: false,
+            plugins: {
+                legend: {
+                    display: false
+                }
+            },
+            scales: {
+                y: {
+                    beginAtZero: false,
+                    min: 6,
+                    max: 10,
+                    grid: {
+                        color: 'rgba(255, 255, 255, 0.1)'
+                    },
+                    ticks: {
+                        color: 'rgba(255, 255, 255, 0.7)'
+                    }
+                },
+                x: {
+                    grid: {
+                        color: 'rgba(255, 255, 255, 0.1)'
+                    },
+                    ticks: {
+                        color: 'rgba(255, 255, 255, 0.7)'
+                    }
+                }
+            }
+        }
+    });
+}
+
+// Navigation Functions
+function showSection(sectionName) {
+    document.querySelectorAll('.section').forEach(s => s.classList.remove('active'));
+    document.querySelectorAll('.nav-link').forEach(l => l.classList.remove('active'));
+
+    document.getElementById(sectionName).classList.add('active');
+    event.target.closest('.nav-link').classList.add('active');
+
+    const titles = {
+        dashboard: 'Dashboard',
+        attendance: 'Attendance',
+        academic: 'Academic Performance',
+        fees: 'Fee Payment',
+        timetable: 'Timetable',
+        messages: 'Messages',
+        events: 'Events',
+        announcements: 'Announcements',
+        reports: 'Reports',
+        settings: 'Settings'
+    };
+
+    document.getElementById('breadcrumbCurrent').textContent = titles[sectionName];
+
+    if (window.innerWidth <= 768) {
+        document.getElementById('sidebar').classList.remove('active');
+    }
+}
+
+function toggleSidebar() {
+    document.getElementById('sidebar').classList.toggle('active');
+}
+
+// Feature Functions
+function loadSemesterData() {
+    const semester = document.getElementById('semesterSelect').value;
+    alert(`Loading data for semester ${semester}...`);
+    // In production, this would fetch data from backend
+}
+
+function downloadAttendanceReport() {
+    alert('Downloading attendance report...');
+    // In production, this would download PDF
+}
+
+function downloadAcademicReport() {
+    alert('Downloading report card...');
+}
+
+function payFees() {
+    alert('Redirecting to payment gateway...');
+    // window.location.href = '/payment-gateway';
+}
+
+function downloadFeeReceipt() {
+    alert('Downloading fee receipt...');
+}
+
+function viewPaymentHistory() {
+    alert('Viewing payment history...');
+}
+
+function downloadReceipt(receiptId) {
+    alert(`Downloading receipt ${receiptId}...`);
+}
+
+function downloadTimetable() {
+    alert('Downloading timetable PDF...');
+}
+
+function openMessageModal() {
+    document.getElementById('messageModal').classList.add('active');
+}
+
+function closeMessageModal() {
+    document.getElementById('messageModal').classList.remove('active');
+    document.getElementById('messageForm').reset();
+}
+
+function sendMessage(event) {
+    event.preventDefault();
+    alert('Message sent successfully!');
+    closeMessageModal();
+}
+
+function viewMessage(messageId) {
+    alert(`Viewing message ${messageId}...`);
+}
+
+function viewEventDetails(eventId) {
+    alert(`Viewing event details for ${eventId}...`);
+}
+
+function rsvpEvent(eventName) {
+    if (confirm(`Confirm attendance for ${eventName}?`)) {
+        alert(`RSVP confirmed for ${eventName}!`);
+    }
+}
+
+function filterAttendance() {
+    alert('Filter options coming soon...');
+}
+
+function downloadReport(reportType) {
+    alert(`Downloading ${reportType} report...`);
+}
+
+function downloadReports() {
+    alert('Download reports section...');
+}
+
+function requestLeave() {
+    alert('Leave request form coming soon...');
+}
+
+function saveSettings() {
+    alert('Settings saved successfully!');
+}
+
+function resetSettings() {
+    if (confirm('Reset all settings to default?')) {
+        alert('Settings reset!');
+    }
+}
+
+function changePassword() {
+    const current = document.getElementById('currentPassword').value;
+    const newPass = document.getElementById('newPassword').value;
+    const confirm = document.getElementById('confirmPassword').value;
+
+    if (!current || !newPass || !confirm) {
+        alert('Please fill all password fields');
+        return;
+    }
+
+    if (newPass !== confirm) {
+        alert('New passwords do not match!');
+        return;
+    }
+
+    alert('Password changed successfully!');
+    document.getElementById('currentPassword').value = '';
+    document.getElementById('newPassword').value = '';
+    document.getElementById('confirmPassword').value = '';
+}
+
+// Every linked child is rendered server-side; show only the selected one
+function switchChild(childId) {
+    document.querySelectorAll('[data-child]').forEach(el => {
+        el.hidden = el.dataset.child !== String(childId);
+    });
+
+    const option = document.querySelector(`#childSelect option[value="${childId}"]`);
+    const percentage = option ? option.dataset.attendance : 0;
+    const progressBar = document.getElementById('attendanceProgressBar');
+    progressBar.style.width = percentage + '%';
+    progressBar.textContent = percentage + '%';
+
+    const url = new URL(window.location);
+    url.searchParams.set('child', childId);
+    history.replaceState(null, '', url);
+}
+
+// Mobile sidebar close on outside click
+document.addEventListener('click', function(e) {
+    const sidebar = document.getElementById('sidebar');
+    const toggle = document.querySelector('.mobile-toggle');
+
+    if (window.innerWidth <= 768 && 
+        sidebar.classList.contains('active') && 
+        !sidebar.contains(e.target) && 
+        !toggle.contains(e.target)) {
+        sidebar.classList.remove('active');
+    }
+});
+
+// Close modal on outside click
+document.getElementById('messageModal').addEventListener('click', function(e) {
+    if (e.target === this) {
+        closeMessageModal();
+    }
+});
@@ -0,0 +1,1243 @@
+// Particle Animation
+const canvas = document.getElementById('particles-canvas');
+const ctx = canvas.getContext('2d');
+canvas.width = window.innerWidth;
+canvas.height = window.innerHeight;
+
+const particles = [];
+for (let i = 0; i < 100; i++) {
+    particles.push({
+        x: Math.random() * canvas.width,
+        y: Math.random() * canvas.height,
+        vx: (Math.random() - 0.5) * 1,
+        vy: (Math.random() - 0.5) * 1,
+        radius: Math.random() * 2.5 + 0.5
+    });
+}
+
+function animateParticles() {
+    ctx.clearRect(0, 0, canvas.width, canvas.height);
+
+    particles.forEach((p, i) => {
+        ctx.fillStyle = 'rgba(102, 126, 234, 0.6)';
+        ctx.beginPath();
+        ctx.arc(p.x, p.y, p.radius, 0, Math.PI * 2);
+        ctx.fill();
+
+        particles.slice(i + 1).forEach(p2 => {
+            const dx = p.x - p2.x;
+            const dy = p.y - p2.y;
+            const dist = Math.sqrt(dx * dx + dy * dy);
+
+            if (dist < 120) {
+                ctx.strokeStyle = `rgba(102, 126, 234, ${0.3 * (1 - dist / 120)})`;
+                ctx.lineWidth = 1;
+                ctx.beginPath();
+                ctx.moveTo(p.x, p.y);
+                ctx.lineTo(p2.x, p2.y);
+                ctx.stroke();
+            }
+        });
+
+        p.x += p.vx;
+        p.y += p.vy;
+
+        if (p.x < 0 || p.x > canvas.width) p.vx *= -1;
+        if (p.y < 0 || p.y > canvas.height) p.vy *= -1;
+    });
+
+    requestAnimationFrame(animateParticles);
+}
+animateParticles();
+
+window.addEventListener('resize', () => {
+    canvas.width = window.innerWidth;
+    canvas.height = window.innerHeight;
+});
+
+// Date & Time
+function updateDateTime() {
+    const now = new Date();
+    const options = { weekday: 'long', year: 'numeric', month: 'long', day: 'numeric' };
+    const dateStr = now.toLocaleDateString('en-US', options);
+    const timeStr = now.toLocaleTimeString('en-US');
+    const elem = document.getElementById('currentDateTime');
+    if (elem) elem.textContent = `${dateStr} • ${timeStr}`;
+}
+updateDateTime();
+setInterval(updateDateTime, 1000);
+
+// Navigation
+const navLinks = document.querySelectorAll('.nav-link');
+const sections = document.querySelectorAll('.section');
+
+const titles = {
+    dashboard: 'Dashboard',
+    courses: 'My Courses',
+    assignments: 'Assignments',
+    grades: 'Grades',
+    attendance: 'Attendance',
+    faceAttendance: 'Face Recognition',
+    aiTutor: 'AI Tutor',
+    studyPlanner: 'Study Planner',
+    resources: 'Resources',
+    notifications: 'Notifications'
+};
+
+navLinks.forEach(link => {
+    link.addEventListener('click', () => {
+        const sectionName = link.getAttribute('data-section');
+        if (!sectionName) return;
+
+        sections.forEach(s => s.classList.remove('active'));
+        navLinks.forEach(l => l.classList.remove('active'));
+
+        document.getElementById(sectionName).classList.add('active');
+        link.classList.add('active');
+
+        document.getElementById('breadcrumbCurrent').textContent = titles[sectionName];
+        document.getElementById('breadcrumbPath').innerHTML = 
+            `<span>🏠 Home</span><span>/</span><span>${titles[sectionName]}</span>`;
+
+        if (window.innerWidth <= 768) {
+            document.getElementById('sidebar').classList.remove('active');
+        }
+
+        if (sectionName === 'dashboard') {
+            setTimeout(initPerformanceChart, 100);
+        } else if (sectionName === 'grades') {
+            setTimeout(initGradesChart, 100);
+        }
+    });
+});
+
+// Mobile Toggle
+document.getElementById('mobileToggle').addEventListener('click', () => {
+    document.getElementById('sidebar').classList.toggle('active');
+});
+
+// Logout
+document.getElementById('logoutBtn').addEventListener('click', () => {
+    if (confirm('Are you sure you want to logout?')) {
+        showToast('👋 Logging out...', 'info');
+        setTimeout(() => {
+            showToast('Logged out successfully!', 'success');
+        }, 1000);
+    }
+});
+
+// Toast
+function showToast(message, type = 'success') {
+    const toast = document.getElementById('toast');
+    const icon = document.getElementById('toastIcon');
+    const msg = document.getElementById('toastMessage');
+
+    const icons = {
+        success: '✅',
+        error: '❌',
+        warning: '⚠️',
+        info: 'ℹ️'
+    };
+
+    icon.textContent = icons[type] || '✅';
+    msg.textContent = message;
+    toast.classList.add('show');
+
+    setTimeout(() => {
+        toast.classList.remove('show');
+    }, 3000);
+}
+
+// Charts
+let performanceChartInstance = null;
+let gradesChartInstance = null;
+
+function initPerformanceChart() {
+    const ctx = document.getElementById('performanceChart');
+    if (!ctx) return;
+
+    if (performanceChartInstance) {
+        performanceChartInstance.destroy();
+    }
+
+    performanceChartInstance = new Chart(ctx, {
+        type: 'line',
+        data: {
+            labels: ['Week 1', 'Week 2', 'Week 3', 'Week 4', 'Week 5', 'Week 6', 'Week 7', 'Week 8'],
+            datasets: [{
+                label: 'Performance Score',
+                data: [75, 78, 82, 85, 87, 89, 91, 94],
+                borderColor: '#667eea',
+                backgroundColor: 'rgba(102, 126, 234, 0.1)',
+                tension: 0.4,
+                fill: true,
+                borderWidth: 3,
+                pointRadius: 5,
+                pointBackgroundColor: '#667eea',
+                pointBorderColor: '#fff',
+                pointBorderWidth: 2
+            }]
+        },
+        options: {
+            responsive: true,
+            maintainAspectRatio: false,
+            plugins: {
+                legend: { 
+                    display: true,
+                    labels: { color: '#fff', font: { size: 14 } }
+                }
+            },
+            scales: {
+                y: {
+                    beginAtZero: true,
+                    max: 100,
+                    grid: { color: 'rgba(255, 255, 255, 0.1)' },
+                    ticks: { color: '#fff', font: { size: 12 } }
+                },
+                x: {
+                    grid: { color: 'rgba(255, 255, 255, 0.1)' },
+                    ticks: { color: '#fff', font: { size: 12 } }
+                }
+            }
+        }
+    });
+}
+
+function initGradesChart() {
+    const ctx = document.getElementById('gradesChart');
+    if (!ctx) return;
+
+    if (gradesChartInstance) {
+        gradesChartInstance.destroy();
+    }
+
+    gradesChartInstance = new Chart(ctx, {
+        type: 'bar',
+        data: {
+            labels: ['A+', 'A', 'A-', 'B+', 'B', 'B-'],
+            datasets: [{
+                label: 'Number of Grades',
+                data: [5, 12, 8, 6, 3, 1],
+                backgroundColor: [
+                    'rgba(16, 185, 129, 0.8)',
+                    'rgba(16, 185, 129, 0.7)',
+                    'rgba(16, 185, 129, 0.6)',
+                    'rgba(59, 130, 246, 0.6)',
+                    'rgba(59, 130, 246, 0.5)',
+                    'rgba(59, 130, 246, 0.4)'
+                ],
+                borderColor: 'rgba(255, 255, 255, 0.2)',
+                borderWidth: 1
+            }]
+        },
+        options: {
+            responsive: true,
+            maintainAspectRatio: false,
+            plugins: {
+                legend: { 
+                    display: true,
+                    labels: { color: '#fff', font: { size: 14 } }
+                }
+            },
+            scales: {
+                y: {
+                    beginAtZero: true,
+                    grid: { color: 'rgba(255, 255, 255, 0.1)' },
+                    ticks: { color: '#fff', stepSize: 2, font: { size: 12 } }
+                },
+                x: {
+                    grid: { color: 'rgba(255, 255, 255, 0.1)' },
+                    ticks: { color: '#fff', font: { size: 12 } }
+                }
+            }
+        }
+    });
+}
+
+setTimeout(initPerformanceChart, 500);
+
+// AI Tutor - Enhanced with more responses
+function initAiTutor() {
+    const aiChat = document.getElementById('aiChat');
+    const aiInput = document.getElementById('aiInput');
+    const sendBtn = document.getElementById('sendAiMessage');
+    const clearChatBtn = document.getElementById('clearChat');
+
+    if (!aiChat || !aiInput || !sendBtn || !clearChatBtn) {
+        console.log('AI Tutor elements not found yet');
+        return;
+    }
+
+    const aiResponses = {
+        'hello': 'Hello Raj! 👋 How can I assist you with your studies today?',
+        'hi': 'Hi there! 😊 I\'m here to help you learn. What subject would you like to explore?',
+        'help': 'I can help you with:\n• Course concepts and explanations\n• Assignment guidance\n• Study tips and strategies\n• Practice problems\n• Exam preparation\n\nJust ask me anything!',
+        'data structures': 'Data structures are fundamental ways to organize and store data efficiently. Key topics include:\n\n🔹 Arrays & Linked Lists\n🔹 Stacks & Queues\n🔹 Trees (Binary, BST, AVL)\n🔹 Graphs\n🔹 Hash Tables\n🔹 Heaps\n\nWhich one would you like to learn about?',
+        'binary search tree': 'A Binary Search Tree (BST) is a tree data structure where:\n\n✅ Left subtree contains nodes with values less than parent\n✅ Right subtree contains nodes with values greater than parent\n✅ Both subtrees are also BSTs\n\nOperations:\n• Insert: O(log n) average\n• Search: O(log n) average\n• Delete: O(log n) average\n\nWould you like to see implementation examples?',
+        'machine learning': 'Machine learning enables computers to learn from data without explicit programming. Key concepts:\n\n🤖 Supervised Learning - Learning from labeled data\n🤖 Unsupervised Learning - Finding patterns in unlabeled data\n🤖 Neural Networks - Mimicking brain structure\n🤖 Deep Learning - Multi-layer neural networks\n\nWhat aspect interests you most?',
+        'database': 'Database Management covers:\n\n💾 SQL - Structured Query Language\n💾 Normalization - Organizing data efficiently\n💾 Transactions - ACID properties\n💾 Indexing - Fast data retrieval\n💾 Joins - Combining tables\n\nWhat would you like to know more about?',
+        'assignment': 'I can help guide you through your assignments! 📝\n\nWhich assignment are you working on?\n• Binary Search Tree Implementation\n• Neural Network Training\n• Database Normalization\n• Web Development Project\n\nRemember, I\'ll help you understand concepts, not just provide answers!',
+        'study tips': '📚 Here are proven study techniques:\n\n1️⃣ Active Recall - Test yourself regularly\n2️⃣ Spaced Repetition - Review at increasing intervals\n3️⃣ Pomodoro Technique - 25 min focus, 5 min break\n4️⃣ Teach Others - Best way to solidify knowledge\n5️⃣ Practice Problems - Apply what you learn\n6️⃣ Get enough sleep - Crucial for memory consolidation\n\nWhich technique would you like to know more about?',
+        'exam': 'Preparing for exams? Here\'s my advice:\n\n✨ Start early - Don\'t cram\n✨ Review lecture notes within 24 hours\n✨ Create summary sheets\n✨ Practice past papers\n✨ Study in groups\n✨ Take care of yourself\n\nWhich exam are you preparing for?',
+        'sql': 'SQL (Structured Query Language) basics:\n\nSELECT - Retrieve data\nINSERT - Add new records\nUPDATE - Modify existing data\nDELETE - Remove records\nJOIN - Combine tables\n\nExample:\nSELECT * FROM students WHERE gpa > 3.5;\n\nNeed help with a specific query?',
+        'python': 'Python is great for learning! 🐍\n\nKey concepts:\n• Variables & Data Types\n• Control Flow (if/else, loops)\n• Functions\n• Lists, Dictionaries, Sets\n• Object-Oriented Programming\n• File I/O\n\nWhat Python topic can I help you with?',
+        'web development': 'Web Development covers:\n\n🌐 HTML - Structure\n🌐 CSS - Styling\n🌐 JavaScript - Interactivity\n🌐 Responsive Design\n🌐 Frontend Frameworks (React, Vue)\n🌐 Backend (Node.js, databases)\n\nWhat are you building?',
+        'thank': 'You\'re welcome! 😊 Happy to help anytime. Keep up the great work!',
+        'thanks': 'You\'re welcome! 😊 Feel free to ask more questions anytime!',
+        'gpa': 'Your current GPA is 3.8 - excellent work! 🌟\n\nTo maintain or improve:\n• Stay consistent with assignments\n• Participate in class\n• Seek help when needed\n• Review regularly\n\nKeep it up, Raj!',
+        'default': 'That\'s an interesting question! 🤔 I\'m here to help with:\n\n• Data Structures & Algorithms\n• Machine Learning\n• Database Management\n• Web Development\n• Study strategies\n• Assignment help\n\nCould you rephrase or ask about a specific topic?'
+    };
+
+    function addMessage(text, isUser) {
+        const msg = document.createElement('div');
+        msg.className = `message ${isUser ? 'user' : 'ai'}`;
+        msg.innerHTML = isUser ? text.replace(/\n/g, '<br>') : `<strong>AI Tutor:</strong><br>${text.replace(/\n/g, '<br>')}`;
+        aiChat.appendChild(msg);
+        aiChat.scrollTop = aiChat.scrollHeight;
+    }
+
+    function getAiResponse(input) {
+        const lower = input.toLowerCase().trim();
+
+        // Check for exact or partial matches
+        for (const key in aiResponses) {
+            if (key !== 'default' && lower.includes(key)) {
+                return aiResponses[key];
+            }
+        }
+
+        // Check for variations
+        if (lower.includes('bst') || lower.includes('tree')) {
+            return aiResponses['binary search tree'];
+        }
+        if (lower.includes('ml') || lower.includes('ai')) {
+            return aiResponses['machine learning'];
+        }
+        if (lower.includes('grade') || lower.includes('score')) {
+            return aiResponses['gpa'];
+        }
+        if (lower.includes('web') || lower.includes('html') || lower.includes('css')) {
+            return aiResponses['web development'];
+        }
+
+        return aiResponses.default;
+    }
+
+    function sendMessage() {
+        const text = aiInput.value.trim();
+        if (!text) {
+            showToast('Please enter a message', 'warning');
+            return;
+        }
+
+        // Add user message
+        addMessage(text, true);
+        aiInput.value = '';
+        aiInput.focus();
+
+        // Show typing indicator
+        const typingMsg = document.createElement('div');
+        typingMsg.className = 'message ai';
+        typingMsg.id = 'typing-indicator';
+        typingMsg.innerHTML = '<strong>AI Tutor:</strong><br>Typing...';
+        aiChat.appendChild(typingMsg);
+        aiChat.scrollTop = aiChat.scrollHeight;
+
+        // Simulate AI thinking
+        setTimeout(() => {
+            const typingIndicator = document.getElementById('typing-indicator');
+            if (typingIndicator) {
+                typingIndicator.remove();
+            }
+
+            const response = getAiResponse(text);
+            addMessage(response, false);
+        }, 800);
+    }
+
+    // Event listeners
+    sendBtn.addEventListener('click', sendMessage);
+
+    aiInput.addEventListener('keypress', (e) => {
+        if (e.key === 'Enter') {
+            e.preventDefault();
+            sendMessage();
+        }
+    });
+
+    clearChatBtn.addEventListener('click', () => {
+        if (confirm('Clear all chat messages?')) {
+            aiChat.innerHTML = `
+                <div class="message ai">
+                    <strong>AI Tutor:</strong><br>
+                    Hello Raj! I'm your AI learning assistant. I can help you with:<br>
+                    <ul style="margin-top: 0.5rem; margin-left: 1.5rem;">
+                        <li>Explaining difficult concepts</li>
+                        <li>Solving practice problems</li>
+                        <li>Study tips and strategies</li>
+                        <li>Assignment guidance</li>
+                    </ul>
+                    What would you like to learn today?
+                </div>
+            `;
+            showToast('Chat cleared', 'info');
+        }
+    });
+
+    console.log('✅ AI Tutor initialized');
+}
+
+// Initialize AI Tutor when page loads
+setTimeout(initAiTutor, 1000);
+
+// ============ BACKEND INTEGRATION ============
+
+// Load real data from Flask backend
+function loadDashboardData() {
+    // One request for every section, read in a single transaction
+    fetch('/api/student/dashboard')
+        .then(response => response.json())
+        .then(data => {
+            if (!data.success) return;
+            updateCoursesSection(data.courses.courses);
+            updateAttendanceSection(data.attendance.stats, data.attendance.records);
+            updateGradesSection(data.grades.grades, data.grades.gpa, data.grades.grade_distribution);
+            updateAssignmentsSection(data.assignments.pending, data.assignments.completed, data.assignments.overdue);
+            latestNotifications = data.notifications.notifications;
+            updateNotificationsSection(latestNotifications, data.notifications.unread_count);
+            updatePerformanceChart(data.performance.performance);
+        })
+        .catch(error => console.log('Using demo data for dashboard'));
+}
+
+function updateCoursesSection(courses) {
+    const grid = document.querySelector('#courses .course-grid');
+    if (!grid || !courses || courses.length === 0) return;
+
+    grid.innerHTML = courses.map(course => `
+        <div class="course-card">
+            <div class="course-header">
+                <span class="course-icon">${getCourseIcon(course.course_name)}</span>
+                <span class="badge badge-success">Active</span>
+            </div>
+            <h3 style="font-size: 1.3rem; margin-bottom: 0.5rem;">${course.course_name}</h3>
+            <p style="color: var(--text-secondary); font-size: 0.9rem; margin-bottom: 1rem;">${course.teacher_name || 'Instructor'}</p>
+            <div style="display: flex; justify-content: space-between; margin-bottom: 0.5rem;">
+                <span style="font-size: 0.85rem; color: var(--text-secondary);">Attendance</span>
+                <span style="font-size: 0.85rem; font-weight: 700;">${course.attendance_percentage || 0}%</span>
+            </div>
+            <div class="course-progress">
+                <div class="course-progress-bar" style="width: ${course.attendance_percentage || 0}%"></div>
+            </div>
+        </div>
+    `).join('');
+}
+
+function getCourseIcon(courseName) {
+    const name = courseName.toLowerCase();
+    if (name.includes('data') || name.includes('algorithm')) return '💻';
+    if (name.includes('machine') || name.includes('ai')) return '🤖';
+    if (name.includes('database') || name.includes('sql')) return '🗄️';
+    if (name.includes('web')) return '🌐';
+    if (name.includes('security') || name.includes('cyber')) return '🔐';
+    if (name.includes('analytics') || name.includes('data')) return '📊';
+    return '📚';
+}
+
+function updateAttendanceSection(stats, records) {
+    if (!stats || !records) return;
+
+    // Update stats cards
+    const statCards = document.querySelectorAll('#attendance .stat-card');
+    if (statCards.length >= 3) {
+        statCards[0].querySelector('.stat-value').textContent = `${stats.attendance_percentage || 0}%`;
+        statCards[1].querySelector('.stat-value').textContent = `${stats.present_count || 0}/${stats.total_classes || 0}`;
+        statCards[2].querySelector('.stat-value').textContent = stats.absent_count || 0;
+    }
+
+    // Update attendance table
+    const tbody = document.querySelector('#attendance tbody');
+    if (tbody && records.length > 0) {
+        tbody.innerHTML = records.slice(0, 10).map(record => `
+            <tr>
+                <td>${formatDate(record.date)}</td>
+                <td>${record.course_name}</td>
+                <td>${formatTime(record.timestamp)}</td>
+                <td><span class="badge badge-${record.status === 'present' ? 'success' : 'danger'}">${capitalize(record.status)}</span></td>
+                <td>${record.method === 'face_recognition' ? 'Face Recognition' : 'Manual'}</td>
+            </tr>
+        `).join('');
+    }
+}
+
+function updateGradesSection(grades, gpa, distribution) {
+    if (!grades) return;
+
+    // Update GPA in stat cards
+    const gpaCard = document.querySelectorAll('.stat-card')[2];
+    if (gpaCard) {
+        gpaCard.querySelector('.stat-value').textContent = gpa.toFixed(1);
+    }
+
+    // Update grades table
+    const tbody = document.querySelector('#grades tbody');
+    if (tbody && grades.length > 0) {
+        tbody.innerHTML = grades.slice(0, 10).map(grade => `
+            <tr>
+                <td>${grade.course_name}</td>
+                <td>${grade.exam_type}</td>
+                <td>${grade.marks}/${grade.max_marks}</td>
+                <td><span class="badge badge-success">${grade.grade}</span></td>
+                <td>${formatDate(grade.exam_date)}</td>
+            </tr>
+        `).join('');
+    }
+
+    // Update grades chart with distribution
+    if (distribution) {
+        updateGradesChartData(distribution);
+    }
+}
+
+function updateGradesChartData(distribution) {
+    const ctx = document.getElementById('gradesChart');
+    if (!ctx) return;
+
+    if (gradesChartInstance) {
+        gradesChartInstance.destroy();
+    }
+
+    const labels = Object.keys(distribution);
+    const data = Object.values(distribution);
+
+    gradesChartInstance = new Chart(ctx, {
+        type: 'bar',
+        data: {
+            labels: labels,
+            datasets: [{
+                label: 'Number of Grades',
+                data: data,
+                backgroundColor: labels.map((_, i) => {
+                    const colors = [
+                        'rgba(16, 185, 129, 0.8)',
+                        'rgba(16, 185, 129, 0.7)',
+                        'rgba(16, 185, 129, 0.6)',
+                        'rgba(59, 130, 246, 0.6)',
+                        'rgba(59, 130, 246, 0.5)',
+                        'rgba(59, 130, 246, 0.4)'
+                    ];
+                    return colors[i] || 'rgba(102, 126, 234, 0.5)';
+                }),
+                borderColor: 'rgba(255, 255, 255, 0.2)',
+                borderWidth: 1
+            }]
+        },
+        options: {
+            responsive: true,
+            maintainAspectRatio: false,
+            plugins: {
+                legend: { display: false }
+            },
+            scales: {
+                y: {
+                    beginAtZero: true,
+                    grid: { color: 'rgba(255, 255, 255, 0.1)' },
+                    ticks: { color: '#fff', stepSize: 1, font: { size: 12 } }
+                },
+                x: {
+                    grid: { color: 'rgba(255, 255, 255, 0.1)' },
+                    ticks: { color: '#fff', font: { size: 12 } }
+                }
+            }
+        }
+    });
+}
+
+function updateAssignmentsSection(pending, completed, overdue) {
+    const container = document.querySelector('#assignments .content-card:first-child');
+    if (!container) return;
+
+    let html = '<div class="card-header"><h2 class="card-title">📝 Assignments</h2><button class="btn btn-secondary">Filter</button></div>';
+
+    if (overdue && overdue.length > 0) {
+        overdue.forEach(assignment => {
+            html += createAssignmentCard(assignment, 'danger', 'Overdue');
+        });
+    }
+
+    if (pending && pending.length > 0) {
+        pending.forEach(assignment => {
+            const daysUntilDue = getDaysUntilDue(assignment.due_date);
+            const badge = daysUntilDue <= 1 ? 'danger' : 'warning';
+            const label = daysUntilDue === 0 ? 'Due Today' : daysUntilDue === 1 ? 'Due Tomorrow' : `Due in ${daysUntilDue} days`;
+            html += createAssignmentCard(assignment, badge, label);
+        });
+    }
+
+    if (completed && completed.length > 0) {
+        completed.forEach(assignment => {
+            html += createAssignmentCard(assignment, 'success', 'Submitted');
+        });
+    }
+
+    container.innerHTML = html;
+}
+
+function createAssignmentCard(assignment, badgeType, badgeLabel) {
+    return `
+        <div class="assignment-item">
+            <div class="assignment-header">
+                <div>
+                    <h3 style="font-size: 1.2rem; margin-bottom: 0.3rem;">${assignment.title}</h3>
+                    <p style="color: var(--text-secondary); font-size: 0.9rem;">${assignment.course_name}</p>
+                </div>
+                <span class="badge badge-${badgeType}">${badgeLabel}</span>
+            </div>
+            <p style="color: var(--text-secondary); margin-bottom: 1rem;">${assignment.description || 'No description provided'}</p>
+            <div style="display: flex; gap: 1rem; align-items: center;">
+                <span style="font-size: 0.85rem;">📅 Due: ${formatDate(assignment.due_date)}</span>
+                <span style="font-size: 0.85rem;">📊 Max: ${assignment.max_marks} marks</span>
+                ${assignment.submission_status !== 'submitted' ? 
+                    '<button class="btn btn-primary" style="margin-left: auto; padding: 0.7rem 1.5rem;">Submit</button>' : 
+                    `<span style="margin-left: auto; color: var(--success);">✅ Score: ${assignment.obtained_marks || 'Pending'}</span>`}
+            </div>
+        </div>
+    `;
+}
+
+function updateNotificationsSection(notifications, unreadCount) {
+    const container = document.querySelector('#notifications .content-card > div');
+    if (!container || !notifications) return;
+
+    // Update badge
+    const badges = document.querySelectorAll('.notification-badge');
+    badges.forEach(badge => {
+        if (badge.closest('.nav-link[data-section="notifications"]')) {
+            badge.textContent = unreadCount;
+            badge.style.display = unreadCount > 0 ? 'block' : 'none';
+        }
+    });
+
+    container.innerHTML = notifications.map(notif => {
+        const typeColors = {
+            'success': 'success',
+            'warning': 'warning',
+            'error': 'danger',
+            'info': 'info'
+        };
+        const borderColor = typeColors[notif.type] || 'info';
+        const icon = notif.type === 'success' ? '✅' : notif.type === 'warning' ? '⚠️' : notif.type === 'error' ? '❌' : 'ℹ️';
+
+        return `
+            <div style="background: rgba(${getBgColor(notif.type)}); border: 1px solid var(--${borderColor}); border-radius: 12px; padding: 1.5rem; border-left: 4px solid var(--${borderColor}); ${notif.is_read ? 'opacity: 0.6;' : ''}">
+                <div style="display: flex; justify-content: space-between; align-items: start; margin-bottom: 0.5rem;">
+                    <h3 style="font-size: 1.1rem; font-weight: 700;">${icon} ${notif.title}</h3>
+                    <span style="font-size: 0.85rem; color: var(--text-secondary);">${formatTimeAgo(notif.created_at)}</span>
+                </div>
+                <p style="color: var(--text-secondary);">${notif.message}</p>
+            </div>
+        `;
+    }).join('');
+}
+
+function updatePerformanceChart(performance) {
+    const ctx = document.getElementById('performanceChart');
+    if (!ctx || !performance) return;
+
+    if (performanceChartInstance) {
+        performanceChartInstance.destroy();
+    }
+
+    performanceChartInstance = new Chart(ctx, {
+        type: 'line',
+        data: {
+            labels: performance.map(p => p.week),
+            datasets: [{
+                label: 'Performance Score',
+                data: performance.map(p => p.score),
+                // Weeks without grades are null; draw across them
+                spanGaps: true,
+                borderColor: '#667eea',
+                backgroundColor: 'rgba(102, 126, 234, 0.1)',
+                tension: 0.4,
+                fill: true,
+                borderWidth: 3,
+                pointRadius: 5,
+                pointBackgroundColor: '#667eea',
+                pointBorderColor: '#fff',
+                pointBorderWidth: 2
+            }]
+        },
+        options: {
+            responsive: true,
+            maintainAspectRatio: false,
+            plugins: {
+                legend: { 
+                    display: true,
+                    labels: { color: '#fff', font: { size: 14 } }
+                }
+            },
+            scales: {
+                y: {
+                    beginAtZero: true,
+                    max: 100,
+                    grid: { color: 'rgba(255, 255, 255, 0.1)' },
+                    ticks: { color: '#fff', font: { size: 12 } }
+                },
+                x: {
+                    grid: { color: 'rgba(255, 255, 255, 0.1)' },
+                    ticks: { color: '#fff', font: { size: 12 } }
+                }
+            }
+        }
+    });
+}
+
+// Enhanced AI Tutor with backend integration
+function initAiTutorWithBackend() {
+    const aiChat = document.getElementById('aiChat');
+    const aiInput = document.getElementById('aiInput');
+    const sendBtn = document.getElementById('sendAiMessage');
+    const clearChatBtn = document.getElementById('clearChat');
+
+    if (!aiChat || !aiInput || !sendBtn || !clearChatBtn) return;
+
+    function sendMessage() {
+        const text = aiInput.value.trim();
+        if (!text) {
+            showToast('Please enter a message', 'warning');
+            return;
+        }
+
+        addMessage(text, true);
+        aiInput.value = '';
+        aiInput.focus();
+
+        // Show typing indicator
+        const typingMsg = document.createElement('div');
+        typingMsg.className = 'message ai';
+        typingMsg.id = 'typing-indicator';
+        typingMsg.innerHTML = '<strong>AI Tutor:</strong><br>Thinking...';
+        aiChat.appendChild(typingMsg);
+        aiChat.scrollTop = aiChat.scrollHeight;
+
+        // Call backend API
+        fetch('/student/chat', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json'
+            },
+            body: JSON.stringify({ message: text, type: 'general' })
+        })
+        .then(response => response.json())
+        .then(data => {
+            const typingIndicator = document.getElementById('typing-indicator');
+            if (typingIndicator) {
+                typingIndicator.remove();
+            }
+
+            if (data.status === 'success') {
+                addMessage(data.response, false);
+            } else {
+                addMessage('Sorry, I encountered an error. Please try again.', false);
+            }
+        })
+        .catch(error => {
+            console.log('Using demo AI responses');
+            const typingIndicator = document.getElementById('typing-indicator');
+            if (typingIndicator) {
+                typingIndicator.remove();
+            }
+            addMessage(getAiResponse(text), false);
+        });
+    }
+
+    function addMessage(text, isUser) {
+        const msg = document.createElement('div');
+        msg.className = `message ${isUser ? 'user' : 'ai'}`;
+        msg.innerHTML = isUser ? text.replace(/\n/g, '<br>') : `<strong>AI Tutor:</strong><br>${text.replace(/\n/g, '<br>')}`;
+        aiChat.appendChild(msg);
+        aiChat.scrollTop = aiChat.scrollHeight;
+    }
+
+    sendBtn.addEventListener('click', sendMessage);
+    aiInput.addEventListener('keypress', (e) => {
+        if (e.key === 'Enter') {
+            e.preventDefault();
+            sendMessage();
+        }
+    });
+
+    clearChatBtn.addEventListener('click', () => {
+        if (confirm('Clear all chat messages?')) {
+            aiChat.innerHTML = `
+                <div class="message ai">
+                    <strong>AI Tutor:</strong><br>
+                    Hello! I'm your AI learning assistant. How can I help you today?
+                </div>
+            `;
+            showToast('Chat cleared', 'info');
+        }
+    });
+}
+
+// Utility functions
+function formatDate(dateStr) {
+    if (!dateStr) return 'N/A';
+    const date = new Date(dateStr);
+    return date.toLocaleDateString('en-US', { month: 'short', day: 'numeric', year: 'numeric' });
+}
+
+function formatTime(timestamp) {
+    if (!timestamp) return 'N/A';
+    const date = new Date(timestamp);
+    return date.toLocaleTimeString('en-US', { hour: '2-digit', minute: '2-digit' });
+}
+
+function formatTimeAgo(timestamp) {
+    if (!timestamp) return 'Recently';
+    const date = new Date(timestamp);
+    const now = new Date();
+    const diff = now - date;
+    const hours = Math.floor(diff / 3600000);
+    const days = Math.floor(hours / 24);
+
+    if (days > 0) return `${days} day${days > 1 ? 's' : ''} ago`;
+    if (hours > 0) return `${hours} hour${hours > 1 ? 's' : ''} ago`;
+    return 'Just now';
+}
+
+function getDaysUntilDue(dueDate) {
+    const due = new Date(dueDate);
+    const today = new Date();
+    today.setHours(0, 0, 0, 0);
+    due.setHours(0, 0, 0, 0);
+    const diff = due - today;
+    return Math.ceil(diff / (1000 * 60 * 60 * 24));
+}
+
+function capitalize(str) {
+    return str.charAt(0).toUpperCase() + str.slice(1);
+}
+
+function getBgColor(type) {
+    const colors = {
+        'success': '16, 185, 129, 0.1',
+        'warning': '245, 158, 11, 0.1',
+        'error': '239, 68, 68, 0.1',
+        'info': '59, 130, 246, 0.1'
+    };
+    return colors[type] || colors.info;
+}
+
+// Enhanced face attendance with backend
+document.getElementById('markFaceAttendance').addEventListener('click', () => {
+    const courses = document.querySelectorAll('.course-card');
+    if (courses.length === 0) {
+        showToast('No courses found. Please enroll in courses first.', 'warning');
+        return;
+    }
+
+    // For demo, use first course
+    const courseId = 1; // You can make this dynamic with a course selector
+    const confidence = detectedFaces > 0 ? 98.7 : 96.4;
+
+    document.getElementById('faceStatusText').textContent = '⏳ Processing...';
+
+    fetch('/api/student/face-attendance', {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json'
+        },
+        body: JSON.stringify({
+            course_id: courseId,
+            confidence: confidence
+        })
+    })
+    .then(response => response.json())
+    .then(data => {
+        if (data.success) {
+            const now = new Date();
+            const timeStr = now.toLocaleTimeString('en-US', { hour: '2-digit', minute: '2-digit' });
+            const dateStr = now.toLocaleDateString('en-US', { month: 'short', day: 'numeric', year: 'numeric' });
+
+            const resultDiv = document.getElementById('faceRecognitionResult');
+            resultDiv.innerHTML = `
+                <div class="face-result">
+                    <div style="font-size: 5rem; margin-bottom: 1rem;">✅</div>
+                    <h3 style="color: var(--success); margin-bottom: 1rem; font-size: 1.8rem; font-weight: 900;">Attendance Verified!</h3>
+                    <div style="background: rgba(255, 255, 255, 0.05); padding: 2rem; border-radius: 16px; margin-top: 1.5rem; border: 1px solid var(--border);">
+                        <p style="color: var(--text); margin: 0.8rem 0; font-size: 1.05rem;"><strong>🕐 Time:</strong> ${timeStr}</p>
+                        <p style="color: var(--text); margin: 0.8rem 0; font-size: 1.05rem;"><strong>📅 Date:</strong> ${dateStr}</p>
+                        <p style="color: var(--success); margin: 0.8rem 0; font-size: 1.05rem; font-weight: 700;"><strong>🎯 Confidence:</strong> ${confidence}%</p>
+                    </div>
+                </div>
+            `;
+
+            document.getElementById('faceStatusText').textContent = '✅ Attendance recorded!';
+            showToast('Attendance marked successfully!', 'success');
+
+            // Attendance section refreshes from the 'attendance' event
+        } else {
+            showToast(data.message || 'Failed to mark attendance', 'error');
+            document.getElementById('faceStatusText').textContent = '❌ Failed to mark attendance';
+        }
+    })
+    .catch(error => {
+        console.error('Error:', error);
+        showToast('Error marking attendance', 'error');
+        document.getElementById('faceStatusText').textContent = '❌ Error occurred';
+    });
+});
+
+// Live updates pushed by the server instead of polling
+let latestNotifications = [];
+
+function refreshAttendance() {
+    fetch('/api/student/dashboard?sections=attendance,courses')
+        .then(response => response.json())
+        .then(data => {
+            if (data.success) {
+                updateAttendanceSection(data.attendance.stats, data.attendance.records);
+                updateCoursesSection(data.courses.courses);
+            }
+        });
+}
+
+function connectEventStream() {
+    if (!window.EventSource) return;
+    // EventSource reconnects on its own and sends Last-Event-ID,
+    // so missed events are replayed by the server
+    const events = new EventSource('/api/events');
+
+    events.addEventListener('notification', event => {
+        const notification = JSON.parse(event.data);
+        latestNotifications = [notification, ...latestNotifications].slice(0, 20);
+        const badge = document.querySelector('.nav-link[data-section="notifications"] .notification-badge');
+        updateNotificationsSection(latestNotifications, badge ? Number(badge.textContent) || 0 : 0);
+        showToast(notification.title, notification.type === 'error' ? 'error' : 'info');
+    });
+
+    events.addEventListener('unread_count', event => {
+        const { unread_count } = JSON.parse(event.data);
+        const badge = document.querySelector('.nav-link[data-section="notifications"] .notification-badge');
+        if (badge) {
+            badge.textContent = unread_count;
+            badge.style.display = unread_count > 0 ? 'block' : 'none';
+        }
+    });
+
+    events.addEventListener('attendance', refreshAttendance);
+
+    // The server could not replay what we missed; reload everything
+    events.addEventListener('resync', loadDashboardData);
+
+    // A busy server answers 503, which EventSource does not retry by itself
+    events.onerror = () => {
+        if (events.readyState === EventSource.CLOSED) {
+            setTimeout(connectEventStream, 5000 + Math.random() * 5000);
+        }
+    };
+}
+
+// Initialize everything
+setTimeout(() => {
+    loadDashboardData();
+    initAiTutorWithBackend();
+    connectEventStream();
+}, 1000);
+
+// Face Recognition
+let faceVideo, faceCanvas, faceDisplaySize;
+let isFaceModelLoaded = false;
+let isFaceCameraActive = false;
+let faceDetectionInterval;
+let detectedFaces = 0;
+
+async function loadFaceModels() {
+    const statusDot = document.getElementById('faceStatusDot');
+    const statusText = document.getElementById('faceStatusText');
+
+    try {
+        statusText.textContent = '🔄 Loading AI models...';
+
+        const MODEL_URL = 'https://cdn.jsdelivr.net/npm/@vladmandic/face-api/model';
+
+        await Promise.all([
+            faceapi.nets.tinyFaceDetector.loadFromUri(MODEL_URL),
+            faceapi.nets.faceLandmark68Net.loadFromUri(MODEL_URL),
+            faceapi.nets.faceRecognitionNet.loadFromUri(MODEL_URL),
+            faceapi.nets.faceExpressionNet.loadFromUri(MODEL_URL)
+        ]);
+
+        isFaceModelLoaded = true;
+        statusDot.className = 'status-dot ready';
+        statusText.textContent = '✅ AI System Ready! Click "Start Camera" to begin.';
+        document.getElementById('startFaceCamera').disabled = false;
+        showToast('Face recognition ready!', 'success');
+    } catch (error) {
+        statusDot.className = 'status-dot ready';
+        statusText.textContent = '✅ Demo Mode Ready! Click "Start Camera" to begin.';
+        isFaceModelLoaded = true;
+        document.getElementById('startFaceCamera').disabled = false;
+    }
+}
+
+document.getElementById('startFaceCamera').addEventListener('click', async () => {
+    faceVideo = document.getElementById('faceVideo');
+    faceCanvas = document.getElementById('faceCanvas');
+    const statusDot = document.getElementById('faceStatusDot');
+    const statusText = document.getElementById('faceStatusText');
+
+    try {
+        const stream = await navigator.mediaDevices.getUserMedia({ 
+            video: { 
+                width: { ideal: 1280 },
+                height: { ideal: 720 },
+                facingMode: 'user'
+            } 
+        });
+
+        faceVideo.srcObject = stream;
+        isFaceCameraActive = true;
+
+        document.getElementById('faceVideoContainer').style.display = 'block';
+        statusDot.className = 'status-dot detecting';
+        statusText.textContent = '🎥 Camera Active - Detecting faces...';
+
+        document.getElementById('startFaceCamera').disabled = true;
+        document.getElementById('markFaceAttendance').disabled = false;
+        document.getElementById('markFaceAttendance').style.display = 'inline-flex';
+        document.getElementById('stopFaceCamera').disabled = false;
+        document.getElementById('stopFaceCamera').style.display = 'inline-flex';
+
+        showToast('Camera activated!', 'success');
+
+        faceVideo.addEventListener('loadedmetadata', () => {
+            faceCanvas.width = faceVideo.videoWidth;
+            faceCanvas.height = faceVideo.videoHeight;
+            faceDisplaySize = { width: faceVideo.videoWidth, height: faceVideo.videoHeight };
+
+            if (typeof faceapi !== 'undefined' && faceapi.nets && faceapi.nets.tinyFaceDetector && faceapi.nets.tinyFaceDetector.isLoaded) {
+                faceapi.matchDimensions(faceCanvas, faceDisplaySize);
+                startFaceDetection();
+            } else {
+                startDemoMode();
+            }
+        });
+
+    } catch (error) {
+        statusDot.className = 'status-dot error';
+        statusText.textContent = '❌ Camera access denied. Please enable camera permissions.';
+        showToast('Camera access denied!', 'error');
+    }
+});
+
+function startFaceDetection() {
+    faceDetectionInterval = setInterval(async () => {
+        try {
+            const detections = await faceapi
+                .detectAllFaces(faceVideo, new faceapi.TinyFaceDetectorOptions({
+                    inputSize: 416,
+                    scoreThreshold: 0.5
+                }))
+                .withFaceLandmarks()
+                .withFaceExpressions();
+
+            const resized = faceapi.resizeResults(detections, faceDisplaySize);
+
+            const ctx = faceCanvas.getContext('2d');
+            ctx.clearRect(0, 0, faceCanvas.width, faceCanvas.height);
+
+            resized.forEach(detection => {
+                const box = detection.detection.box;
+
+                ctx.strokeStyle = '#667eea';
+                ctx.lineWidth = 3;
+                ctx.shadowBlur = 15;
+                ctx.shadowColor = '#667eea';
+                ctx.strokeRect(box.x, box.y, box.width, box.height);
+
+                const cornerLength = 25;
+                ctx.lineWidth = 5;
+
+                ctx.beginPath();
+                ctx.moveTo(box.x, box.y + cornerLength);
+                ctx.lineTo(box.x, box.y);
+                ctx.lineTo(box.x + cornerLength, box.y);
+                ctx.stroke();
+
+                ctx.beginPath();
+                ctx.moveTo(box.x + box.width - cornerLength, box.y);
+                ctx.lineTo(box.x + box.width, box.y);
+                ctx.lineTo(box.x + box.width, box.y + cornerLength);
+                ctx.stroke();
+
+                ctx.beginPath();
+                ctx.moveTo(box.x, box.y + box.height - cornerLength);
+                ctx.lineTo(box.x, box.y + box.height);
+                ctx.lineTo(box.x + cornerLength, box.y + box.height);
+                ctx.stroke();
+
+                ctx.beginPath();
+                ctx.moveTo(box.x + box.width - cornerLength, box.y + box.height);
+                ctx.lineTo(box.x + box.width, box.y + box.height);
+                ctx.lineTo(box.x + box.width, box.y + box.height - cornerLength);
+                ctx.stroke();
+
+                ctx.shadowBlur = 0;
+
+                const score = Math.round(detection.detection.score * 100);
+                ctx.fillStyle = '#667eea';
+                ctx.fillRect(box.x, box.y - 35, 140, 30);
+                ctx.fillStyle = 'white';
+                ctx.font = 'bold 16px Inter';
+                ctx.fillText(`Match: ${score}%`, box.x + 10, box.y - 12);
+            });
+
+            detectedFaces = detections.length;
+
+            if (detections.length > 0) {
+                const confidence = Math.round(detections[0].detection.score * 100);
+                document.getElementById('faceStatusText').textContent = 
+                    `✅ Face Detected! Confidence: ${confidence}%`;
+            } else {
+                document.getElementById('faceStatusText').textContent = 
+                    '⚠️ No face detected - Look at camera';
+            }
+        } catch (error) {
+            console.error('Detection error:', error);
+        }
+    }, 100);
+}
+
+function startDemoMode() {
+    const ctx = faceCanvas.getContext('2d');
+    let pulse = 0;
+    let scanLine = 0;
+
+    faceDetectionInterval = setInterval(() => {
+        ctx.clearRect(0, 0, faceCanvas.width, faceCanvas.height);
+
+        pulse = (pulse + 0.05) % (Math.PI * 2);
+        const opacity = 0.7 + Math.sin(pulse) * 0.3;
+
+        const boxSize = 320;
+        const x = faceCanvas.width / 2 - boxSize / 2;
+        const y = faceCanvas.height / 2 - boxSize / 2;
+
+        ctx.strokeStyle = `rgba(102, 126, 234, ${opacity})`;
+        ctx.lineWidth = 4;
+        ctx.shadowBlur = 20;
+        ctx.shadowColor = '#667eea';
+        ctx.strokeRect(x, y, boxSize, boxSize);
+
+        ctx.shadowBlur = 0;
+
+        scanLine = (scanLine + 4) % boxSize;
+        ctx.strokeStyle = `rgba(102, 126, 234, 0.7)`;
+        ctx.lineWidth = 3;
+        ctx.shadowBlur = 10;
+        ctx.shadowColor = '#667eea';
+        ctx.beginPath();
+        ctx.moveTo(x, y + scanLine);
+        ctx.lineTo(x + boxSize, y + scanLine);
+        ctx.stroke();
+
+        ctx.shadowBlur = 0;
+        ctx.fillStyle = 'rgba(102, 126, 234, 0.9)';
+        ctx.fillRect(x, y - 40, 220, 35);
+        ctx.fillStyle = 'white';
+        ctx.font = 'bold 18px Inter';
+        ctx.fillText('🔍 Scanning...', x + 15, y - 15);
+
+        document.getElementById('faceStatusText').textContent = 
+            '✅ Demo Mode: Ready to mark attendance';
+    }, 50);
+}
+
+document.getElementById('markFaceAttendance').addEventListener('click', () => {
+    const resultDiv = document.getElementById('faceRecognitionResult');
+    const now = new Date();
+    const timeStr = now.toLocaleTimeString('en-US', { hour: '2-digit', minute: '2-digit' });
+    const dateStr = now.toLocaleDateString('en-US', { month: 'short', day: 'numeric', year: 'numeric' });
+
+    document.getElementById('faceStatusText').textContent = '⏳ Processing...';
+
+    setTimeout(() => {
+        const confidence = detectedFaces > 0 ? '98.7%' : '96.4%';
+
+        resultDiv.innerHTML = `
+            <div class="face-result">
+                <div style="font-size: 5rem; margin-bottom: 1rem;">✅</div>
+                <h3 style="color: var(--success); margin-bottom: 1rem; font-size: 1.8rem; font-weight: 900;">Attendance Verified!</h3>
+                <div style="background: rgba(255, 255, 255, 0.05); padding: 2rem; border-radius: 16px; margin-top: 1.5rem; border: 1px solid var(--border);">
+                    <p style="color: var(--text); margin: 0.8rem 0; font-size: 1.05rem;"><strong>👤 Student:</strong> Raj Kumar (ID: #S001)</p>
+                    <p style="color: var(--text); margin: 0.8rem 0; font-size: 1.05rem;"><strong>📚 Course:</strong> Data Structures</p>
+                    <p style="color: var(--text); margin: 0.8rem 0; font-size: 1.05rem;"><strong>🕐 Time:</strong> ${timeStr}</p>
+                    <p style="color: var(--text); margin: 0.8rem 0; font-size: 1.05rem;"><strong>📅 Date:</strong> ${dateStr}</p>
+                    <p style="color: var(--success); margin: 0.8rem 0; font-size: 1.05rem; font-weight: 700;"><strong>🎯 Confidence:</strong> ${confidence}</p>
+                </div>
+            </div>
+        `;
+
+        const tbody = document.getElementById('faceAttendanceHistory');
+        const newRow = tbody.insertRow(0);
+        newRow.innerHTML = `
+            <td>${dateStr}</td>
+            <td>Data Structures</td>
+            <td>${timeStr}</td>
+            <td>Face Recognition</td>
+            <td><span class="badge badge-success">Present</span></td>
+        `;
+        newRow.style.animation = 'fadeIn 0.5s';
+
+        document.getElementById('faceStatusText').textContent = '✅ Attendance recorded!';
+        showToast('Attendance marked successfully!', 'success');
+    }, 1500);
+});
+
+document.getElementById('stopFaceCamera').addEventListener('click', () => {
+    if (faceVideo && faceVideo.srcObject) {
+        faceVideo.srcObject.getTracks().forEach(track => track.stop());
+        isFaceCameraActive = false;
+
+        clearInterval(faceDetectionInterval);
+
+        const ctx = faceCanvas.getContext('2d');
+        ctx.clearRect(0, 0, faceCanvas.width, faceCanvas.height);
+
+        document.getElementById('faceVideoContainer').style.display = 'none';
+        document.getElementById('faceStatusDot').className = 'status-dot ready';
+        document.getElementById('faceStatusText').textContent = '⏹️ Camera stopped';
+
+        document.getElementById('startFaceCamera').disabled = false;
+        document.getElementById('markFaceAttendance').disabled = true;
+        document.getElementById('markFaceAttendance').style.display = 'none';
+        document.getElementById('stopFaceCamera').disabled = true;
+        document.getElementById('stopFaceCamera').style.display = 'none';
+
+        document.getElementById('faceRecognitionResult').innerHTML = '';
+        showToast('Camera stopped', 'info');
+    }
+});
+
+// Initialize Face Recognition
+if (typeof faceapi !== 'undefined') {
+    loadFaceModels();
+} else {
+    setTimeout(() => {
+        document.getElementById('faceStatusDot').className = 'status-dot ready';
+        document.getElementById('faceStatusText').textContent = '✅ System ready!';
+        document.getElementById('startFaceCamera').disabled = false;
+        isFaceModelLoaded = true;
+    }, 1000);
+}
+
+window.addEventListener('beforeunload', () => {
+    if (faceVideo && faceVideo.srcObject) {
+        faceVideo.srcObject.getTracks().forEach(track => track.stop());
+    }
+});
+
+console.log('🎓 SaarthiAI Dashboard - All Systems Ready');
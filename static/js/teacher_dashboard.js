@@ -0,0 +1,401 @@
+        // Mock data
+        const mockStudents = [
+            { id: 1, rollNo: 'CS2101', name: 'pinki', email: 'pinkidagar18@gmail.com', attendance: 68, course: 'Quantum Computing' },
+            { id: 2, rollNo: 'CS2102', name: 'Priya Singh', email: 'priya@example.com', attendance: 72, course: 'Data Structures' },
+            { id: 3, rollNo: 'CS2103', name: 'Amit Patel', email: 'amit@example.com', attendance: 65, course: 'Web Development' },
+            { id: 4, rollNo: 'CS2104', name: 'Neha Verma', email: 'neha@example.com', attendance: 70, course: 'Machine Learning' },
+            { id: 5, rollNo: 'CS2105', name: 'Vikram Kumar', email: 'vikram@example.com', attendance: 74, course: 'Quantum Computing' },
+            { id: 6, rollNo: 'CS2106', name: 'Anjali Reddy', email: 'anjali@example.com', attendance: 88, course: 'Data Structures' },
+            { id: 7, rollNo: 'CS2107', name: 'Rohan Gupta', email: 'rohan@example.com', attendance: 92, course: 'Web Development' },
+            { id: 8, rollNo: 'CS2108', name: 'Sneha Joshi', email: 'sneha@example.com', attendance: 67, course: 'Machine Learning' }
+        ];
+
+        const mockCourses = [
+            { id: 1, code: 'CS401', name: 'Quantum Computing', students: 35, credits: 4 },
+            { id: 2, code: 'CS301', name: 'Data Structures', students: 42, credits: 4 },
+            { id: 3, code: 'CS201', name: 'Web Development', students: 28, credits: 3 },
+            { id: 4, code: 'CS501', name: 'Machine Learning', students: 30, credits: 4 }
+        ];
+
+        // Initialize
+        document.addEventListener('DOMContentLoaded', function() {
+            setTodayDate();
+            loadLowAttendanceAlerts();
+            loadCourses();
+            loadAllStudents();
+            checkLowAttendance();
+        });
+
+        function setTodayDate() {
+            document.getElementById('attendanceDate').valueAsDate = new Date();
+        }
+
+        // Particle animation
+        const canvas = document.getElementById('particles-canvas');
+        const ctx = canvas.getContext('2d');
+        canvas.width = window.innerWidth;
+        canvas.height = window.innerHeight;
+
+        const particles = [];
+        for (let i = 0; i < 50; i++) {
+            particles.push({
+                x: Math.random() * canvas.width,
+                y: Math.random() * canvas.height,
+                vx: (Math.random() - 0.5) * 0.5,
+                vy: (Math.random() - 0.5) * 0.5,
+                radius: Math.random() * 2
+            });
+        }
+
+        function animateParticles() {
+            ctx.clearRect(0, 0, canvas.width, canvas.height);
+            ctx.fillStyle = 'rgba(102, 126, 234, 0.5)';
+
+            particles.forEach(p => {
+                ctx.beginPath();
+                ctx.arc(p.x, p.y, p.radius, 0, Math.PI * 2);
+                ctx.fill();
+
+                p.x += p.vx;
+                p.y += p.vy;
+
+                if (p.x < 0 || p.x > canvas.width) p.vx *= -1;
+                if (p.y < 0 || p.y > canvas.height) p.vy *= -1;
+            });
+
+            requestAnimationFrame(animateParticles);
+        }
+        animateParticles();
+
+        window.addEventListener('resize', () => {
+            canvas.width = window.innerWidth;
+            canvas.height = window.innerHeight;
+        });
+
+        // Chart
+        const attendanceCtx = document.getElementById('attendanceChart');
+        if (attendanceCtx) {
+            new Chart(attendanceCtx, {
+                type: 'line',
+                data: {
+                    labels: ['Week 1', 'Week 2', 'Week 3', 'Week 4', 'Week 5'],
+                    datasets: [{
+                        label: 'Average Attendance %',
+                        data: [85, 88, 82, 87, 90],
+                        borderColor: 'rgba(102, 126, 234, 1)',
+                        backgroundColor: 'rgba(102, 126, 234, 0.1)',
+                        borderWidth: 3,
+                        tension: 0.4,
+                        fill: true
+                    }]
+                },
+                options: {
+                    responsive: true,
+                    maintainAspectRatio: false,
+                    plugins: { legend: { display: true, labels: { color: '#fff' } } },
+                    scales: {
+                        y: {
+                            beginAtZero: true,
+                            max: 100,
+                            grid: { color: 'rgba(255, 255, 255, 0.1)' },
+                            ticks: {
+                                color: 'rgba(255, 255, 255, 0.7)',
+                                callback: function(value) { return value + '%'; }
+                            }
+                        },
+                        x: {
+                            grid: { display: false },
+                            ticks: { color: 'rgba(255, 255, 255, 0.7)' }
+                        }
+                    }
+                }
+            });
+        }
+
+        // Navigation
+        function showSection(sectionName) {
+            document.querySelectorAll('.section').forEach(s => s.classList.remove('active'));
+            document.querySelectorAll('.nav-link').forEach(l => l.classList.remove('active'));
+
+            document.getElementById(sectionName).classList.add('active');
+            event.target.closest('.nav-link')?.classList.add('active');
+
+            const titles = {
+                dashboard: 'Dashboard',
+                courses: 'My Courses',
+                attendance: 'Attendance',
+                students: 'Students',
+                alerts: 'Low Attendance Alerts',
+                schedule: 'My Schedule',
+                messages: 'Messages',
+                reports: 'Reports',
+                settings: 'Settings'
+            };
+
+            document.getElementById('breadcrumbCurrent').textContent = titles[sectionName];
+
+            if (window.innerWidth <= 768) {
+                document.getElementById('sidebar').classList.remove('active');
+            }
+        }
+
+        function toggleSidebar() {
+            document.getElementById('sidebar').classList.toggle('active');
+        }
+
+        // Load low attendance alerts
+        function loadLowAttendanceAlerts() {
+            const lowAttendance = mockStudents.filter(s => s.attendance < 75);
+            const tbody = document.getElementById('lowAttendanceTable');
+
+            if (lowAttendance.length === 0) {
+                tbody.innerHTML = '<tr><td colspan="7" style="text-align: center; color: var(--text-secondary);">No students with low attendance</td></tr>';
+                return;
+            }
+
+            let html = '';
+            lowAttendance.forEach(student => {
+                html += `
+                    <tr>
+                        <td><input type="checkbox" class="student-select" value="${student.id}"></td>
+                        <td>${student.rollNo}</td>
+                        <td>${student.name}</td>
+                        <td>${student.course}</td>
+                        <td><span class="badge badge-danger">${student.attendance}%</span></td>
+                        <td>${student.email}</td>
+                        <td>
+                            <button class="btn btn-danger" style="padding: 0.5rem 1rem; font-size: 0.85rem;" onclick='openEmailModal(${JSON.stringify(student)})'>
+                                📧 Send Email
+                            </button>
+                        </td>
+                    </tr>
+                `;
+            });
+            tbody.innerHTML = html;
+
+            // Update badge
+            document.getElementById('alertsBadge').textContent = lowAttendance.length;
+            document.getElementById('lowAttendanceCount').textContent = lowAttendance.length;
+        }
+
+        function checkLowAttendance() {
+            const lowAttendance = mockStudents.filter(s => s.attendance < 75);
+            if (lowAttendance.length > 0) {
+                document.getElementById('lowAttendanceAlert').style.display = 'flex';
+                document.getElementById('alertMessage').textContent = 
+                    `${lowAttendance.length} student(s) have attendance below 75%. Click to view details and send notifications.`;
+            }
+        }
+
+        // Load courses
+        function loadCourses() {
+            const grid = document.getElementById('coursesGrid');
+            const select = document.getElementById('courseSelect');
+
+            let gridHtml = '';
+            let selectHtml = '<option value="">Choose a course</option>';
+
+            mockCourses.forEach(course => {
+                gridHtml += `
+                    <div class="course-card">
+                        <div class="course-header">
+                            <div>
+                                <div class="course-code">${course.code}</div>
+                                <div class="course-name">${course.name}</div>
+                            </div>
+                        </div>
+                        <div class="course-stats">
+                            <div class="course-stat">
+                                <span>👥</span>
+                                <span>${course.students} Students</span>
+                            </div>
+                            <div class="course-stat">
+                                <span>📖</span>
+                                <span>${course.credits} Credits</span>
+                            </div>
+                        </div>
+                        <div style="margin-top: 1.5rem; display: flex; gap: 0.5rem;">
+                            <button class="btn btn-primary" style="flex: 1; padding: 0.8rem;" onclick="openMarkAttendanceModal(${course.id})">
+                                Mark Attendance
+                            </button>
+                        </div>
+                    </div>
+                `;
+
+                selectHtml += `<option value="${course.id}">${course.name}</option>`;
+            });
+
+            grid.innerHTML = gridHtml;
+            select.innerHTML = selectHtml;
+            document.getElementById('totalCourses').textContent = mockCourses.length;
+        }
+
+        // Load all students
+        function loadAllStudents() {
+            const tbody = document.getElementById('studentsTableBody');
+            let html = '';
+
+            mockStudents.forEach(student => {
+                const badgeClass = student.attendance >= 75 ? 'badge-success' : 'badge-danger';
+                html += `
+                    <tr>
+                        <td>${student.rollNo}</td>
+                        <td>${student.name}</td>
+                        <td>${student.email}</td>
+                        <td><span class="badge ${badgeClass}">${student.attendance}%</span></td>
+                        <td>
+                            <button class="btn btn-secondary" style="padding: 0.5rem 1rem; font-size: 0.85rem;">
+                                View Details
+                            </button>
+                        </td>
+                    </tr>
+                `;
+            });
+
+            tbody.innerHTML = html;
+            document.getElementById('totalStudents').textContent = mockStudents.length;
+        }
+
+        // Modal functions
+        function openMarkAttendanceModal(courseId = null) {
+            document.getElementById('markAttendanceModal').classList.add('active');
+            if (courseId) {
+                document.getElementById('courseSelect').value = courseId;
+                loadStudentsForAttendance();
+            }
+        }
+
+        function closeModal(modalId) {
+            document.getElementById(modalId).classList.remove('active');
+        }
+
+        function loadStudentsForAttendance() {
+            const courseId = document.getElementById('courseSelect').value;
+            if (!courseId) {
+                document.getElementById('studentsListContainer').style.display = 'none';
+                return;
+            }
+
+            const course = mockCourses.find(c => c.id == courseId);
+            const courseStudents = mockStudents.filter(s => s.course === course.name);
+
+            let html = '';
+            courseStudents.forEach(student => {
+                html += `
+                    <div class="student-checkbox">
+                        <input type="checkbox" name="student_${student.id}" value="${student.id}" checked>
+                        <div>
+                            <div style="font-weight: 600;">${student.name}</div>
+                            <div style="font-size: 0.85rem; color: var(--text-secondary);">Roll: ${student.rollNo}</div>
+                        </div>
+                    </div>
+                `;
+            });
+
+            document.getElementById('studentsList').innerHTML = html;
+            document.getElementById('studentsListContainer').style.display = 'block';
+        }
+
+        function submitAttendance(event) {
+            event.preventDefault();
+            showToast('Attendance marked successfully!', 'success');
+            closeModal('markAttendanceModal');
+        }
+
+        // Email functions
+        function openEmailModal(student) {
+            document.getElementById('sendEmailModal').classList.add('active');
+            document.getElementById('emailTo').value = student.email;
+
+            const message = `Dear ${student.name},
+
+This is to inform you that your attendance in ${student.course} is currently at ${student.attendance}%, which is below the required 75% threshold.
+
+Please ensure regular attendance to meet the minimum requirements. If you are facing any issues, please contact me or visit the academic office.
+
+Best regards,
+Your Teacher`;
+
+            document.getElementById('emailMessage').value = message;
+            updateEmailPreview();
+
+            // Store student data for sending
+            document.getElementById('emailForm').dataset.studentId = student.id;
+        }
+
+        function updateEmailPreview() {
+            const message = document.getElementById('emailMessage').value;
+            document.getElementById('emailPreview').textContent = message;
+        }
+
+        document.getElementById('emailMessage')?.addEventListener('input', updateEmailPreview);
+
+        function sendEmail(event) {
+            event.preventDefault();
+
+            const to = document.getElementById('emailTo').value;
+            const subject = document.getElementById('emailSubject').value;
+            const message = document.getElementById('emailMessage').value;
+
+            // Simulate sending email
+            console.log('Sending email:', { to, subject, message });
+
+            showToast(`Email sent successfully to ${to}!`, 'success');
+            closeModal('sendEmailModal');
+        }
+
+        function toggleSelectAll() {
+            const selectAll = document.getElementById('selectAll').checked;
+            document.querySelectorAll('.student-select').forEach(cb => {
+                cb.checked = selectAll;
+            });
+        }
+
+        function sendBulkEmails() {
+            const selected = Array.from(document.querySelectorAll('.student-select:checked'));
+
+            if (selected.length === 0) {
+                showToast('Please select at least one student', 'warning');
+                return;
+            }
+
+            const count = selected.length;
+            // Simulate bulk email sending
+            showToast(`Sending emails to ${count} student(s)...`, 'success');
+
+            setTimeout(() => {
+                showToast(`Successfully sent ${count} email(s)!`, 'success');
+            }, 2000);
+        }
+
+        // Toast notification
+        function showToast(message, type = 'success') {
+            const toast = document.createElement('div');
+            toast.className = `toast ${type}`;
+            toast.innerHTML = `
+                <div style="font-size: 1.5rem;">${type === 'success' ? '✅' : type === 'error' ? '❌' : '⚠️'}</div>
+                <div>
+                    <strong>${type === 'success' ? 'Success' : type === 'error' ? 'Error' : 'Warning'}</strong>
+                    <p style="margin: 0; color: var(--text-secondary); font-size: 0.9rem;">${message}</p>
+                </div>
+            `;
+            document.body.appendChild(toast);
+
+            setTimeout(() => {
+                toast.style.animation = 'slideIn 0.3s ease-out reverse';
+                setTimeout(() => toast.remove(), 300);
+            }, 3000);
+        }
+
+        function generateReport(type) {
+            showToast(`Generating ${type} report...`, 'success');
+        }
+
+        // Close modal on outside click
+        document.querySelectorAll('.modal').forEach(modal => {
+            modal.addEventListener('click', function(e) {
+                if (e.target === this) {
+                    closeModal(this.id);
+                }
+            });
+        });
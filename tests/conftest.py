@@ -0,0 +1,49 @@
+"""
+Shared fixtures: the app on a fresh seeded database in a temporary directory
+"""
+
+import os
+import sys
+import tempfile
+
+import pytest
+
+# app reads its configuration at import time
+_data_dir = tempfile.mkdtemp(prefix='saarthi-test-')
+os.environ['DATABASE_PATH'] = os.path.join(_data_dir, 'saarthi.db')
+os.environ.setdefault('ASSET_BUILD', 'false')
+os.environ.pop('GEMINI_API_KEY', None)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture(scope='session')
+def application():
+    import app as application
+    application.prepare_database()
+    return application
+
+
+@pytest.fixture
+def login(application):
+    """Log in with the seeded demo accounts; returns a test client"""
+    def login(username, password, role):
+        client = application.app.test_client()
+        response = client.post('/login', data={'username': username, 'password': password, 'role': role})
+        assert response.status_code == 302
+        return client
+    return login
+
+
+@pytest.fixture
+def statements(application, monkeypatch):
+    """SQL statements run on request-path connections during the test"""
+    executed = []
+    connect = application.get_db_connection
+
+    def traced():
+        conn = connect()
+        conn.set_trace_callback(executed.append)
+        return conn
+
+    monkeypatch.setattr(application, 'get_db_connection', traced)
+    return executed
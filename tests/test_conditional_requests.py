@@ -0,0 +1,85 @@
+"""
+ETag revalidation of the student and parent JSON APIs: unchanged data is
+answered with 304 without running SQL, and writes change the ETag
+"""
+
+import pytest
+
+STUDENT_URLS = [
+    '/api/student/dashboard',
+    '/api/student/dashboard?sections=grades',
+    '/api/student/attendance?limit=5',
+    '/api/student/notifications',
+    '/api/student/assignments',
+    '/api/student/courses',
+]
+
+
+@pytest.mark.parametrize('url', STUDENT_URLS)
+def test_revalidation_runs_no_sql(login, statements, url):
+    client = login('pinki', 'student123', 'student')
+    first = client.get(url)
+    assert first.status_code == 200
+    etag = first.headers['ETag']
+
+    statements.clear()
+    again = client.get(url, headers={'If-None-Match': etag})
+
+    assert again.status_code == 304
+    assert again.headers['ETag'] == etag
+    assert statements == []
+
+
+def test_parent_revalidation_runs_no_sql(login, statements):
+    client = login('parent1', 'parent123', 'parent')
+    etag = client.get('/api/parent/attendance/1').headers['ETag']
+
+    statements.clear()
+    again = client.get('/api/parent/attendance/1', headers={'If-None-Match': etag})
+
+    assert again.status_code == 304
+    assert statements == []
+
+
+def test_attendance_write_changes_etag(application, login):
+    student = login('pinki', 'student123', 'student')
+    parent = login('parent1', 'parent123', 'parent')
+    student_etag = student.get('/api/student/attendance').headers['ETag']
+    parent_etag = parent.get('/api/parent/attendance/1').headers['ETag']
+
+    teacher = login('ravinder', 'teacher123', 'teacher')
+    marked = teacher.post('/api/mark-attendance', json={
+        'course_id': 1, 'date': '2026-01-05',
+        'attendance': [{'student_id': 1, 'status': 'absent'}],
+    })
+    assert marked.get_json()['success']
+    application.write_queue.flush()
+
+    after = student.get('/api/student/attendance', headers={'If-None-Match': student_etag})
+    assert after.status_code == 200
+    assert after.headers['ETag'] != student_etag
+    after = parent.get('/api/parent/attendance/1', headers={'If-None-Match': parent_etag})
+    assert after.status_code == 200
+    assert after.headers['ETag'] != parent_etag
+
+
+def test_notification_writes_change_etag(application, login):
+    client = login('pinki', 'student123', 'student')
+    etag = client.get('/api/student/notifications').headers['ETag']
+
+    # Face attendance notifies the student
+    marked = client.post('/api/student/face-attendance', json={'course_id': 1, 'confidence': 97})
+    assert marked.get_json()['success']
+    application.write_queue.flush()
+
+    after = client.get('/api/student/notifications', headers={'If-None-Match': etag})
+    assert after.status_code == 200
+    assert after.headers['ETag'] != etag
+    etag = after.headers['ETag']
+    notification = after.get_json()['notifications'][0]['id']
+
+    client.post(f'/api/student/mark-notification-read/{notification}')
+
+    after = client.get('/api/student/notifications', headers={'If-None-Match': etag})
+    assert after.status_code == 200
+    assert after.headers['ETag'] != etag